@@ -0,0 +1,148 @@
+import dungeonGenerator
+import dungeonPipeline
+
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from os import cpu_count
+
+# Builds lots of dungeons at once, one process per core, for pre-generating and curating levels
+
+# The settings Dungeon Game uses, anything left out of the params passed to buildDungeon() comes from here
+DEFAULT_PARAMS = {
+	'size': 35, # the size Dungeon Game starts on, Small: 35, Medium: 55, Large: 70
+	'minRoomSize': 5,
+	'maxRoomSize': 11,
+	'roomStep': 1,
+	'margin': 2,
+	'attempts': 30000,
+	'corridorMode': 'f',
+	'extraDoorChance': 20,
+	'maxDeadends': 3,
+	'compact': False,
+}
+
+
+def buildStages(params = None):
+	"""
+	the steps buildDungeon() takes after making the dungeonGenerator, in order, for a dungeonPipeline
+	
+	Args:
+	params: dictionary of settings, see DEFAULT_PARAMS
+	
+	Returns:
+	a list of (name, function) tuples, each function takes the dungeonGenerator and a dictionary of what the earlier steps returned, by name
+	"""
+	
+	p = dict(DEFAULT_PARAMS, **(params or {}))
+	
+	def joinAreas(d, done):
+		unconnected = done['labelComponents']
+		if unconnected.count:
+			d.joinUnconnectedAreas(unconnected)
+			
+	return [
+		('placeRandomRooms', lambda d, done: d.placeRandomRooms(p['minRoomSize'], p['maxRoomSize'], roomStep=p['roomStep'], margin=p['margin'], attempts=p['attempts'])),
+		('generateCorridors', lambda d, done: d.generateCorridors(p['corridorMode'])),
+		('connectAllRooms', lambda d, done: d.connectAllRooms(p['extraDoorChance'])),
+		('labelComponents', lambda d, done: d.labelComponents()),
+		('joinUnconnectedAreas', joinAreas),
+		('pruneDeadends', lambda d, done: d.pruneDeadends(maxDeadends=p['maxDeadends'])),
+		('placeWalls', lambda d, done: d.placeWalls()),
+	]
+	
+def newDungeon(seed, params = None):
+	"""
+	Returns:
+	the empty dungeonGenerator buildDungeon() starts from
+	"""
+	
+	p = dict(DEFAULT_PARAMS, **(params or {}))
+	return dungeonGenerator.dungeonGenerator(p['size'], p['size'], p['compact'], seed=seed)
+	
+def buildDungeon(seed, params = None, profiler = None):
+	"""
+	builds a dungeon the same way Dungeon Game does, rooms joined by corridors with walls around them
+	the dungeon only depends on the seed and params, so the same pair always gives the same dungeon
+	
+	Args:
+	seed: the seed for the dungeonGenerator, None for a random one
+	params: dictionary of settings, see DEFAULT_PARAMS
+	profiler: passed to dungeonPipeline, None to not time anything
+	
+	Returns:
+	the dungeonGenerator
+	"""
+	
+	d = newDungeon(seed, params)
+	dungeonPipeline.dungeonPipeline(buildStages(params), profiler).run(d)
+	return d
+	
+def packDungeon(seed, d):
+	"""
+	turns a dungeonGenerator into plain data that is cheap to send between processes and easy to save
+	
+	Args:
+	seed: the seed the dungeon was built from
+	d: the dungeonGenerator
+	
+	Returns:
+	a dictionary with the seed, width, height, grid (bytes, one per tile column after column, grid[x * height + y]),
+	rooms (list of (x, y, width, height)), doors and deadends (lists of (x, y))
+	"""
+	
+	return {
+		'seed': seed,
+		'width': d.width,
+		'height': d.height,
+		'grid': bytes(d.tiles) if d.compact else b''.join(bytes(column) for column in d.grid),
+		'rooms': [(r.x, r.y, r.width, r.height) for r in d.rooms],
+		'doors': list(d.doors),
+		'deadends': list(d.deadends),
+	}
+	
+def buildPacked(seed, params = None):
+	"""
+	buildDungeon() then packDungeon(), what each worker process runs
+	"""
+	
+	return packDungeon(seed, buildDungeon(seed, params))
+	
+def generateBatch(seeds, params = None, workers = None, inFlight = None):
+	"""
+	builds a dungeon for every seed using a pool of processes, handing each one back as soon as it is finished
+	only a few dungeons per worker are queued at a time, so a long or endless list of seeds doesn't fill up memory
+	
+	Args:
+	seeds: iterable of seeds
+	params: dictionary of settings shared by every dungeon, see DEFAULT_PARAMS
+	workers: integer, the amount of processes to use, one per core if left out, 1 builds them one at a time in this process
+	inFlight: integer, the most dungeons queued or being built at once, 4 per worker if left out
+	
+	Returns:
+	a generator of the dictionaries made by packDungeon(), in the order they finish rather than the order of the seeds
+	"""
+	
+	workers = workers or cpu_count() or 1
+	if workers == 1:
+		for seed in seeds:
+			yield buildPacked(seed, params)
+		return
+		
+	inFlight = inFlight or workers * 4
+	with ProcessPoolExecutor(workers) as pool:
+		pending = set()
+		try:
+			for seed in seeds:
+				if len(pending) >= inFlight:
+					done, pending = wait(pending, return_when=FIRST_COMPLETED)
+					for future in done:
+						yield future.result()
+				pending.add(pool.submit(buildPacked, seed, params))
+			while pending:
+				done, pending = wait(pending, return_when=FIRST_COMPLETED)
+				for future in done:
+					yield future.result()
+		finally:
+			# stop anything not started if the caller gives up early
+			for future in pending:
+				future.cancel()
+
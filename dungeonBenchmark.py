@@ -0,0 +1,903 @@
+import dungeonGenerator
+import dungeonBatch
+import dungeonFormat
+import dungeonPipeline
+import dungeonCore
+
+from random import Random, randint, choice, seed
+from argparse import ArgumentParser
+from os import close, cpu_count, path, remove
+from math import pi
+from statistics import median, quantiles
+from tempfile import mkstemp
+from time import perf_counter
+import json
+import platform
+import sys
+import tracemalloc
+
+# Benchmarks for the dungeon generator, run this file directly to print the results
+# python dungeonBenchmark.py stages --json results.json times each step of generating a level instead, see --help
+# python dungeonBenchmark.py ticks and soak run bots through the game without drawing it
+# python dungeonBenchmark.py batch --workers 1 2 4 8 times batch generation with each amount of worker processes
+
+STORAGE_SIZES = (35, 70, 500, 2000)
+CAVE_SIZES = (128, 512)
+CAVE_SEEDS = (1, 2, 3)
+ROOM_SIZES = (35, 55, 70, 200)
+ROOM_ATTEMPTS = (300, 3000, 30000)
+JOIN_SIZES = (100, 200, 400)
+PATH_SIZES = (55, 100, 200)
+PATH_MODES = ('bfs', 'astar', 'jps')
+PATH_LENGTHS = ((0, 20), (20, 80), (80, 100000))
+NAV_SIZES = (200, 1000)
+FLOW_SIZES = (70, 200)
+FLOW_ENEMIES = (500, 2000)
+CORRIDOR_SIZES = (200, 1000)
+BATCH_COUNT = 64
+FORMAT_SIZES = (55, 500, 2000)
+CORRIDOR_MODES = ('r', 'f', 'm', 'l', {'l': 3, 'r': 1}, 'kruskal', 'wilson', 'braid')
+STAGE_SIZES = (35, 55, 70, 200, 500, 1000, 2000)
+STAGE_SEEDS = (1, 2, 3, 4, 5)
+# a stage counts as slower than the baseline once it takes this many times as long
+REGRESSION_THRESHOLD = 1.25
+# and is at least this many seconds slower, so noise in stages that take well under a millisecond isn't reported
+REGRESSION_MIN_SECONDS = 0.001
+TICK_SIZES = (35, 55, 70, 200)
+# how many enemies to fill each level up to, None leaves the ones it was generated with
+TICK_ENEMIES = (None, 100, 500, 2000, 10000)
+TICK_COUNT = 1200
+TICK_DT = 1 / 60
+# systems take microseconds, so a tick regression only has to be this much slower
+TICK_REGRESSION_MIN_SECONDS = 0.00002
+
+
+def timeIt(function, *args, **kwargs):
+	"""
+	runs a function once and measures how long it took
+	
+	Args:
+	function: the callable to time, args and kwargs are passed through to it
+	
+	Returns:
+	the time taken in seconds and whatever the function returned
+	"""
+	
+	start = perf_counter()
+	result = function(*args, **kwargs)
+	return perf_counter() - start, result
+	
+def measureGridMemory(size, compact):
+	"""
+	measures how many bytes a freshly allocated dungeonGenerator grid takes up
+	
+	Args:
+	size: integer, tiles per side of the dungeon
+	compact: boolean, passed to dungeonGenerator()
+	
+	Returns:
+	the number of bytes allocated while building the generator
+	"""
+	
+	tracemalloc.start()
+	d = dungeonGenerator.dungeonGenerator(size, size, compact)
+	used = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	del d
+	return used
+	
+def scanGrid(d):
+	"""
+	reads every tile of the grid through grid[x][y], the access pattern used by most generator functions
+	"""
+	
+	touching = 0
+	grid = d.grid
+	for x in range(d.width):
+		for y in range(d.height):
+			if grid[x][y]: touching += 1
+	return touching
+	
+def writeGrid(d):
+	"""
+	writes every tile of the grid through grid[x][y]
+	"""
+	
+	grid = d.grid
+	for x in range(d.width):
+		for y in range(d.height):
+			grid[x][y] = dungeonGenerator.FLOOR
+			
+def benchmarkStorage(sizes = STORAGE_SIZES):
+	"""
+	compares the list of lists grid with the compact bytearray grid
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	
+	Returns:
+	a list of dictionaries, one per size and storage mode, with the memory used in bytes, tiles per second for reads and writes through grid[x][y],
+	and the time taken to place rooms, flood fill the whole grid and place walls around the rooms
+	"""
+	
+	results = []
+	for size in sizes:
+		for compact in (False, True):
+			memory = measureGridMemory(size, compact)
+			d = dungeonGenerator.dungeonGenerator(size, size, compact)
+			readTime = timeIt(scanGrid, d)[0]
+			writeTime = timeIt(writeGrid, d)[0]
+			fillTime = timeIt(d.floodFill, 0, 0, dungeonGenerator.CORRIDOR)[0]
+			d = dungeonGenerator.dungeonGenerator(size, size, compact, seed=size)
+			roomTime = timeIt(d.placeRandomRooms, 5, 11, margin=2, attempts=3000)[0]
+			wallTime = timeIt(d.placeWalls)[0]
+			results.append({
+				'size': size,
+				'storage': 'compact' if compact else 'list',
+				'bytes': memory,
+				'readsPerSecond': size * size / readTime,
+				'writesPerSecond': size * size / writeTime,
+				'roomSeconds': roomTime,
+				'fillSeconds': fillTime,
+				'wallSeconds': wallTime,
+			})
+	return results
+	
+def benchmarkCaves(sizes = CAVE_SIZES, seeds = CAVE_SEEDS):
+	"""
+	compares the fast and reference modes of generateCaves(), both for speed and for the kind of caves they make
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	seeds: list of seeds, every size is run once per seed
+	
+	Returns:
+	a list of dictionaries, one per size and mode, with the average time, fraction of cave tiles and number of separate caves
+	"""
+	
+	results = []
+	for size in sizes:
+		for mode in ('reference', 'fast'):
+			seconds = caves = areas = 0
+			for s in seeds:
+				d = dungeonGenerator.dungeonGenerator(size, size)
+				seconds += timeIt(d.generateCaves, seed=s, mode=mode)[0]
+				caves += sum(1 for x, y, tile in d if tile == dungeonGenerator.CAVE)
+				areas += len(d.findUnconnectedAreas())
+			results.append({
+				'size': size,
+				'mode': mode,
+				'seconds': seconds / len(seeds),
+				'caveFraction': caves / (size * size * len(seeds)),
+				'caves': areas / len(seeds),
+			})
+	return results
+	
+def benchmarkRooms(sizes = ROOM_SIZES, attempts = 30000):
+	"""
+	times placeRandomRooms() with the settings used by Dungeon Game, with and without the occupancy index
+	then times quadFits() on its own against the finished map, since most of an attempt is spent picking random numbers
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	attempts: integer, passed to placeRandomRooms()
+	
+	Returns:
+	a list of dictionaries, one per size and mode, with attempts per second, quadFits() checks per second and the amount of rooms placed
+	"""
+	
+	results = []
+	for size in sizes:
+		for indexed in (False, True):
+			d = dungeonGenerator.dungeonGenerator(size, size, seed=size)
+			seconds = timeIt(d.placeRandomRooms, 5, 11, roomStep=1, margin=2, attempts=attempts, indexed=indexed)[0]
+			seed(size)
+			quads = [(randint(2, size - 13), randint(2, size - 13), randint(5, 10), randint(5, 10)) for i in range(attempts)]
+			checkSeconds = timeIt(lambda: [d.quadFits(x, y, w, h, 2) for x, y, w, h in quads])[0]
+			results.append({
+				'size': size,
+				'indexed': indexed,
+				'attemptsPerSecond': attempts / seconds,
+				'checksPerSecond': attempts / checkSeconds,
+				'rooms': len(d.rooms),
+			})
+	return results
+	
+def benchmarkRoomStrategies(sizes = ROOM_SIZES, attempts = ROOM_ATTEMPTS, seeds = CAVE_SEEDS):
+	"""
+	compares the placeRandomRooms() strategies for the same amount of attempts
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	attempts: list of integers, passed to placeRandomRooms()
+	seeds: list of seeds, every combination is run once per seed
+	
+	Returns:
+	a list of dictionaries, one per size, attempts and strategy, with the average time, rooms placed and fraction of the grid covered by rooms
+	"""
+	
+	results = []
+	for size in sizes:
+		for tries in attempts:
+			for strategy in ('random', 'maxrects'):
+				seconds = rooms = area = 0
+				for s in seeds:
+					d = dungeonGenerator.dungeonGenerator(size, size, seed=s)
+					seconds += timeIt(d.placeRandomRooms, 5, 11, roomStep=1, margin=2, attempts=tries, strategy=strategy)[0]
+					rooms += len(d.rooms)
+					area += sum(r.width * r.height for r in d.rooms)
+				results.append({
+					'size': size,
+					'attempts': tries,
+					'strategy': strategy,
+					'seconds': seconds / len(seeds),
+					'rooms': rooms / len(seeds),
+					'density': area / (size * size * len(seeds)),
+				})
+	return results
+	
+def benchmarkJoins(sizes = JOIN_SIZES, seeds = CAVE_SEEDS):
+	"""
+	times joinUnconnectedAreas() with both methods on sparse cave maps, which break up into hundreds of islands
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	seeds: list of seeds, passed to generateCaves()
+	
+	Returns:
+	a list of dictionaries, one per size and method, with the average amount of islands, time, corridor tiles carved and areas left afterwards
+	"""
+	
+	results = []
+	for size in sizes:
+		for method in ('nearest', 'mst'):
+			islands = seconds = carved = left = 0
+			for s in seeds:
+				d = dungeonGenerator.dungeonGenerator(size, size)
+				d.generateCaves(p=35, seed=s)
+				components = d.labelComponents()
+				islands += components.count
+				seconds += timeIt(d.joinUnconnectedAreas, components, method)[0]
+				carved += len(d.corridors)
+				left += d.labelComponents().count
+			results.append({
+				'size': size,
+				'method': method,
+				'islands': islands / len(seeds),
+				'seconds': seconds / len(seeds),
+				'carved': carved / len(seeds),
+				'areasLeft': left / len(seeds),
+			})
+	return results
+	
+def buildRoomMap(size, s):
+	"""
+	builds a map the same way Dungeon Game does, with fewer room attempts so larger maps don't take too long
+	
+	Args:
+	size: integer, tiles per side of the dungeon
+	s: the seed to use
+	
+	Returns:
+	the dungeonGenerator
+	"""
+	
+	return dungeonBatch.buildDungeon(s, {'size': size, 'attempts': 3000})
+	
+def benchmarkPaths(sizes = PATH_SIZES, modes = PATH_MODES, lengths = PATH_LENGTHS, pairs = 200):
+	"""
+	times findPath() with each mode on room and cave maps, grouped by how long the path is
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	modes: list of strings, passed to findPath()
+	lengths: list of (shortest, longest) path lengths to group the results into
+	pairs: integer, the amount of random start and end points tried on each map
+	
+	Returns:
+	a list of dictionaries, one per map, size, path length and mode, with the amount of paths and the average time per path in milliseconds
+	"""
+	
+	results = []
+	for kind in ('rooms', 'caves'):
+		for size in sizes:
+			if kind == 'rooms':
+				d = buildRoomMap(size, size)
+			else:
+				d = dungeonGenerator.dungeonGenerator(size, size)
+				d.generateCaves(seed=size)
+			d.constructNavGraph()
+			seed(size)
+			cells = list(d.graph)
+			points = [(choice(cells), choice(cells)) for i in range(pairs)]
+			# group the points by the length of the path between them, skipping any without a path
+			groups = [[] for l in lengths]
+			for start, end in points:
+				path = d.findPath(*start, *end, mode='bfs')
+				if path is None: continue
+				for group, (shortest, longest) in zip(groups, lengths):
+					if shortest <= len(path) < longest: group.append((start, end))
+			for group, (shortest, longest) in zip(groups, lengths):
+				if not group: continue
+				for mode in modes:
+					seconds = timeIt(lambda: [d.findPath(*start, *end, mode=mode) for start, end in group])[0]
+					results.append({
+						'map': kind,
+						'size': size,
+						'length': '%d-%d' % (shortest, longest) if longest < 100000 else '%d+' % shortest,
+						'mode': mode,
+						'paths': len(group),
+						'milliseconds': seconds * 1000 / len(group),
+					})
+	return results
+	
+def benchmarkNavGraph(sizes = NAV_SIZES, pairs = 200):
+	"""
+	measures the navigation graph on cave maps, the memory it takes compared to the dictionary of lists it replaced
+	and how many paths per second findPath() finds between points up to 30 tiles apart in the same cave
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	pairs: integer, the amount of paths to find on each map
+	
+	Returns:
+	a list of dictionaries, one per size, with the amount of nodes, bytes per node for the graph and the old dictionary,
+	the time to build the graph and paths per second for each findPath() mode
+	"""
+	
+	results = []
+	for size in sizes:
+		d = dungeonGenerator.dungeonGenerator(size, size)
+		d.generateCaves(seed=size)
+		tracemalloc.start()
+		d.constructNavGraph()
+		graphBytes = tracemalloc.get_traced_memory()[0]
+		tracemalloc.stop()
+		buildTime = timeIt(d.constructNavGraph)[0]
+		tracemalloc.start()
+		oldGraph = {cell: d.graph[cell] for cell in d.graph}
+		dictBytes = tracemalloc.get_traced_memory()[0]
+		tracemalloc.stop()
+		del oldGraph
+		
+		caves = d.labelComponents([dungeonGenerator.CAVE])
+		cells = list(d.graph)
+		seed(size)
+		points = []
+		while len(points) < pairs:
+			start = choice(cells)
+			end = (start[0] + randint(-30, 30), start[1] + randint(-30, 30))
+			if end in d.graph and caves.labelAt(*start) == caves.labelAt(*end): points.append((start, end))
+		result = {
+			'size': size,
+			'nodes': len(d.graph),
+			'graphBytesPerNode': graphBytes / len(d.graph),
+			'dictBytesPerNode': dictBytes / len(d.graph),
+			'buildSeconds': buildTime,
+		}
+		for mode in PATH_MODES:
+			result[mode + 'PathsPerSecond'] = pairs / timeIt(lambda: [d.findPath(*start, *end, mode=mode) for start, end in points])[0]
+		results.append(result)
+	return results
+	
+def benchmarkFlowField(sizes = FLOW_SIZES, enemies = FLOW_ENEMIES, moves = 20, radius = 24):
+	"""
+	compares moving a crowd of enemies towards the player with a shared flowField against a findPath() per enemy
+	the player walks randomly one tile at a time, after each move every enemy asks for its next step
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	enemies: list of integers, the amount of enemies scattered over the map
+	moves: integer, the amount of tiles the player moves, findPath() is only run for the first few since it is much slower
+	radius: integer, the radius to use for the limited flowField
+	
+	Returns:
+	a list of dictionaries, one per size, amount of enemies and method, with the time per player move in milliseconds and the fraction of enemies that found a way to the player
+	"""
+	
+	results = []
+	for size in sizes:
+		d = buildRoomMap(size, size)
+		d.constructNavGraph()
+		cells = list(d.graph)
+		seed(size)
+		walk = [choice(cells)]
+		for i in range(moves - 1):
+			walk.append(choice(d.graph[walk[-1]]))
+		for count in enemies:
+			positions = [choice(cells) for i in range(count)]
+			for method in ('flowField', 'flowField radius %d' % radius, 'findPath'):
+				if method == 'findPath':
+					targets = walk[:3]
+					def moveEnemies(target):
+						return [d.findPath(*position, *target) for position in positions]
+				else:
+					field = dungeonGenerator.flowField(d, None if method == 'flowField' else radius)
+					targets = walk
+					def moveEnemies(target):
+						field.update(*target)
+						return [field.nextStep(*position) for position in positions]
+				seconds, steps = timeIt(lambda: [moveEnemies(target) for target in targets])
+				results.append({
+					'size': size,
+					'enemies': count,
+					'method': method,
+					'millisecondsPerMove': seconds * 1000 / len(targets),
+					'withStep': sum(1 for step in steps[-1] if step is not None) / count,
+				})
+	return results
+	
+def benchmarkCorridors(sizes = CORRIDOR_SIZES, modes = CORRIDOR_MODES):
+	"""
+	times generateCorridors() filling an empty grid with each mode and maze algorithm
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	modes: list of modes or weighted mixes, passed to generateCorridors()
+	
+	Returns:
+	a list of dictionaries, one per size and mode, with the time, corridor tiles carved per second and the fraction of them that are dead ends
+	"""
+	
+	results = []
+	for size in sizes:
+		for mode in modes:
+			d = dungeonGenerator.dungeonGenerator(size, size, seed=size)
+			seconds = timeIt(d.generateCorridors, mode)[0]
+			d.findDeadends()
+			results.append({
+				'size': size,
+				'mode': str(mode),
+				'seconds': seconds,
+				'tilesPerSecond': len(d.corridors) / seconds,
+				'deadends': len(d.deadends) / len(d.corridors),
+			})
+	return results
+	
+def benchmarkBatch(count = BATCH_COUNT, workers = None, size = None):
+	"""
+	times generateBatch() building the same dungeons with more and more worker processes, to see how close to the amount of cores it scales
+	
+	Args:
+	count: integer, the amount of dungeons to build
+	workers: list of integers, the amounts of workers to try, 1, 2, 4 and the amount of cores if left out,
+	more workers than cores are still timed to show what oversubscribing costs
+	size: integer, tiles per side of the dungeons, the size in dungeonBatch.DEFAULT_PARAMS if left out
+	
+	Returns:
+	a list of dictionaries, one per amount of workers, with dungeons per second, the speed up over the first amount of workers
+	and the efficiency, the speed up for each worker that has a core to run on (1.0 is linear scaling)
+	"""
+	
+	cores = cpu_count() or 1
+	workers = workers or sorted({1, 2, 4, cores})
+	params = {'size': size} if size else None
+	results = []
+	for w in workers:
+		seconds = timeIt(lambda: sum(1 for level in dungeonBatch.generateBatch(range(count), params, workers=w)))[0]
+		speedUp = (count / seconds) / results[0]['dungeonsPerSecond'] if results else 1.0
+		results.append({
+			'workers': w,
+			'cores': cores,
+			'dungeonsPerSecond': count / seconds,
+			'speedUp': speedUp,
+			'efficiency': speedUp * min(workers[0], cores) / min(w, cores),
+		})
+	return results
+	
+def benchmarkFormat(sizes = FORMAT_SIZES):
+	"""
+	times saving cave maps with dungeonFormat and loading them back
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	
+	Returns:
+	a list of dictionaries, one per size, with the file size in bytes and the time to save, open (memory map) and copy back into a dungeonGenerator
+	"""
+	
+	results = []
+	for size in sizes:
+		d = dungeonGenerator.dungeonGenerator(size, size, compact=True, seed=size)
+		d.generateCaves(seed=size)
+		d.corridors = [(x, y) for x, y, tile in d if tile == dungeonGenerator.CAVE and (x + y) % 7 == 0]
+		handle, filePath = mkstemp()
+		close(handle)
+		saveSeconds = timeIt(dungeonFormat.saveDungeon, filePath, d)[0]
+		openSeconds, level = timeIt(dungeonFormat.loadDungeon, filePath)
+		copySeconds = timeIt(level.toGenerator)[0]
+		level.close()
+		results.append({
+			'size': size,
+			'bytes': path.getsize(filePath),
+			'saveSeconds': saveSeconds,
+			'openSeconds': openSeconds,
+			'toGeneratorSeconds': copySeconds,
+		})
+		remove(filePath)
+	return results
+	
+def benchmarkStages(sizes = STAGE_SIZES, seeds = STAGE_SEEDS, params = None, memory = True):
+	"""
+	times each step dungeonBatch.buildDungeon() takes, the same steps Dungeon Game uses to make a level
+	each dungeon is built once untraced for the times, then again under tracemalloc for the memory, as tracing slows everything down
+	the stages are run with a dungeonPipeline, timed by its profiler and traced by its hooks
+	
+	Args:
+	sizes: list of integers, tiles per side of the dungeons to test
+	seeds: list of seeds, every size is built from each of them
+	params: dictionary of settings, see dungeonBatch.DEFAULT_PARAMS, size is taken from sizes
+	memory: boolean, if false skip the traced builds and leave the memory columns out
+	
+	Returns:
+	a list of dictionaries, one per size and stage, with the median and slowest time over the seeds,
+	and the median bytes still allocated after the stage and peak bytes allocated during it
+	"""
+	
+	results = []
+	for size in sizes:
+		p = dict(params or {}, size=size)
+		names = ['dungeonGenerator'] + [name for name, stage in dungeonBatch.buildStages(p)]
+		seconds = {name: [] for name in names}
+		allocated = {name: [] for name in names}
+		peak = {name: [] for name in names}
+		
+		def startTrace(name, d, done):
+			tracemalloc.reset_peak()
+			before[name] = tracemalloc.get_traced_memory()[0]
+			
+		def stopTrace(name, d, done):
+			current, highest = tracemalloc.get_traced_memory()
+			allocated[name].append(current - before[name])
+			peak[name].append(highest - before[name])
+			
+		for s in seeds:
+			start = perf_counter()
+			d = dungeonBatch.newDungeon(s, p)
+			seconds['dungeonGenerator'].append(perf_counter() - start)
+			dungeonPipeline.dungeonPipeline(dungeonBatch.buildStages(p), profiler=lambda name, taken, counters: seconds[name].append(taken)).run(d)
+			del d
+			
+			if not memory: continue
+			tracemalloc.start()
+			d = dungeonBatch.newDungeon(s, p)
+			allocated['dungeonGenerator'].append(tracemalloc.get_traced_memory()[0])
+			peak['dungeonGenerator'].append(tracemalloc.get_traced_memory()[1])
+			before = {}
+			pipeline = dungeonPipeline.dungeonPipeline(dungeonBatch.buildStages(p))
+			pipeline.addHook(before=startTrace, after=stopTrace)
+			pipeline.run(d)
+			tracemalloc.stop()
+			del d
+			
+		for name in names:
+			result = {
+				'size': size,
+				'stage': name,
+				'seconds': median(seconds[name]),
+				'maxSeconds': max(seconds[name]),
+			}
+			if memory:
+				result['allocatedBytes'] = int(median(allocated[name]))
+				result['peakBytes'] = int(median(peak[name]))
+			results.append(result)
+	return results
+	
+def compareResults(results, baseline, keys = ('size', 'stage'), measure = 'seconds', threshold = REGRESSION_THRESHOLD, minSeconds = REGRESSION_MIN_SECONDS):
+	"""
+	compares benchmark results with an earlier run
+	
+	Args:
+	results: list of dictionaries from benchmarkStages() or benchmarkTicks()
+	baseline: list of dictionaries from an earlier run of the same benchmark, rows missing from either are skipped
+	keys: the columns that tell rows apart
+	measure: the column holding the time to compare
+	threshold: float, how many times slower a row has to be to count as a regression, it also has to be minSeconds slower
+	
+	Returns:
+	a list of dictionaries, one per row in both, with the keys, both times, the ratio between them and whether it is a regression
+	"""
+	
+	before = {tuple(r[k] for k in keys): r for r in baseline}
+	comparison = []
+	for r in results:
+		old = before.get(tuple(r[k] for k in keys))
+		if old is None: continue
+		ratio = r[measure] / old[measure] if old[measure] else 1.0
+		row = {k: r[k] for k in keys}
+		row.update({
+			'baseline': old[measure],
+			measure: r[measure],
+			'ratio': ratio,
+			'regression': ratio > threshold and r[measure] - old[measure] > minSeconds,
+		})
+		comparison.append(row)
+	return comparison
+	
+def randomWalkBot(seed = 0, turnEvery = 120):
+	"""
+	a bot that walks in a random direction, turning every so often, hits every enemy in reach, opens chests it walks past and respawns when it dies
+	
+	Args:
+	seed: the seed for the bot's own random stream, so it does the same thing every run
+	turnEvery: integer, ticks between picking a new direction
+	
+	Returns:
+	a function taking the game and the tick number, called before every tick
+	"""
+	
+	rng = Random(seed)
+	
+	def bot(game, tick):
+		if game.state == 'Death':
+			game.respawn()
+		if tick % turnEvery == 0:
+			game.moveAngle = rng.random() * 2 * pi
+		player = game.player
+		for e in game.entities:
+			if abs(e.x - player.x) < player.range and abs(e.y - player.y) < player.range:
+				game.attack(e.x + e.width * 0.5, e.y + e.width * 0.5)
+				break
+		game.useBlock(player.x, player.y + 1)
+	return bot
+	
+def scriptedBot(script):
+	"""
+	a bot that follows a list of moves, respawning when it dies
+	
+	Args:
+	script: list of (tick, angle) tuples, from that tick on the player walks at that angle (radians, 0 is up), None stands still
+	
+	Returns:
+	a function taking the game and the tick number, called before every tick
+	"""
+	
+	moves = dict(script)
+	
+	def bot(game, tick):
+		if game.state == 'Death':
+			game.respawn()
+		if tick in moves:
+			game.moveAngle = moves[tick]
+	return bot
+	
+def addEnemies(game, count, rng, room = None):
+	"""
+	fills a game up with extra enemies until it has count of them
+	
+	Args:
+	game: a DungeonSimulation after newGame()
+	count: integer, the amount of enemies wanted
+	rng: Random used to place them
+	room: the room to put them all in, random rooms with enemies if left out
+	
+	Returns:
+	none
+	"""
+	
+	rooms = [room] if room else [r for r in game.rooms if r.type > 0]
+	while len(game.entities) < count:
+		r = rng.choice(rooms)
+		game.addEnemy(dungeonCore.Skull(rng.randrange(r.x, r.x + r.width), rng.randrange(r.y, r.y + r.height), r))
+		
+def newSimulation(seed, size):
+	"""
+	Returns:
+	a DungeonSimulation with a new game, generated without the level cache
+	"""
+	
+	game = dungeonCore.DungeonSimulation()
+	game.cacheLevels = False
+	game.newGame(seed, size)
+	return game
+	
+def runTicks(game, bot, ticks = TICK_COUNT, dt = TICK_DT):
+	"""
+	runs a game for a number of ticks, timing every tick and every system in it
+	
+	Args:
+	game: a DungeonSimulation after newGame()
+	bot: function from randomWalkBot() or scriptedBot()
+	ticks: integer, the amount of ticks to run
+	dt: float, the seconds each tick moves the game on by
+	
+	Returns:
+	dictionary of 'tick' and each system name to a list of the seconds it took each tick
+	"""
+	
+	times = {name: [] for name in ('tick',) + tuple(game.systems)}
+	game.profiler = lambda system, seconds: times[system].append(seconds)
+	for tick in range(ticks):
+		bot(game, tick)
+		start = perf_counter()
+		game.simulate(dt)
+		times['tick'].append(perf_counter() - start)
+	game.profiler = None
+	return times
+	
+def benchmarkTicks(sizes = TICK_SIZES, enemies = TICK_ENEMIES, ticks = TICK_COUNT, seed = 1, crowd = True):
+	"""
+	runs a random walk bot through a game for each map size and amount of enemies without drawing anything
+	
+	Args:
+	sizes: list of integers, mapSize of the games
+	enemies: list of the amounts of enemies to fill each game up to, None for the ones it was generated with
+	ticks: integer, ticks to run each game for
+	seed: the seed for the levels and the bot
+	crowd: boolean, if true the extra enemies all go in the room the player starts in so every one of them is moving, the worst case
+	
+	Returns:
+	a list of dictionaries, one per size, amount of enemies and system (with 'tick' for the whole tick),
+	with the ticks per second of the whole run, the median and 99th percentile seconds per tick and the share of the tick it took
+	"""
+	
+	results = []
+	for size in sizes:
+		for count in enemies:
+			game = newSimulation(seed, size)
+			if count is not None:
+				start = [r for r in game.rooms if r.type == dungeonCore.START][0]
+				addEnemies(game, count, Random(seed), start if crowd else None)
+			entityCount = len(game.entities)
+			times = runTicks(game, randomWalkBot(seed), ticks)
+			total = sum(times['tick'])
+			for name, seconds in times.items():
+				results.append({
+					'size': size,
+					'enemies': entityCount,
+					'system': name,
+					'ticksPerSecond': ticks / total,
+					'p50Seconds': median(seconds),
+					'p99Seconds': quantiles(seconds, n=100)[98],
+					'share': sum(seconds) / total,
+				})
+	return results
+	
+def soakTest(sessions = 50, ticks = 3600, size = 35):
+	"""
+	plays lots of games with random walk bots, checking the game never breaks
+	
+	Args:
+	sessions: integer, the amount of games, each with its own level and bot
+	ticks: integer, ticks per game
+	size: integer, mapSize of the games
+	
+	Returns:
+	a dictionary with the amount of sessions, ticks run, ticks per second, deaths, enemies killed, and a list of problems found
+	(the player or an enemy somewhere it can't be, or an exception), each a (seed, tick, description) tuple
+	"""
+	
+	problems = []
+	deaths = kills = 0
+	seconds = 0.0
+	for s in range(1, sessions + 1):
+		game = newSimulation(s, size)
+		bot = randomWalkBot(s)
+		enemies = len(game.entities)
+		try:
+			for tick in range(ticks):
+				if game.state == 'Death':
+					deaths += 1
+				bot(game, tick)
+				start = perf_counter()
+				game.simulate(TICK_DT)
+				seconds += perf_counter() - start
+				if not game.player.canWalk(game.blockAt(game.player.x, game.player.y)):
+					problems.append((s, tick, 'player at %.2f, %.2f is in a wall' % (game.player.x, game.player.y)))
+					break
+				for e in game.entities:
+					r = e.room
+					if not (r.x <= e.x <= r.x + r.width and r.y <= e.y <= r.y + r.height):
+						problems.append((s, tick, 'enemy at %.2f, %.2f left its room' % (e.x, e.y)))
+						break
+		except Exception as e:
+			problems.append((s, tick, repr(e)))
+		kills += enemies - len(game.entities)
+	return {
+		'sessions': sessions,
+		'ticks': sessions * ticks,
+		'ticksPerSecond': sessions * ticks / seconds,
+		'deaths': deaths,
+		'kills': kills,
+		'problems': problems,
+	}
+	
+def printResults(title, results):
+	"""
+	prints a list of result dictionaries as a simple table
+	"""
+	
+	print(title)
+	if not results: return
+	keys = list(results[0])
+	print('\t'.join(keys))
+	for r in results:
+		print('\t'.join(('%.4g' % r[k]) if isinstance(r[k], float) else str(r[k]) for k in keys))
+	print()
+	
+	
+def saveAndCompare(arguments, title, results, keys, minSeconds):
+	"""
+	prints results, saves them as JSON if asked to and compares them with a baseline
+	
+	Returns:
+	the exit code, 1 if anything is slower than the baseline allows
+	"""
+	
+	printResults(title, results)
+	if arguments.json:
+		with open(arguments.json, 'w') as f:
+			json.dump({
+				'benchmark': arguments.benchmark,
+				'generatorVersion': dungeonGenerator.GENERATOR_VERSION,
+				'python': platform.python_version(),
+				'machine': platform.machine(),
+				'sizes': arguments.sizes,
+				'seeds': arguments.seeds,
+				'results': results,
+			}, f, indent=1)
+			
+	if not arguments.baseline: return 0
+	with open(arguments.baseline) as f:
+		baseline = json.load(f)['results']
+	measure = 'seconds' if arguments.benchmark == 'stages' else 'p50Seconds'
+	comparison = compareResults(results, baseline, keys, measure, arguments.threshold, minSeconds)
+	printResults('Compared with ' + arguments.baseline, comparison)
+	regressions = [c for c in comparison if c['regression']]
+	for c in regressions:
+		print('%s takes %.2f times as long as the baseline' % (', '.join('%s %s' % (k, c[k]) for k in keys), c['ratio']))
+	return 1 if regressions else 0
+	
+	
+if __name__ == '__main__':
+	parser = ArgumentParser(description='Benchmarks for the dungeon generator')
+	parser.add_argument('benchmark', nargs='?', choices=('all', 'stages', 'ticks', 'soak', 'batch'), default='all',
+		help='all prints every benchmark, stages times each step of generating a level, ticks times the game loop, soak plays lots of games checking nothing breaks, '
+		'batch times generating dungeons with more and more worker processes')
+	parser.add_argument('--sizes', type=int, nargs='+', help='tiles per side of the dungeons')
+	parser.add_argument('--seeds', type=int, nargs='+', default=list(STAGE_SEEDS), help='seeds every size is built from for stages, the first is used for ticks')
+	parser.add_argument('--enemies', type=int, nargs='+', help='amounts of enemies to fill each game up to for ticks')
+	parser.add_argument('--ticks', type=int, default=TICK_COUNT, help='ticks to run each game for, for ticks and soak')
+	parser.add_argument('--sessions', type=int, default=50, help='games to play for soak')
+	parser.add_argument('--workers', type=int, nargs='+', help='amounts of worker processes to try for batch')
+	parser.add_argument('--count', type=int, default=BATCH_COUNT, help='dungeons to build with each amount of workers for batch')
+	parser.add_argument('--json', help='file to save the stages or ticks results to')
+	parser.add_argument('--baseline', help='results saved earlier with --json to compare with')
+	parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help='how many times slower than the baseline anything can get before it fails')
+	parser.add_argument('--no-memory', action='store_true', help='skip measuring memory for stages, which builds every dungeon a second time')
+	arguments = parser.parse_args()
+	
+	if arguments.benchmark == 'stages':
+		arguments.sizes = arguments.sizes or list(STAGE_SIZES)
+		results = benchmarkStages(arguments.sizes, arguments.seeds, memory=not arguments.no_memory)
+		sys.exit(saveAndCompare(arguments, 'Generation stages', results, ('size', 'stage'), REGRESSION_MIN_SECONDS))
+		
+	if arguments.benchmark == 'ticks':
+		arguments.sizes = arguments.sizes or list(TICK_SIZES)
+		results = benchmarkTicks(arguments.sizes, arguments.enemies or TICK_ENEMIES, arguments.ticks, arguments.seeds[0])
+		sys.exit(saveAndCompare(arguments, 'Game ticks', results, ('size', 'enemies', 'system'), TICK_REGRESSION_MIN_SECONDS))
+		
+	if arguments.benchmark == 'soak':
+		soak = soakTest(arguments.sessions, arguments.ticks, (arguments.sizes or [35])[0])
+		for problem in soak['problems']:
+			print('seed %d tick %d: %s' % problem)
+		printResults('Soak test', [dict(soak, problems=len(soak['problems']))])
+		sys.exit(1 if soak['problems'] else 0)
+		
+	if arguments.benchmark == 'batch':
+		printResults('Batch generation', benchmarkBatch(arguments.count, arguments.workers, (arguments.sizes or [None])[0]))
+		sys.exit(0)
+		
+	printResults('Grid storage', benchmarkStorage())
+	printResults('Caves', benchmarkCaves())
+	printResults('Room placement', benchmarkRooms())
+	printResults('Room placement strategies', benchmarkRoomStrategies())
+	printResults('Corridors', benchmarkCorridors())
+	printResults('Joining areas', benchmarkJoins())
+	printResults('Path finding', benchmarkPaths())
+	printResults('Navigation graph', benchmarkNavGraph())
+	printResults('Flow fields', benchmarkFlowField())
+	printResults('Batch generation', benchmarkBatch())
+	printResults('Saving and loading', benchmarkFormat())
+	printResults('Generation stages', benchmarkStages())
+	printResults('Game ticks', benchmarkTicks())
@@ -0,0 +1,1023 @@
+import dungeonGenerator
+import dungeonBatch
+import dungeonPipeline
+import levelCache
+
+from array import array
+from math import cos, floor, hypot, sin, sqrt
+from os import path
+from re import findall
+from time import perf_counter
+
+# Everything in Dungeon Game that isn't drawing or touch handling, so the game can be simulated without Pythonista
+# Dungeon Game.py draws it with the scene module, anything else can run DungeonSimulation on its own, see DungeonSimulation
+
+try:
+	from scene import ellipse, fill, image, pop_matrix, push_matrix, rect, rotate, text, tint, translate
+except ImportError:
+	# not running in Pythonista, the game can still be simulated but nothing can be drawn
+	pass
+	
+try:
+	import numpy
+except ImportError:
+	# enemies are moved one at a time instead
+	numpy = None
+	
+EMPTY = 0
+FLOOR = 1
+CORRIDOR = 2
+DOOR = 3
+DOOR_LOCKED = 4
+WALL = 5
+OBSTACLE = 6
+CAVE = 7
+CHEST_CLOSED = 8
+CHEST_OPEN = 9
+CHEST_EMPTY = 10
+
+# Room Types (Negative numbers mean rooms don't have enemies)
+
+START = -1
+END = -2
+
+SKULL = 1
+BLUE_SLIME = 2
+GREEN_SLIME = 3
+PURPLE_SLIME = 4
+
+# Item Categories
+WEAPONS = 0
+ARMOR = 1
+TOOLS = 2
+
+# How many steps away from the player enemies can find their way around walls
+FLOW_RADIUS = 24
+# roomIdAt() for blocks not in any room or corridor
+NO_AREA = -1
+NO_AREAS = frozenset()
+
+# Enemies move if they are in a room or corridor the player is in, or this many rooms and corridors away from one
+ACTIVATION_HOPS = 0
+# Below this many active enemies it is quicker to move them one at a time than with numpy
+VECTOR_ENEMIES = 128
+
+# Levels that have been played before are loaded from here instead of being generated again
+LEVEL_CACHE = path.join(path.dirname(path.abspath(__file__)), 'Levels')
+# Print how long each step of generating a level took
+PROFILE_GENERATION = False
+
+class Point (object):
+	'''
+	the parts of scene.Point the game logic uses, so it doesn't need Pythonista
+	'''
+	def __init__(self, x, y):
+		self.x = x
+		self.y = y
+		
+	def __sub__(self, other):
+		return Point(self.x - other.x, self.y - other.y)
+		
+	def __abs__(self):
+		return hypot(self.x, self.y)
+		
+class Rect (object):
+	'''
+	the parts of scene.Rect the game logic uses, so it doesn't need Pythonista
+	'''
+	def __init__(self, x, y, w, h):
+		self.x = x
+		self.y = y
+		self.w = w
+		self.h = h
+		
+	def center(self):
+		return Point(self.x + self.w * 0.5, self.y + self.h * 0.5)
+		
+	def intersects(self, other):
+		return self.x < other.x + other.w and other.x < self.x + self.w and self.y < other.y + other.h and other.y < self.y + self.h
+		
+	def __contains__(self, point):
+		return self.x <= point.x < self.x + self.w and self.y <= point.y < self.y + self.h
+		
+class DungeonSimulation (object):
+	'''
+	the game itself, a map with a player and enemies that moves on by dt seconds every time simulate() is called
+	mixed into DungeonGame for playing, or used on its own to run the game without drawing anything:
+	
+		game = DungeonSimulation()
+		game.newGame(seed)
+		game.moveAngle = 0 # walk up
+		game.simulate(1 / 60)
+	'''
+	
+	# the methods simulate() calls in order, each is passed dt
+	systems = ('moveCharacter', 'updatePlayer', 'updateEntities')
+	# None, or a callable taking the name of a system and the seconds it took, called after each one runs
+	profiler = None
+	# if false levels are always generated rather than loaded from LEVEL_CACHE
+	cacheLevels = True
+	levels = None
+	
+	def newGame(self, seed=-1, mapSize=35):
+		self.mapSize = mapSize  # Small: 35, Medium: 55, Large: 70
+		self.entities = []
+		self.enemies = EnemyStore()
+		self.clock = 0 # seconds simulated since the game started
+		self.moveAngle = None # the direction the player is walking in, None when standing still
+		self.selectedItem = None
+		
+		self.craftingTabs = [[] for i in range(3)]
+		self.craftableItems = [BoneDagger(), WoodenShield(), Bomb()]
+		for item in self.craftableItems:
+			self.craftingTabs[item.getCategory()].append(item)
+			
+		self.generateMap(seed)
+		self.spawnPlayer()
+		self.state = 'Play'
+		
+	def generateMap(self, s=-1):
+		# the level only depends on the seed, enemies and chests have their own random streams so changing one doesn't move the others
+		# a seed that has been played before is loaded from the cache, skipping generation
+		profiler = dungeonPipeline.stageProfiler() if PROFILE_GENERATION else None
+		params = {'size': self.mapSize, 'maxDeadends': 3}
+		if self.cacheLevels:
+			if self.levels is None:
+				self.levels = levelCache.levelCache(LEVEL_CACHE)
+			self.d = self.levels.build(s if s > 0 else None, params, profiler)
+		else:
+			self.d = dungeonBatch.buildDungeon(s if s > 0 else None, params, profiler)
+		if profiler:
+			for stage in profiler.report():
+				print(stage)
+		population = self.d.populationRng
+		loot = self.d.lootRng
+		
+		self.map = self.d.grid
+		self.rooms = self.d.rooms
+		
+		for i, r in enumerate(self.rooms):
+			r.rect = Rect(r.x, r.y, r.width, r.height)
+			r.type = population.choice([SKULL, SKULL, SKULL, BLUE_SLIME, GREEN_SLIME, PURPLE_SLIME])
+			r.entities = []
+			r.id = i
+			r.area = r.width * r.height
+			
+		roomsBySize = sorted(self.rooms, key=lambda x: x.area)
+		roomsBySize[0].type = START
+		roomsBySize[-1].type = END
+		
+		self.chestContents = {}
+		keysToPlace = 2
+		for r in self.rooms:
+			if r.type > 0:
+				for i in range(population.randint(2, 4)):
+					self.addEnemy(self.getEntityForRoom(r, population.randrange(r.x, r.x + r.width), population.randrange(r.y, r.y + r.height)))
+					
+				while True:
+					chestOnLeftRight = True if population.randint(0, 1) == 1 else False
+					if chestOnLeftRight:
+						chestX = population.choice([r.x, r.x + r.width - 1])
+						chestY = population.randint(r.y, r.y + r.height - 1)
+					else:
+						chestX = population.randint(r.x, r.x + r.width - 1)
+						chestY = population.choice([r.y, r.y + r.height - 1])
+						
+					# if chest is blocking a door or corridor, choose a new spot
+					if not all(self.blockAt(*n) in [WALL, FLOOR] for n in self.d.findNeighboursDirect(chestX, chestY)):
+						continue
+						
+					self.setBlock(chestX, chestY, CHEST_CLOSED)
+					self.chestContents[(chestX, chestY)] = [loot.choice([Wood(loot.randint(1, 3)), Stone(loot.randint(1, 3))])]
+					if keysToPlace > 0:
+						self.chestContents[(chestX, chestY)].append(Key())
+						keysToPlace -= 1
+						
+					r.allDead = False
+					break
+					
+			if r.type == END: # Lock doors to boss room
+				for x in range(r.x - 1, r.x + r.width + 1):
+					for y in range(r.y - 1, r.y + r.height + 1):
+						if self.blockAt(x, y) == DOOR:
+							self.setBlock(x, y, DOOR_LOCKED)
+							
+		# maps blocks to the rooms and corridors they are in, rooms have the ids 0 to len(rooms) - 1 and each group of corridors gets the next id
+		# one number per block (roomMap[x][y]), the id of its room or corridor, or NO_AREA
+		# some walls are next to a room and a corridor, those get -2 - i where roomOverflow[i] is the set of ids, see roomAt()
+		# there are fewer rooms, corridors and shared walls than blocks, so small maps can use 2 byte numbers
+		typecode = 'h' if self.mapSize * self.mapSize < 32767 else 'i'
+		self.roomMap = [array(typecode, [NO_AREA]) * self.mapSize for x in range(self.mapSize)]
+		self.roomOverflow = []
+		
+		for r in self.rooms:
+			for x in range(r.x - 1, r.x + r.width + 1): # add boundary for wall
+				for y in range(r.y - 1, r.y + r.height + 1):
+					if 0 < x < self.mapSize and 0 < y < self.mapSize:
+						if not self.blockAt(x, y) == DOOR:
+							self.addToArea(x, y, r.id)
+							
+							
+		for x in range(self.mapSize):
+			for y in range(self.mapSize):
+				if self.d.grid[x][y] == CORRIDOR:
+					for n in self.d.findNeighboursDirect(x, y):
+						if self.d.grid[n[0]][n[1]] == FLOOR:
+							self.setBlock(x, y, DOOR)
+							
+							
+		# each group of corridors touching each other (diagonals included) gets its own id, as do the walls around it
+		corridors = self.d.labelComponents([CORRIDOR], diagonal=True)
+		for label in range(1, corridors.count + 1):
+			id = len(self.rooms) + label - 1
+			for x, y in corridors.cells(label):
+				self.addToArea(x, y, id)
+				for tile in self.d.findNeighbours(x, y):
+					self.addToArea(tile[0], tile[1], id)
+					
+		# rooms and corridors together, ids go from 0 to areaCount - 1
+		self.areaCount = len(self.rooms) + corridors.count
+		# most of the walls between a room and a corridor are in the same two, so they can share one set
+		shared = {}
+		codes = [-2 - shared.setdefault(frozenset(ids), len(shared)) for ids in self.roomOverflow]
+		self.roomOverflow = list(shared)
+		for column in self.roomMap:
+			for y, current in enumerate(column):
+				if current < NO_AREA:
+					column[y] = codes[-2 - current]
+		# roomAt() hands these out so it never makes a new set
+		self.areaSets = [frozenset((id,)) for id in range(self.areaCount)]
+		self.activation = RoomActivation(self.roomOverflow, self.areaCount, ACTIVATION_HOPS)
+		
+		if self.d.deadends:
+			for d in self.d.deadends:
+				self.setBlock(d[0], d[1], CHEST_OPEN)
+				self.chestContents[d] = [loot.choice([Wood(loot.randint(1, 3)), Stone(loot.randint(1, 3))])]
+				
+		# enemies walk on the same blocks as the player, see Player.canWalk()
+		self.d.constructNavGraph(blocked=[b for b in range(256) if not 0 < b < 4])
+		self.flowField = dungeonGenerator.flowField(self.d, FLOW_RADIUS)
+		
+		
+	def getEntityForRoom(self, room, x, y):
+		if room.type == SKULL:
+			return Skull(x, y, room)
+		elif room.type == BLUE_SLIME:
+			return BlueSlime(x, y, room)
+		elif room.type == GREEN_SLIME:
+			return GreenSlime(x, y, room)
+		elif room.type == PURPLE_SLIME:
+			return PurpleSlime(x, y, room)
+			
+	def addEnemy(self, e):
+		self.entities.append(e)
+		e.room.entities.append(e)
+		self.enemies.add(e)
+		
+	def removeEnemy(self, e):
+		self.entities.remove(e)
+		e.room.entities.remove(e)
+		self.enemies.remove(e)
+		
+	def activeEntities(self):
+		'''
+		the enemies in the rooms the player is in or near, see RoomActivation
+		'''
+		return self.enemies.inRooms(self.activation.active)
+		
+	def spawnPlayer(self):
+		playerRoom = [r for r in self.rooms if r.type == START][0]
+		x = playerRoom.x
+		y = playerRoom.y
+		wid = playerRoom.width
+		hei = playerRoom.height
+		self.player = Player(x + wid / 2, y + hei / 2)
+		
+	def mapText(self):
+		'''
+		the map as text, one character per block with a star for the player
+		'''
+		t = ['#', ' ', '•', '=', '~', '%', '*', 'C', '$', '€', '£']
+		
+		s = ''
+		for y in range(self.mapSize - 1, -1, -1):
+			for x in range(0, self.mapSize):
+				s += '*' if (x, y) == (floor(self.player.x), floor(self.player.y)) else t[self.map[x][y]]
+			s += '\n'
+		return s
+		
+	def blockAt(self, x, y):
+		if x < 0 or y < 0: return EMPTY
+		try:
+			return self.map[floor(x)][floor(y)]
+		except IndexError:
+			return EMPTY
+			
+	def addToArea(self, x, y, id):
+		column = self.roomMap[x]
+		current = column[y]
+		if current == NO_AREA:
+			column[y] = id
+		elif current >= 0:
+			if current != id:
+				self.roomOverflow.append({current, id})
+				column[y] = -1 - len(self.roomOverflow)
+		else:
+			self.roomOverflow[-2 - current].add(id)
+			
+	def roomIdAt(self, x, y):
+		'''
+		the number roomMap holds for x,y, the room or corridor id if it is in just one, NO_AREA if it is in none
+		'''
+		if x < 0 or y < 0: return NO_AREA
+		try:
+			return self.roomMap[floor(x)][floor(y)]
+		except IndexError:
+			return NO_AREA
+		
+	def inRoom(self, x, y, id):
+		'''
+		true if x,y is in the room or corridor with that id, quicker than id in roomAt(x, y)
+		'''
+		if x < 0 or y < 0: return False
+		try:
+			current = self.roomMap[floor(x)][floor(y)]
+		except IndexError:
+			return False
+		return current == id or (current < NO_AREA and id in self.roomOverflow[-2 - current])
+		
+	def roomAt(self, x, y):
+		'''
+		the set of room and corridor ids x,y is in, shared between calls so it mustn't be changed
+		'''
+		current = self.roomIdAt(x, y)
+		if current >= 0: return self.areaSets[current]
+		if current == NO_AREA: return NO_AREAS
+		return self.roomOverflow[-2 - current]
+			
+	def setBlock(self, x, y, block):
+		if x < 0 or y < 0: return False
+		try:
+			self.d.setTile(floor(x), floor(y), block)
+			return True
+		except IndexError:
+			return False
+			
+	def canWalk(self, x, y):
+		return self.player.canWalk(self.blockAt(x, y))
+		
+	def simulate(self, dt):
+		'''
+		moves the game on by dt seconds, nothing happens unless the player is playing (not dead or in the inventory)
+		'''
+		if self.state != 'Play':
+			return
+		self.clock += dt
+		if self.profiler is None:
+			for system in self.systems:
+				getattr(self, system)(dt)
+		else:
+			for system in self.systems:
+				start = perf_counter()
+				getattr(self, system)(dt)
+				self.profiler(system, perf_counter() - start)
+			
+	def moveCharacter(self, dt):
+		s = dt * self.player.speed
+		
+		SMALL = 0.0001
+		
+		if self.moveAngle is not None:
+			a = self.moveAngle
+			
+			self.player.x += sin(a) * s
+			dx = self.player.getLeft() % 1
+			if not self.canWalk(self.player.getLeft(), self.player.getBottom()) or not self.canWalk(self.player.getLeft(), self.player.getTop()): # LEFT
+				self.player.x += 1 - dx + SMALL
+				
+			dx = self.player.getRight() % 1
+			if not self.canWalk(self.player.getRight(), self.player.getBottom()) or not self.canWalk(self.player.getRight(), self.player.getTop()): # RIGHT
+				self.player.x -= dx + SMALL
+				
+			self.player.y += cos(a) * s
+			dy = self.player.getBottom() % 1
+			if not self.canWalk(self.player.getLeft(), self.player.getBottom()) or not self.canWalk(self.player.getRight(), self.player.getBottom()): # DOWN
+				self.player.y += 1 - dy + SMALL
+				
+			dy = self.player.getTop() % 1
+			if not self.canWalk(self.player.getLeft(), self.player.getTop()) or not self.canWalk(self.player.getRight(), self.player.getTop()): # UP
+				self.player.y -= dy + SMALL
+				
+	def updatePlayer(self, dt):
+		self.player.update(self, dt)
+		
+	def updateEntities(self, dt):
+		self.flowField.update(floor(self.player.x), floor(self.player.y))
+		self.activation.update(self.roomAt(self.player.x, self.player.y))
+		self.enemies.update(self, dt)
+			
+	def attack(self, x, y):
+		'''
+		the player attacks whatever is at x,y if it is close enough, returns true if an enemy was hit
+		'''
+		for e in self.entities:
+			if Point(x, y) in e.getRect():
+				if abs(e.getCenterpoint() - self.player.getCenterpoint()) < self.player.getRange(self.selectedItem):
+					if self.player.getRect().intersects(e.room.rect):
+						e.hurt(self.player.getDamage(self.selectedItem), self)
+						return True
+		return False
+		
+	def useBlock(self, x, y):
+		'''
+		empties the chest or unlocks the door (with a key) at x,y, returns true if something happened
+		'''
+		if self.blockAt(x, y) == CHEST_OPEN:
+			self.player.receiveItems(*self.chestContents[(floor(x), floor(y))])
+			self.chestContents[(floor(x), floor(y))] = []
+			self.setBlock(x, y, CHEST_EMPTY)
+			return True
+			
+		elif self.blockAt(x, y) == DOOR_LOCKED:
+			if self.selectedItem is not None and isinstance(self.player.inventory[self.selectedItem], Key):
+				self.setBlock(x, y, DOOR)
+				self.player.subtractItems([Key()])
+				return True
+		return False
+		
+	def craft(self, itemToCraft):
+		'''
+		makes the item if the player has everything in its recipe, returns true if it was made
+		'''
+		if not self.player.hasItems(itemToCraft.getRecipe()):
+			return False
+		self.player.subtractItems(itemToCraft.getRecipe())
+		self.player.receiveItem(itemToCraft.copy())
+		return True
+		
+	def respawn(self):
+		self.state = 'Play'
+		self.moveAngle = None
+		self.spawnPlayer()
+		
+class Player (object):
+	def __init__(self, x, y):
+		self.x = x
+		self.y = y
+		self.inventory = [None] * 24
+		self.speed = 4 # Speed is in blocks per second, default 4
+		self.health = 20
+		self.maxHealth = 20
+		self.healSpeed = 0.5
+		self.damage = 2
+		self.range = 2
+		self.coins = 0
+		self.newCoins = 0
+		self.coinCollectSpeed = lambda x: max(x / 7, 0.2) #max(x ** 0.85, 0.2)
+		self.hurtTime = 9999
+		self.image = 'plc:Character_Boy'
+		
+	def update(self, game, dt):
+		if self.newCoins > 0.4:
+			self.coins += self.coinCollectSpeed(self.newCoins)
+			self.newCoins -= self.coinCollectSpeed(self.newCoins)
+		elif self.newCoins > 0:
+			self.coins += self.newCoins
+			self.coins = round(self.coins)
+			self.newCoins = 0
+			
+		if self.hurtTime > 10:
+			self.heal(self.healSpeed * dt)
+			
+		self.hurtTime += dt
+		
+	def receiveItem(self, item):
+		for i in self.inventory:
+			if i and i.name == item.name:
+				i = i + item
+				return
+		if None in self.inventory:
+			self.inventory[self.inventory.index(None)] = item
+			
+	def receiveItems(self, *items):
+		for item in items: self.receiveItem(item)
+		
+	def receiveCoins(self, coins):
+		self.newCoins += coins
+		
+	def hasItems(self, itemList):
+		for item in itemList:
+			if not any(type(playerItem) == type(item) and (playerItem >= item) for playerItem in self.inventory):
+				return False
+		return True
+		
+	def subtractItems(self, itemList):
+		for item in itemList:
+			for playerItem in self.inventory:
+				if type(item) == type(playerItem):
+					self.inventory[self.inventory.index(playerItem)] -= item
+					if self.inventory[self.inventory.index(playerItem)] .amount == 0:
+						self.inventory[self.inventory.index(playerItem)] = None
+						
+	def canWalk(self, block):
+		return 0 < block < 4
+		
+	def hurt(self, damage, game):
+		self.health -= damage
+		if self.health <= 0:
+			game.state = 'Death'
+		self.hurtTime = 0
+		
+	def heal(self, regen):
+		self.health = min(self.maxHealth, self.health + regen)
+		
+	def setTint(self):
+		tint(1, min(1, self.hurtTime), min(1, self.hurtTime))
+		
+	def getDamage(self, selectedItem):
+		if selectedItem is not None:
+			if isinstance(self.inventory[selectedItem], Weapon):
+				return self.inventory[selectedItem].getDamage()
+		return self.damage
+		
+	def getRange(self, selectedItem):
+		return self.range
+		
+	def getCenterpoint(self):
+		return self.getRect().center()
+
+	def getRect(self):
+		return Rect(self.getLeft(), self.getBottom(), 0.7, 0.8)
+		
+	def getLeft(self):
+		return self.x - 0.35
+		
+	def getRight(self):
+		return self.x + 0.35
+		
+	def getBottom(self):
+		return self.y - 0.2
+		
+	def getTop(self):
+		return self.y + 0.6
+		
+class RoomActivation (object):
+	'''
+	keeps track of which rooms and corridors are near the player, so only the enemies in them are moved or drawn
+	an area (room or corridor id, as in roomMap) is active if the player is in it, or it is within hops steps of one the player is in,
+	a step going between two areas that share a block, which are the blocks in roomOverflow
+	'''
+	def __init__(self, roomOverflow, areaCount, hops=0):
+		self.hops = hops
+		self.neighbours = [set() for i in range(areaCount)]
+		for ids in roomOverflow:
+			for area in ids:
+				self.neighbours[area] |= ids
+		for area, neighbours in enumerate(self.neighbours):
+			neighbours.discard(area)
+		self.current = frozenset()
+		self.active = frozenset()
+		
+	def update(self, ids):
+		'''
+		call with the areas the player is in every tick, the active areas are only worked out again when they change
+		returns true if they changed
+		'''
+		if ids is self.current or ids == self.current:
+			return False
+		self.current = frozenset(ids)
+		active = set(ids)
+		frontier = active
+		for hop in range(self.hops):
+			frontier = set().union(*(self.neighbours[area] for area in frontier)) - active
+			active |= frontier
+		self.active = frozenset(active)
+		return True
+		
+class EnemyStore (object):
+	'''
+	every enemy in the game kept in parallel arrays, one slot per enemy, so they can all be moved in one loop by update()
+	the Enemy objects are views onto their slot, see storedField
+	removing an enemy moves the last one into its slot
+	'''
+	fields = ('x', 'y', 'timer', 'speed', 'health', 'damage', 'width')
+	
+	def __init__(self):
+		for name in self.fields:
+			setattr(self, name, array('d'))
+		self.roomIds = array('i')
+		# the furthest each enemy can go, the edges of its room
+		self.minX = array('d')
+		self.maxX = array('d')
+		self.minY = array('d')
+		self.maxY = array('d')
+		self.views = []
+		# room id to the slots of the enemies in that room
+		self.byRoom = {}
+		
+	def __len__(self):
+		return len(self.views)
+		
+	def add(self, e):
+		pending = e.__dict__.pop('pending')
+		for name in self.fields:
+			getattr(self, name).append(pending[name])
+		r = e.room
+		self.roomIds.append(r.id)
+		self.minX.append(r.x)
+		self.maxX.append(r.x + r.width)
+		self.minY.append(r.y)
+		self.maxY.append(r.y + r.height)
+		e.index = len(self.views)
+		e.store = self
+		self.byRoom.setdefault(r.id, []).append(e.index)
+		self.views.append(e)
+		
+	def remove(self, e):
+		i = e.index
+		# keep the values on the enemy so it can still be drawn or looked at
+		e.pending = {name: getattr(self, name)[i] for name in self.fields}
+		e.store = None
+		self.byRoom[self.roomIds[i]].remove(i)
+		if i != len(self.views) - 1:
+			slots = self.byRoom[self.roomIds[-1]]
+			slots[slots.index(len(self.views) - 1)] = i
+		last = self.views.pop()
+		for values in [getattr(self, name) for name in self.fields] + [self.roomIds, self.minX, self.maxX, self.minY, self.maxY]:
+			values[i] = values[-1]
+			values.pop()
+		if last is not e:
+			self.views[i] = last
+			last.index = i
+			
+	def inRooms(self, rooms):
+		'''
+		Returns:
+		list of the enemies in any of the rooms
+		'''
+		views = self.views
+		byRoom = self.byRoom
+		return [views[i] for room in rooms for i in byRoom.get(room, ())]
+		
+	def update(self, game, dt):
+		'''
+		moves every enemy in the active rooms (see RoomActivation) towards the player, and hurts the player with the ones close enough
+		with numpy and at least VECTOR_ENEMIES of them active they are all done at once by updateArrays(), otherwise one at a time here
+		'''
+		player = game.player
+		byRoom = self.byRoom
+		slots = [byRoom[room] for room in game.activation.active if room in byRoom]
+		if not slots:
+			return
+		slots = [i for room in slots for i in room]
+		if numpy is not None and len(slots) >= VECTOR_ENEMIES:
+			self.updateArrays(game, dt, slots)
+			return
+		xs, ys, timers, speeds, damages, widths = self.x, self.y, self.timer, self.speed, self.damage, self.width
+		minX, maxX, minY, maxY = self.minX, self.maxX, self.minY, self.maxY
+		nextStep = game.flowField.nextStep
+		steps = {} # enemies in the same block head for the same next block
+		px = player.x
+		py = player.y
+		# the centre of Player.getRect()
+		pcy = py + 0.2
+		
+		for i in slots:
+			x = xs[i]
+			y = ys[i]
+			half = widths[i] * 0.5
+			dx = px - x - half
+			dy = pcy - y - half
+			if dx * dx + dy * dy > 0.49: # further than 0.7 blocks
+				if timers[i] < 1:
+					timers[i] += dt
+					continue
+				# enemies never leave their rooms, so x and y are never negative and int() is the same as floor()
+				cell = (int(x + 0.5), int(y + 0.5))
+				step = steps.get(cell, False)
+				if step is False:
+					step = steps[cell] = nextStep(*cell)
+				if step is not None: # head for the next block on the way to the player
+					tx = step[0] - x
+					ty = step[1] - y
+				else:
+					tx = px - x
+					ty = py - y
+				s = dt * speeds[i]
+				length = sqrt(tx * tx + ty * ty)
+				if length:
+					x += tx * s / length
+					y += ty * s / length
+				else:
+					y += s
+					
+				if x < minX[i]:
+					x = minX[i]
+				elif x > maxX[i]:
+					x = maxX[i]
+				if y < minY[i]:
+					y = minY[i]
+				elif y > maxY[i]:
+					y = maxY[i]
+				xs[i] = x
+				ys[i] = y
+				
+			elif timers[i] >= 1:
+				player.hurt(damages[i], game)
+				timers[i] = 0
+			else:
+				timers[i] += dt
+				
+	def updateArrays(self, game, dt, slots):
+		'''
+		update() for the enemies in slots, each step is done for all of them at once with numpy on views of the arrays,
+		giving exactly the same numbers as moving them one at a time
+		'''
+		player = game.player
+		slots = numpy.array(slots, dtype=numpy.intp)
+		xs = numpy.frombuffer(self.x)
+		ys = numpy.frombuffer(self.y)
+		timers = numpy.frombuffer(self.timer)
+		x = xs[slots]
+		y = ys[slots]
+		half = numpy.frombuffer(self.width)[slots] * 0.5
+		px = player.x
+		py = player.y
+		dx = px - x - half
+		dy = py + 0.2 - y - half
+		far = dx * dx + dy * dy > 0.49 # further than 0.7 blocks
+		ready = timers[slots] >= 1
+		timers[slots[~ready]] += dt
+		attacking = slots[ready & ~far]
+		if len(attacking):
+			damages = self.damage
+			for i in attacking.tolist():
+				player.hurt(damages[i], game)
+			timers[attacking] = 0
+		moving = ready & far
+		if not moving.any():
+			return
+			
+		slots = slots[moving]
+		x = x[moving]
+		y = y[moving]
+		# enemies never leave their rooms, so x and y are never negative and truncating is the same as floor()
+		cells, blocks = numpy.unique(((x + 0.5).astype(numpy.int64) << 32) | (y + 0.5).astype(numpy.int64), return_inverse=True)
+		# enemies in the same block head for the same next block, or straight for the player if there isn't one
+		nextStep = game.flowField.nextStep
+		targets = numpy.array([nextStep(cell >> 32, cell & 0xffffffff) or (px, py) for cell in cells.tolist()], dtype=numpy.float64)[blocks.reshape(-1)]
+		tx = targets[:, 0] - x
+		ty = targets[:, 1] - y
+		s = dt * numpy.frombuffer(self.speed)[slots]
+		length = numpy.sqrt(tx * tx + ty * ty)
+		# an enemy already on its target has nowhere to face, it moves up
+		stuck = length == 0
+		length[stuck] = 1
+		x = numpy.where(stuck, x, x + tx * s / length)
+		y = numpy.where(stuck, y + s, y + ty * s / length)
+		xs[slots] = numpy.minimum(numpy.maximum(x, numpy.frombuffer(self.minX)[slots]), numpy.frombuffer(self.maxX)[slots])
+		ys[slots] = numpy.minimum(numpy.maximum(y, numpy.frombuffer(self.minY)[slots]), numpy.frombuffer(self.maxY)[slots])
+		
+class storedField (object):
+	'''
+	an Enemy attribute kept in its EnemyStore's arrays, before the enemy is added to a store (or after it is removed) it is kept on the enemy
+	'''
+	def __init__(self, name):
+		self.name = name
+		
+	def __get__(self, e, owner):
+		if e is None:
+			return self
+		if e.store is None:
+			return e.__dict__['pending'][self.name]
+		return getattr(e.store, self.name)[e.index]
+		
+	def __set__(self, e, value):
+		if e.store is None:
+			e.__dict__.setdefault('pending', {})[self.name] = value
+		else:
+			getattr(e.store, self.name)[e.index] = value
+			
+class Enemy (object):
+	# enemies are moved by EnemyStore.update(), these are looked up in its arrays
+	store = None
+	x = storedField('x')
+	y = storedField('y')
+	timer = storedField('timer')
+	speed = storedField('speed')
+	health = storedField('health')
+	damage = storedField('damage')
+	width = storedField('width')
+	
+	def __init__(self, x, y, room):
+		self.timer = 1000
+		self.x = x # Lower left coordinates
+		self.y = y
+		self.room = room
+		self.hurtStart = -1000 # the game clock when it was last hurt
+		self.hurtTimer = 0.5 # How many seconds the entity takes to go from its red hurt colour back to normal
+		
+	def getRect(self):
+		return Rect(self.x, self.y, self.width, self.width)
+		
+	def hurt(self, damage, game):
+		self.health -= damage
+		if self.health <= 0:
+			game.player.receiveCoins(self.coinsDropped)
+			game.player.receiveItems(self.getDrops(game.d.lootRng))
+			game.removeEnemy(self)
+			if len(self.room.entities) == 0:
+				self.room.allDead = True
+				for x in range(self.room.x, self.room.x + self.room.width):
+					for y in range(self.room.y, self.room.y + self.room.height):
+						if game.blockAt(x, y) == CHEST_CLOSED:
+							game.setBlock(x, y, CHEST_OPEN)
+							
+		self.hurtStart = game.clock
+		
+	def setTint(self, clock):
+		tint(1, min(1, (clock - self.hurtStart) / self.hurtTimer), min(1, (clock - self.hurtStart) / self.hurtTimer))
+		
+	def getCenterpoint(self):
+		return self.getRect().center()
+		
+		
+class Skull(Enemy):
+	def __init__(self, x, y, room):
+		Enemy.__init__(self, x, y, room)
+		self.damage = 2
+		self.maxHealth = 10
+		self.coinsDropped = 5
+		self.speed = 1
+		self.health = self.maxHealth
+		self.width = 1
+		self.image = 'emj:Skull'
+		
+	def getDrops(self, rng):
+		return Bone(rng.choice([1, 1, 1, 2, 2, 3]))
+		
+class Slime(Enemy):
+	def __init__(self, x, y, room):
+		Enemy.__init__(self, x, y, room)
+		self.speed = 1.2
+		self.health = self.maxHealth
+		self.width = 1
+		self.image = 'plf:Enemy_Slime' + self.colour
+		
+	def getDrops(self, rng):
+		return Gel.getGel(self.colour, 1)
+		
+class BlueSlime (Slime):
+	def __init__(self, x, y, room):
+		self.colour = 'Blue'
+		self.damage = 3
+		self.maxHealth = 12
+		self.coinsDropped = 10
+		Slime.__init__(self, x, y, room)
+		
+class GreenSlime (Slime):
+	def __init__(self, x, y, room):
+		self.colour = 'Green'
+		self.damage = 4
+		self.maxHealth = 15
+		self.coinsDropped = 15
+		Slime.__init__(self, x, y, room)
+		
+class PurpleSlime (Slime):
+	def __init__(self, x, y, room):
+		self.colour = 'Purple'
+		self.damage = 5
+		self.maxHealth = 20
+		self.coinsDropped = 20
+		Slime.__init__(self, x, y, room)
+		
+class Item (object):
+	def __init__(self, amount=1):
+		self.amount = amount
+		self.name = ' '.join(findall('[A-Z][^A-Z]*', self.__class__.__name__)) # Split apart camel casing to get the item name from the class name
+		
+	def __add__(self, other):
+		self.amount += other.amount
+		return self
+		
+	def __sub__(self, other):
+		self.amount -= other.amount
+		return self	
+		
+	def __gt__(self, other):
+		return self.amount > other.amount
+		
+	def __ge__(self, other):
+		return self.amount >= other.amount
+		
+	def __repr__(self):
+		return self.name + ' x' + str(self.amount)
+		
+	def copy(self):
+		c = self.__class__
+		return c()
+		
+	def draw(self, x, y, w, num=True):
+		self.drawItem(x + w * 0.2, y + w * 0.2, w * 0.6)
+		if self.amount > 1 and num:
+			text(str(self.amount), 'Arial', 15, x + w * 0.98, y + w, 1)
+			
+	def drawItem(self, x, y, z):
+		pass
+		
+class CraftableItem (Item):
+	def getRecipe(self):
+		return self.recipe
+		
+	def getCategory(self):
+		return self.category
+		
+class Weapon (object):
+	def getDamage(self):
+		return self.damage
+	
+	def getRange(self):
+		return self.range
+		
+class Bone (Item):
+	def drawItem(self, x, y, w):
+		fill(1, 1, 1)
+		push_matrix()
+		translate(x + w * 0.5, y + w * 0.5)
+		rotate(45)
+		ellipse(w * -0.2, w * 0.3, w * 0.2, w * 0.2)
+		ellipse(0, w * 0.3, w * 0.2, w * 0.2)
+		rect(w * -0.1, w * -0.4, w * 0.2, w * 0.8)
+		ellipse(w * -0.2, w * -0.5, w * 0.2, w * 0.2)
+		ellipse(0, w * -0.5, w * 0.2, w * 0.2)
+		pop_matrix()
+		
+class Gel (Item):
+	def __init__(self, amount):
+		Item.__init__(self, amount)
+		
+	def getGel(colour, amount):
+		if colour == 'Green': return GreenGel(amount)
+		elif colour == 'Blue': return BlueGel(amount)
+		elif colour == 'Purple': return PurpleGel(amount)
+		
+	def drawItem(self, x, y, w):
+		tint(*self.colour)
+		image('pzl:BallGray', x, y, w, w)
+		tint('white')
+		
+class GreenGel (Gel):
+	def __init__(self, amount):
+		Gel.__init__(self, amount)
+		self.colour = (0, 1, 0)
+		
+class BlueGel (Gel):
+	def __init__(self, amount):
+		Gel.__init__(self, amount)
+		self.colour = (0, 0.5, 1)
+		
+class PurpleGel (Gel):
+	def __init__(self, amount):	
+		Gel.__init__(self, amount)
+		self.colour = (1, 0.4, 1)
+		
+class Wood (Item):
+	def drawItem(self, x, y, w):
+		image('plc:Wood_Block', x, y, w, w, 0, 20, 50, 40)
+	
+class Stone (Item):
+	def drawItem(self, x, y, w):
+		image('plc:Rock', x, y, w, w * 1.4)
+		
+class Key (Item):
+	def drawItem(self, x, y, w):
+		image('Key', x, y, w, w)
+		
+class BoneDagger (CraftableItem, Weapon):
+	def __init__(self, amount=1):
+		CraftableItem.__init__(self, amount)
+		self.category = WEAPONS
+		self.recipe = [Wood(1), Bone(1)]
+		self.damage = 3.5
+		self.range = 2
+		
+	def drawItem(self, x, y, w):
+		image('plf:SwordSilver', x, y, w, w)
+		
+class WoodenShield (CraftableItem):
+	def __init__(self, amount=1):
+		CraftableItem.__init__(self, amount)
+		self.category = ARMOR
+		self.recipe = [Wood(3)]
+		
+	def drawItem(self, x, y, w):
+		image('plf:ShieldBronze', x, y, w, w)
+		
+class Bomb (CraftableItem):
+	def __init__(self, amount=1):
+		CraftableItem.__init__(self, amount)
+		self.category = WEAPONS
+		self.recipe = [BlueGel(2), GreenGel(1)]
+		
+	def drawItem(self, x, y, w):
+		image('Bomb', x, y, w, w)
@@ -0,0 +1,285 @@
+import dungeonGenerator
+
+from array import array
+from mmap import mmap, ACCESS_READ
+import struct
+import sys
+
+# Saves dungeons to a compact binary file and loads them back without rebuilding them
+#
+# Layout, all numbers little endian:
+# header      HEADER, see below
+# tiles       4 bits per tile, column after column (tile x,y is number x * height + y), even tiles in the low half of each byte,
+#             padded to a multiple of 4 bytes
+# rooms       4 unsigned 32 bit integers per room, x, y, width, height
+# doors       unsigned 32 bit tile numbers
+# corridors   unsigned 32 bit tile numbers
+# deadends    unsigned 32 bit tile numbers
+# chests      for each chest, the tile number (u32) and amount of items (u16), then for each item the length of its name (u8),
+#             the name (utf-8) and the amount (u32)
+
+MAGIC = b'DUNG'
+VERSION = 1
+# magic, version, flags (unused), width, height, then the amount of rooms, doors, corridors, deadends and chests, and the size of the chests section in bytes
+HEADER = struct.Struct('<4sHHIIIIIIII')
+ROOM = struct.Struct('<4I')
+CHEST = struct.Struct('<IH')
+ITEM_AMOUNT = struct.Struct('<I')
+
+LOW_TILES = bytes(b & 15 for b in range(256))
+HIGH_TILES = bytes(b >> 4 for b in range(256))
+
+
+def packTiles(tiles):
+	"""
+	packs a byte per tile into 4 bits per tile
+	
+	Args:
+	tiles: bytes-like, every value must be below 16
+	
+	Returns:
+	bytes, half the length of tiles rounded up
+	"""
+	
+	# deleting every valid tile leaves only the ones too big to fit
+	if bytes(tiles).translate(None, bytes(range(16))):
+		raise ValueError('tiles must be below 16 to be saved')
+	even = bytes(tiles[0::2])
+	odd = bytes(tiles[1::2]).ljust(len(even), b'\0')
+	# each odd tile is below 16, so shifting the whole number by 4 bits never carries into the next byte
+	return (int.from_bytes(even, 'little') | (int.from_bytes(odd, 'little') << 4)).to_bytes(len(even), 'little')
+	
+def unpackTiles(packed, count):
+	"""
+	the reverse of packTiles()
+	
+	Args:
+	packed: bytes-like, made by packTiles()
+	count: integer, the amount of tiles
+	
+	Returns:
+	bytearray with a byte per tile
+	"""
+	
+	tiles = bytearray(len(packed) * 2)
+	tiles[0::2] = bytes(packed).translate(LOW_TILES)
+	tiles[1::2] = bytes(packed).translate(HIGH_TILES)
+	del tiles[count:]
+	return tiles
+	
+def cellArray(cells, height):
+	"""
+	Returns:
+	array of unsigned 32 bit tile numbers (x * height + y) for a list of (x, y) tuples
+	"""
+	
+	return array('I', [x * height + y for x, y in cells])
+	
+def dumpDungeon(d, chests = None):
+	"""
+	turns a dungeon into the bytes saveDungeon() writes
+	
+	Args:
+	d: the dungeonGenerator to save
+	chests: dictionary of (x, y) to a list of (item name, amount) tuples, the contents of each chest
+	
+	Returns:
+	bytes
+	"""
+	
+	height = d.height
+	tiles = d.tiles if d.compact else b''.join(bytes(column) for column in d.grid)
+	packed = packTiles(tiles)
+	packed += bytes(-len(packed) % 4)
+	
+	chestData = bytearray()
+	for (x, y), items in (chests or {}).items():
+		chestData += CHEST.pack(x * height + y, len(items))
+		for name, amount in items:
+			name = name.encode('utf-8')
+			chestData += bytes((len(name),)) + name + ITEM_AMOUNT.pack(amount)
+			
+	sections = [cellArray(cells, height) for cells in (d.doors, d.corridors, d.deadends)]
+	if sys.byteorder == 'big':
+		for section in sections: section.byteswap()
+		
+	header = HEADER.pack(MAGIC, VERSION, 0, d.width, height, len(d.rooms), len(d.doors), len(d.corridors), len(d.deadends), len(chests or {}), len(chestData))
+	rooms = b''.join(ROOM.pack(r.x, r.y, r.width, r.height) for r in d.rooms)
+	return b''.join([header, packed, rooms] + [section.tobytes() for section in sections] + [chestData])
+	
+def saveDungeon(path, d, chests = None):
+	"""
+	saves a dungeon to a file
+	
+	Args:
+	path: the file to write
+	d: the dungeonGenerator to save
+	chests: dictionary of (x, y) to a list of (item name, amount) tuples, the contents of each chest
+	
+	Returns:
+	none
+	"""
+	
+	with open(path, 'wb') as f:
+		f.write(dumpDungeon(d, chests))
+		
+class dungeonFile:
+	"""
+	a dungeon saved by saveDungeon(), the file is memory mapped so the tiles are read straight from it rather than copied
+	can be used in a with statement to close the file afterwards
+	raises ValueError if the file isn't a dungeon, is from a newer version or is truncated or corrupt
+	
+	Args:
+	path: the file to open
+	data: bytes made by dumpDungeon() to read instead of a file
+	
+	Attributes:
+	width and height: size of the dungeon
+	version: the format version the file was saved with
+	tiles: memoryview of the packed tiles, see tileAt()
+	rooms: list of (x, y, width, height) tuples
+	doors, corridors and deadends: memoryviews of unsigned 32 bit tile numbers (x * height + y), read straight from the file
+	chests: dictionary of (x, y) to a list of (item name, amount) tuples
+	"""
+	
+	def __init__(self, path = None, data = None):
+		if data is None:
+			self.file = open(path, 'rb')
+			try:
+				self.map = mmap(self.file.fileno(), 0, access=ACCESS_READ)
+			except ValueError:
+				# mmap can't map an empty file
+				self.file.close()
+				raise ValueError('dungeon file is empty')
+			self.view = view = memoryview(self.map)
+		else:
+			self.file = self.map = None
+			self.view = view = memoryview(data)
+		if len(view) < HEADER.size:
+			self.close()
+			raise ValueError('not a dungeon file')
+		magic, self.version, flags, self.width, self.height, rooms, doors, corridors, deadends, chests, chestBytes = HEADER.unpack_from(view)
+		if magic != MAGIC:
+			self.close()
+			raise ValueError('not a dungeon file')
+		if self.version > VERSION:
+			self.close()
+			raise ValueError('dungeon file version %d is newer than this reader (%d)' % (self.version, VERSION))
+			
+		size = (self.width * self.height + 1) // 2
+		expected = HEADER.size + size + (-size % 4) + rooms * ROOM.size + (doors + corridors + deadends) * 4 + chestBytes
+		if len(view) != expected:
+			self.close()
+			raise ValueError('dungeon file is %d bytes, the header says %d' % (len(view), expected))
+			
+		offset = HEADER.size
+		self.tiles = view[offset:offset+size]
+		offset += size + (-size % 4)
+		self.rooms = [ROOM.unpack_from(view, offset + i * ROOM.size) for i in range(rooms)]
+		offset += rooms * ROOM.size
+		sections = []
+		for count in (doors, corridors, deadends):
+			section = view[offset:offset+count*4].cast('I')
+			# the file is little endian, so big endian machines have to copy the numbers to swap them
+			if sys.byteorder == 'big':
+				section = array('I', section)
+				section.byteswap()
+			sections.append(section)
+			offset += count * 4
+		self.doors, self.corridors, self.deadends = sections
+		outside = any(x + width > self.width or y + height > self.height for x, y, width, height in self.rooms)
+		outside = outside or any(section and max(section) >= self.width * self.height for section in sections)
+		if outside:
+			self.close()
+			raise ValueError('dungeon file has tiles outside of the grid')
+			
+		self.chests = {}
+		try:
+			for i in range(chests):
+				cell, itemCount = CHEST.unpack_from(view, offset)
+				offset += CHEST.size
+				items = []
+				for j in range(itemCount):
+					length = view[offset]
+					name = bytes(view[offset+1:offset+1+length]).decode('utf-8')
+					offset += 1 + length
+					items.append((name, ITEM_AMOUNT.unpack_from(view, offset)[0]))
+					offset += ITEM_AMOUNT.size
+				self.chests[divmod(cell, self.height)] = items
+		except (struct.error, IndexError, UnicodeDecodeError):
+			self.close()
+			raise ValueError('dungeon file chests are corrupt')
+		if offset != len(view):
+			self.close()
+			raise ValueError('dungeon file chests are corrupt')
+			
+	def tileAt(self, x, y):
+		"""
+		Returns:
+		the tile constant at x,y, read from the packed tiles
+		"""
+		
+		cell = x * self.height + y
+		return self.tiles[cell >> 1] >> 4 if cell & 1 else self.tiles[cell >> 1] & 15
+		
+	def cells(self, section):
+		"""
+		Returns:
+		a list of (x, y) tuples for one of the doors, corridors or deadends sections
+		"""
+		
+		height = self.height
+		return [divmod(cell, height) for cell in section]
+		
+	def toGenerator(self, seed = None, rng = None, compact = True):
+		"""
+		copies the dungeon into a new dungeonGenerator so it can be changed or played
+		
+		Args:
+		seed and rng: passed to dungeonGenerator(), give the seed the dungeon was built from to get the same populationRng and lootRng
+		compact: boolean, passed to dungeonGenerator(), whether the tiles are stored in a bytearray or a list of lists
+		
+		Returns:
+		the dungeonGenerator
+		"""
+		
+		d = dungeonGenerator.dungeonGenerator(self.height, self.width, compact=compact, seed=seed, rng=rng)
+		tiles = unpackTiles(self.tiles, self.width * self.height)
+		if compact:
+			d.tiles[:] = tiles
+		else:
+			for x, column in enumerate(d.grid):
+				column[:] = tiles[x*self.height:(x+1)*self.height]
+		d.rooms = [dungeonGenerator.dungeonRoom(*room) for room in self.rooms]
+		d.doors = self.cells(self.doors)
+		d.corridors = self.cells(self.corridors)
+		d.deadends = self.cells(self.deadends)
+		return d
+		
+	def close(self):
+		"""
+		closes the file, views taken from tiles, doors, corridors and deadends must be released first
+		"""
+		
+		for name in ('tiles', 'doors', 'corridors', 'deadends', 'view'):
+			section = getattr(self, name, None)
+			if isinstance(section, memoryview): section.release()
+		if self.map is not None:
+			self.map.close()
+			self.file.close()
+		
+	def __enter__(self):
+		return self
+		
+	def __exit__(self, *exception):
+		self.close()
+		
+def loadDungeon(path):
+	"""
+	opens a dungeon saved by saveDungeon()
+	
+	Returns:
+	a dungeonFile
+	"""
+	
+	return dungeonFile(path)
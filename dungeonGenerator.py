@@ -13,7 +13,17 @@
 ##################################################################
 
 
-from random import randint, choice, randrange
+from random import Random
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Mapping
+from itertools import accumulate
+from heapq import heappush, heappop
+import re
+
+#goes up whenever the same seed and calls would build a different dungeon, so saved or cached dungeons can be thrown away
+GENERATOR_VERSION = 4
 
 #tile constants
 EMPTY = 0
@@ -25,6 +35,20 @@ WALL = 5
 OBSTACLE = 6
 CAVE = 7
 
+#bytes.translate tables for packing the grid into boards, see packBoard()
+COPY_TILES = bytes(range(256))
+CAVE_TILES = bytes(1 if t == CAVE else 0 for t in range(256))
+OPEN_TILES = bytes(1 if t in (EMPTY, CAVE) else 0 for t in range(256))
+SOLID_TILES = bytes(0 if t in (EMPTY, CAVE) else 255 for t in range(256))
+OCCUPIED_BITS = b'0' + b'1' * 255
+NOT_EMPTY = b'\x00' + b'\x01' * 255
+EMPTY_TILES = b'\x01' + b'\x00' * 255
+WALL_SOURCE_TILES = bytes(0 if t in (EMPTY, WALL) else 1 for t in range(256))
+RUN = re.compile(b'\x01+')
+
+#the least amount of patched nodes before navGraph folds them back into its arrays
+PATCH_LIMIT = 64
+
 
 class dungeonRoom:
 	"""
@@ -48,6 +72,646 @@ class dungeonRoom:
 		self.width = width
 		self.height = height
 		
+class dungeonComponents:
+	"""
+	the connected areas of a grid, as found by dungeonGenerator.labelComponents()
+	
+	Attributes:
+	width and height: size of the grid that was labelled
+	count: the amount of areas found, areas are numbered from 1 to count in the order they are first reached going through the grid by x then y
+	labels: array of integers, one for each tile stored column after column (labels[x * height + y]), 0 for tiles not in any area
+	sizes: list of integers, sizes[label] is the amount of tiles in that area, sizes[0] is 0
+	boxes: list of tuples (minX, minY, maxX, maxY), the bounding box of each area, boxes[0] is None
+	runs: list of lists, runs[label] holds the vertical runs of tiles that make up that area as tuples (x, startY, endY) where endY is exclusive
+	"""
+	
+	def __init__(self, width, height):
+		self.width = width
+		self.height = height
+		self.count = 0
+		self.labels = array('I', [0]) * (width * height)
+		self.sizes = [0]
+		self.boxes = [None]
+		self.runs = [[]]
+		
+	def labelAt(self, x, y):
+		"""
+		Returns:
+		the label of the area the tile x,y is in, 0 if none
+		"""
+		
+		return self.labels[x * self.height + y]
+		
+	def cells(self, label):
+		"""
+		Args:
+		label: integer, the area to list
+		
+		Returns:
+		a list of every tile in the area as (x,y) tuples, going by x then y
+		"""
+		
+		return [(x, y) for x, startY, endY in self.runs[label] for y in range(startY, endY)]
+		
+class navGraph(Mapping):
+	"""
+	the navigation graph built by dungeonGenerator.constructNavGraph(), stored as compressed sparse rows
+	every walkable tile is a node, numbered in the order they are reached going through the grid by x then y
+	the neighbours of node n are neighbours[offsets[n]:offsets[n+1]], unless the node has been changed since by setWalkable()
+	in which case its neighbours are patches[n] instead, tiles that become walkable are added as new nodes on the end
+	once there are more patches than a quarter of the nodes they are folded back into the arrays by rebuild(), which numbers the nodes again
+	it can still be used like the old dictionary, graph[(x, y)] builds the list of (x, y) tiles directly connected to x,y when asked for
+	
+	Attributes:
+	width and height: size of the grid
+	blocked: set of tile constants that can't be walked on
+	nodeIds: array of integers, one for each tile stored column after column (nodeIds[x * height + y]), the node id of the tile or -1 if it can't be walked on
+	nodeCells: array of integers, the tile index (x * height + y) of each node, including nodes that have since been blocked
+	offsets: array of integers, where each node's neighbours start in neighbours, with an extra entry at the end
+	neighbours: array of integers, the node ids of each node's neighbours one after another
+	patches: dictionary of node ids to arrays of their neighbours' node ids, for nodes whose neighbours changed after the graph was built
+	removed: integer, the amount of nodes that have been blocked
+	"""
+	
+	def __init__(self, width, height, nodeIds = None, nodeCells = None, offsets = None, neighbours = None, blocked = ()):
+		self.width = width
+		self.height = height
+		self.blocked = frozenset(blocked)
+		self.nodeIds = nodeIds if nodeIds is not None else array('i')
+		self.nodeCells = nodeCells if nodeCells is not None else array('I')
+		self.offsets = offsets if offsets is not None else array('I', [0])
+		self.neighbours = neighbours if neighbours is not None else array('I')
+		self.patches = {}
+		self.removed = 0
+		
+	def nodeId(self, x, y):
+		"""
+		Returns:
+		the node id of the tile x,y, -1 if it can't be walked on or is outside of the grid
+		"""
+		
+		if 0 <= x < self.width and 0 <= y < self.height and self.nodeIds:
+			return self.nodeIds[x * self.height + y]
+		return -1
+		
+	def nodeCell(self, node):
+		"""
+		Returns:
+		the tile (x,y) of a node
+		"""
+		
+		return divmod(self.nodeCells[node], self.height)
+		
+	def nodeNeighbours(self, node):
+		"""
+		Returns:
+		array of the node ids directly connected to a node
+		"""
+		
+		if node in self.patches:
+			return self.patches[node]
+		return self.neighbours[self.offsets[node]:self.offsets[node+1]]
+		
+	def findNodeNeighbours(self, x, y):
+		"""
+		looks up the walkable tiles around x,y in nodeIds, in the same order as constructNavGraph(), up, down, left then right
+		
+		Returns:
+		array of node ids
+		"""
+		
+		found = array('I')
+		for nx, ny in ((x, y-1), (x, y+1), (x-1, y), (x+1, y)):
+			node = self.nodeId(nx, ny)
+			if node >= 0: found.append(node)
+		return found
+		
+	def setWalkable(self, x, y, walkable):
+		"""
+		adds or removes the tile x,y from the graph, only the rows of the tile and its neighbours are changed (through patches)
+		
+		Args:
+		x and y: integer, grid indicies of the tile
+		walkable: boolean, whether the tile can now be walked on
+		
+		Returns:
+		True if the graph changed, False if the tile was already walkable/blocked
+		"""
+		
+		cell = x * self.height + y
+		node = self.nodeIds[cell]
+		if walkable == (node >= 0):
+			return False
+		if len(self.patches) > max(PATCH_LIMIT, len(self.nodeCells) // 4):
+			self.rebuild()
+			node = self.nodeIds[cell]
+		if walkable:
+			node = len(self.nodeCells)
+			self.nodeCells.append(cell)
+			self.offsets.append(self.offsets[-1])
+			self.nodeIds[cell] = node
+			self.patches[node] = self.findNodeNeighbours(x, y)
+		else:
+			self.nodeIds[cell] = -1
+			self.patches[node] = array('I')
+			self.removed += 1
+		for nx, ny in ((x, y-1), (x, y+1), (x-1, y), (x+1, y)):
+			n = self.nodeId(nx, ny)
+			if n >= 0: self.patches[n] = self.findNodeNeighbours(nx, ny)
+		return True
+		
+	def rebuild(self):
+		"""
+		folds the patches back into offsets and neighbours, numbering the walkable tiles again in grid order like constructNavGraph()
+		node ids change, so anything holding on to them has to look them up again (flowField does, as setWalkable() changes navVersion)
+		
+		Returns:
+		none
+		"""
+		
+		nodeIds = self.nodeIds
+		self.nodeCells = array('I', sorted(cell for node, cell in enumerate(self.nodeCells) if nodeIds[cell] == node))
+		for node, cell in enumerate(self.nodeCells):
+			nodeIds[cell] = node
+		self.offsets = array('I', [0])
+		self.neighbours = array('I')
+		for cell in self.nodeCells:
+			self.neighbours.extend(self.findNodeNeighbours(*divmod(cell, self.height)))
+			self.offsets.append(len(self.neighbours))
+		self.patches = {}
+		self.removed = 0
+		
+	def __getitem__(self, cell):
+		node = self.nodeId(*cell)
+		if node < 0:
+			raise KeyError(cell)
+		return [self.nodeCell(n) for n in self.nodeNeighbours(node)]
+		
+	def __contains__(self, cell):
+		return self.nodeId(*cell) >= 0
+		
+	def __iter__(self):
+		height = self.height
+		nodeIds = self.nodeIds
+		for node, cell in enumerate(self.nodeCells):
+			if nodeIds[cell] == node:
+				yield divmod(cell, height)
+				
+	def __len__(self):
+		return len(self.nodeCells) - self.removed
+		
+class flowField:
+	"""
+	distances to one target tile over a dungeonGenerator's navigation graph, shared by everything heading to that tile (ie enemies chasing the player)
+	it is a breadth first search out from the target, every node it reaches remembers the node it was reached from, which is its next step towards the target
+	so finding the next step for any number of agents is a lookup each
+	
+	the search is only redone when the target moves to another tile or the graph changes (dungeonGenerator.navVersion), and is limited to radius steps if one is given
+	when the target moves a single tile the distance to nearly every node changes by one, so there is nothing to gain from repairing the old field,
+	instead the arrays are reused and nodes are marked as reached with a stamp, so a search only costs the nodes within the radius, not the whole graph
+	
+	Args:
+	generator: the dungeonGenerator, constructNavGraph() must have been called
+	radius: integer, the furthest distance to search from the target, None to search the whole graph
+	
+	Attributes:
+	generator and radius: as above
+	target: tuple (x,y), the tile the field leads to, None until update() is called
+	version: the generator's navVersion when the field was built
+	stamp: integer, goes up by one each search, a node was reached by the current search if stamps[node] == stamp
+	stamps, distances, nextNodes: arrays with an entry per node, nextNodes holds the next node towards the target, -1 for the target itself
+	"""
+	
+	def __init__(self, generator, radius = None):
+		self.generator = generator
+		self.radius = radius
+		self.target = None
+		self.version = None
+		self.stamp = 0
+		self.stamps = array('I')
+		self.distances = array('I')
+		self.nextNodes = array('i')
+		
+	def update(self, x, y):
+		"""
+		moves the target to x,y, searching again if it has changed tile or the graph has changed
+		
+		Args:
+		x and y: integer, grid indicies of the target
+		
+		Returns:
+		True if the field was searched again, False if it was already up to date
+		"""
+		
+		if (x, y) == self.target and self.version == self.generator.navVersion:
+			return False
+		self.target = (x, y)
+		self.version = self.generator.navVersion
+		graph = self.generator.graph
+		# setTile() can add nodes to the graph, so grow the arrays to match
+		grow = len(graph.nodeCells) - len(self.stamps)
+		if grow > 0:
+			self.stamps.extend(array('I', [0]) * grow)
+			self.distances.extend(array('I', [0]) * grow)
+			self.nextNodes.extend(array('i', [-1]) * grow)
+		self.stamp += 1
+		start = graph.nodeId(x, y)
+		if start < 0:
+			return True
+			
+		stamp = self.stamp
+		stamps = self.stamps
+		distances = self.distances
+		nextNodes = self.nextNodes
+		offsets = graph.offsets
+		neighbours = graph.neighbours
+		patches = graph.patches
+		radius = self.radius if self.radius is not None else len(graph.nodeCells)
+		stamps[start] = stamp
+		distances[start] = 0
+		nextNodes[start] = -1
+		cells = deque((start,))
+		while cells:
+			current = cells.popleft()
+			distance = distances[current] + 1
+			if distance > radius:
+				break
+			for n in patches[current] if current in patches else neighbours[offsets[current]:offsets[current+1]]:
+				if stamps[n] != stamp:
+					stamps[n] = stamp
+					distances[n] = distance
+					nextNodes[n] = current
+					cells.append(n)
+		return True
+		
+	def distanceAt(self, x, y):
+		"""
+		Returns:
+		the amount of steps from x,y to the target, None if x,y wasn't reached
+		"""
+		
+		node = self.generator.graph.nodeId(x, y)
+		if node < 0 or node >= len(self.stamps) or self.stamps[node] != self.stamp:
+			return None
+		return self.distances[node]
+		
+	def nextStep(self, x, y):
+		"""
+		Returns:
+		the tile (x,y) to move to from x,y to get closer to the target, None if x,y is the target or wasn't reached
+		"""
+		
+		graph = self.generator.graph
+		node = graph.nodeId(x, y)
+		if node < 0 or node >= len(self.stamps) or self.stamps[node] != self.stamp or self.nextNodes[node] < 0:
+			return None
+		return graph.nodeCell(self.nextNodes[node])
+		
+class growingTreeCells:
+	"""
+	the growing tree behind dungeonGenerator.generateCorridors()
+	tiles are integer ids into boards laid out like packBoard() (tile x,y is (x+1) * (height+2) + y+1), so moving between tiles is adding or taking away a number
+	a move needs the 3 wide and 2 deep block of tiles ahead of it to be empty, across and along keep whether each tile or one of the two beside it is taken,
+	so every move is two byte lookups with no bounds checks, the padding ring counts as taken so nothing is carved onto it
+	the cells that can still grow are kept so the one a mode picks is found and taken out in O(1):
+	'l' pops the end of a list, 'r' swaps the last cell into the gap, 'm' keeps the first half of the cells in a second deque so the middle cell is always at the front of the other
+	and a weighted mix of modes swaps the last cell into the gap like 'r', so its order is only roughly oldest to newest
+	a cell that used up its only move is taken out straight away, as carving never gives a cell a move back, and no random number is drawn to pick a move when there is only one
+	the grow loops write out the lookups of moves() rather than calling it, as that is where nearly all the time goes
+	'f' needs no picking, the oldest cell is picked until it has no moves left and carving from a cell never changes which of its other moves are possible,
+	so each cell carves all its moves in a random order as soon as it is reached, which makes the same corridors one step per cell
+	
+	Args:
+	generator: the dungeonGenerator to carve into
+	mode: a mode or weighted mix of modes, as passed to generateCorridors()
+	rng: random.Random to pick cells and moves with
+	
+	Attributes:
+	stride: integer, height + 2, the difference between the ids of tiles next to each other in x
+	across: bytearray, 1 where the tile or a tile next to it in x is not EMPTY or has been carved, for moves in y
+	along: bytearray, the same for the tiles next to it in y, for moves in x
+	carved: list of the ids of the tiles carved by grow(), in the order they were carved
+	"""
+	
+	def __init__(self, generator, mode, rng):
+		if isinstance(mode, dict):
+			self.modes = list(mode)
+			self.weights = list(accumulate(mode.values()))
+		elif mode not in ('r', 'f', 'm', 'l'):
+			raise ValueError('unknown corridor mode: %s' % mode)
+		self.mode = mode
+		self.rng = rng
+		self.stride = stride = generator.height + 2
+		taken = bytearray(generator.boardBytes(generator.packBoard(NOT_EMPTY)))
+		columns = generator.width + 2
+		taken[:stride] = taken[-stride:] = b'\x01' * stride
+		taken[::stride] = taken[stride-1::stride] = b'\x01' * columns
+		# the bytes are all 0 or 1, so or-ing shifted copies of the board marks the tiles beside every taken one
+		board = int.from_bytes(taken, 'little')
+		mask = (1 << 8 * len(taken)) - 1
+		self.across = bytearray(((board | board << 8 * stride | board >> 8 * stride) & mask).to_bytes(len(taken), 'little'))
+		self.along = bytearray(((board | board << 8 | board >> 8) & mask).to_bytes(len(taken), 'little'))
+		self.carved = []
+		
+	def cellId(self, x, y):
+		"""
+		Returns:
+		the id of the tile x,y
+		"""
+		
+		return (x + 1) * self.stride + y + 1
+		
+	def moves(self, i):
+		"""
+		Returns:
+		a list of the ids of the tiles a corridor can grow into from tile i, in the same order as dungeonGenerator.getPossibleMoves()
+		"""
+		
+		across = self.across
+		along = self.along
+		found = []
+		if not (across[i-1] or across[i-2]): found.append(i-1)
+		if not (across[i+1] or across[i+2]): found.append(i+1)
+		j = i - self.stride
+		if not (along[j] or along[j-self.stride]): found.append(j)
+		j = i + self.stride
+		if not (along[j] or along[j+self.stride]): found.append(j)
+		return found
+		
+	def grow(self, start):
+		"""
+		carves corridors out from a tile until no cell can grow any more
+		
+		Args:
+		start: integer, the id of the first tile, it is carved whatever is there
+		
+		Returns:
+		the list of carved tile ids, self.carved
+		"""
+		
+		stride = self.stride
+		self.across[start-stride] = self.across[start] = self.across[start+stride] = 1
+		self.along[start-1] = self.along[start] = self.along[start+1] = 1
+		self.carved.append(start)
+		if self.mode == 'f':
+			self.growFirst()
+		elif self.mode == 'l':
+			self.growLast()
+		elif self.mode == 'm':
+			self.growMiddle()
+		else:
+			self.growPicked()
+		return self.carved
+		
+	def growFirst(self):
+		across = self.across
+		along = self.along
+		stride = self.stride
+		twoStrides = 2 * stride
+		random = self.rng.random
+		# the cells in the order they were carved are the cells still to grow from, a list can be looped over while it is added to
+		cells = self.carved
+		append = cells.append
+		for i in cells:
+			# the moves are those of moves(), each is carved and added as soon as it is found as that can't change the others,
+			# the byte that is already 1 from i being carved is left alone
+			k = 0
+			if not (across[i-2] or across[i-1]):
+				j = i - 1
+				across[j-stride] = across[j] = across[j+stride] = along[j-1] = along[j] = 1
+				append(j)
+				k += 1
+			if not (across[i+2] or across[i+1]):
+				j = i + 1
+				across[j-stride] = across[j] = across[j+stride] = along[j] = along[j+1] = 1
+				append(j)
+				k += 1
+			if not (along[i-twoStrides] or along[i-stride]):
+				j = i - stride
+				along[j-1] = along[j] = along[j+1] = across[j-stride] = across[j] = 1
+				append(j)
+				k += 1
+			if not (along[i+twoStrides] or along[i+stride]):
+				j = i + stride
+				along[j-1] = along[j] = along[j+1] = across[j] = across[j+stride] = 1
+				append(j)
+				k += 1
+			if k < 2:
+				continue
+			# then the new cells are shuffled where they are
+			end = len(cells) - k
+			if k == 2:
+				if random() < 0.5:
+					cells[end], cells[end+1] = cells[end+1], cells[end]
+			else:
+				for k in range(end + k - 1, end, -1):
+					j = end + int(random() * (k - end + 1))
+					cells[k], cells[j] = cells[j], cells[k]
+					
+	def growLast(self):
+		across = self.across
+		along = self.along
+		stride = self.stride
+		carved = self.carved
+		random = self.rng.random
+		cells = list(carved)
+		while cells:
+			i = cells[-1]
+			found = []
+			if not (across[i-1] or across[i-2]): found.append(i-1)
+			if not (across[i+1] or across[i+2]): found.append(i+1)
+			j = i - stride
+			if not (along[j] or along[j-stride]): found.append(j)
+			j = i + stride
+			if not (along[j] or along[j+stride]): found.append(j)
+			if not found:
+				cells.pop()
+				continue
+			if len(found) == 1:
+				n = cells[-1] = found[0]
+			else:
+				n = found[int(random() * len(found))]
+				cells.append(n)
+			across[n-stride] = across[n] = across[n+stride] = 1
+			along[n-1] = along[n] = along[n+1] = 1
+			carved.append(n)
+			
+	def growMiddle(self):
+		across = self.across
+		along = self.along
+		stride = self.stride
+		carved = self.carved
+		random = self.rng.random
+		# firstHalf always holds len(cells) // 2 cells, so the middle cell is at the front of secondHalf
+		firstHalf = deque()
+		secondHalf = deque(carved)
+		while secondHalf:
+			i = secondHalf[0]
+			found = []
+			if not (across[i-1] or across[i-2]): found.append(i-1)
+			if not (across[i+1] or across[i+2]): found.append(i+1)
+			j = i - stride
+			if not (along[j] or along[j-stride]): found.append(j)
+			j = i + stride
+			if not (along[j] or along[j+stride]): found.append(j)
+			if not found:
+				secondHalf.popleft()
+				if len(firstHalf) > len(secondHalf):
+					secondHalf.appendleft(firstHalf.pop())
+				continue
+			if len(found) == 1:
+				# the middle cell has used its last move, taking it out as n goes on the end keeps the halves the same size
+				n = found[0]
+				secondHalf.popleft()
+				secondHalf.append(n)
+			else:
+				n = found[int(random() * len(found))]
+				secondHalf.append(n)
+				if len(secondHalf) > len(firstHalf) + 1:
+					firstHalf.append(secondHalf.popleft())
+			across[n-stride] = across[n] = across[n+stride] = 1
+			along[n-1] = along[n] = along[n+1] = 1
+			carved.append(n)
+			
+	def growPicked(self):
+		"""
+		'r' and weighted mixes, the picked cell is swapped with the last one to take it out
+		"""
+		
+		across = self.across
+		along = self.along
+		stride = self.stride
+		carved = self.carved
+		random = self.rng.random
+		picks = None if self.mode == 'r' else self.modes
+		weights = self.weights if picks else None
+		total = weights[-1] if picks else 0
+		cells = list(carved)
+		while cells:
+			if picks is None:
+				index = int(random() * len(cells))
+			else:
+				mode = picks[bisect_right(weights, random() * total)]
+				if mode == 'l':
+					index = len(cells) - 1
+				elif mode == 'f':
+					index = 0
+				elif mode == 'm':
+					index = len(cells) // 2
+				else:
+					index = int(random() * len(cells))
+			i = cells[index]
+			found = []
+			if not (across[i-1] or across[i-2]): found.append(i-1)
+			if not (across[i+1] or across[i+2]): found.append(i+1)
+			j = i - stride
+			if not (along[j] or along[j-stride]): found.append(j)
+			j = i + stride
+			if not (along[j] or along[j+stride]): found.append(j)
+			if not found:
+				cells[index] = cells[-1]
+				cells.pop()
+				continue
+			if len(found) == 1:
+				n = found[0]
+				cells[index] = cells[-1]
+				cells[-1] = n
+			else:
+				n = found[int(random() * len(found))]
+				cells.append(n)
+			across[n-stride] = across[n] = across[n+stride] = 1
+			along[n-1] = along[n] = along[n+1] = 1
+			carved.append(n)
+			
+class mazeLattice:
+	"""
+	the cells a maze algorithm can carve, used by dungeonGenerator.generateMaze()
+	corridors are kept to the same rules as generateCorridors() by only carving on every other tile, starting from startX, startY
+	a cell can be carved if the 3x3 block of tiles around it is empty, two cells next to each other in the lattice are joined by carving the tile between them
+	
+	Args:
+	generator: the dungeonGenerator to carve into, its occupancy is built if needed
+	startX and startY: integer, 1 or 2, the first tile of the lattice in each direction
+	
+	Attributes:
+	columns and rows: size of the lattice, cell n is at tile (startX + 2 * (n // rows), startY + 2 * (n % rows))
+	usable: bytearray with a 1 for each cell that can be carved
+	degrees: bytearray with the amount of cells each cell has been joined to
+	"""
+	
+	def __init__(self, generator, startX, startY):
+		self.generator = generator
+		self.startX = startX
+		self.startY = startY
+		self.columns = max(0, (generator.width - startX) // 2)
+		self.rows = max(0, (generator.height - startY) // 2)
+		if generator.occupancy is None: generator.buildOccupancy()
+		occupancy = generator.occupancy
+		self.usable = bytearray(self.columns * self.rows)
+		for i in range(self.columns):
+			x = startX + 2 * i
+			around = occupancy[x-1] | occupancy[x] | occupancy[x+1]
+			for j in range(self.rows):
+				if not (around >> (startY + 2 * j - 1)) & 7:
+					self.usable[i * self.rows + j] = 1
+		self.degrees = bytearray(len(self.usable))
+		
+	def cell(self, node):
+		"""
+		Returns:
+		the tile (x,y) of a lattice cell
+		"""
+		
+		i, j = divmod(node, self.rows)
+		return self.startX + 2 * i, self.startY + 2 * j
+		
+	def neighbours(self, node):
+		"""
+		Returns:
+		a list of the usable cells next to a cell in the lattice
+		"""
+		
+		rows = self.rows
+		usable = self.usable
+		j = node % rows
+		found = []
+		if j > 0 and usable[node-1]: found.append(node-1)
+		if j < rows - 1 and usable[node+1]: found.append(node+1)
+		if node >= rows and usable[node-rows]: found.append(node-rows)
+		if node + rows < len(usable) and usable[node+rows]: found.append(node+rows)
+		return found
+		
+	def edges(self):
+		"""
+		Returns:
+		a list of every pair of usable cells next to each other, as tuples (a, b)
+		"""
+		
+		rows = self.rows
+		usable = self.usable
+		found = []
+		for node in range(len(usable)):
+			if not usable[node]: continue
+			if node % rows < rows - 1 and usable[node+1]: found.append((node, node+1))
+			if node + rows < len(usable) and usable[node+rows]: found.append((node, node+rows))
+		return found
+		
+	def carve(self, a, b):
+		"""
+		joins two cells next to each other, carving them and the tile between them into corridors
+		"""
+		
+		generator = self.generator
+		ax, ay = self.cell(a)
+		bx, by = self.cell(b)
+		for x, y in ((ax, ay), ((ax + bx) // 2, (ay + by) // 2), (bx, by)):
+			if generator.grid[x][y] != CORRIDOR:
+				generator.grid[x][y] = CORRIDOR
+				generator.corridors.append((x, y))
+				generator.occupancy[x] |= 1 << y
+		self.degrees[a] += 1
+		self.degrees[b] += 1
+		
 class dungeonGenerator:
 	"""
 	A renderer/framework/engine independent functions for generating random dungeons, including rooms, corridors, connects and path finding
@@ -79,31 +743,72 @@ class dungeonGenerator:
 	
 	Args:
 	height and width of the dungeon to be generated
+	compact: boolean, if true the tiles are stored in one contiguous bytearray (one byte per tile) instead of a list of lists,
+	grid is then a list of memoryview columns over that buffer so grid[x][y] reads and writes work exactly as before
+	it takes about 7 times less memory, and the whole grid passes (packBoard(), so placeWalls(), findDeadends() and generateCaves(), and floodFill())
+	work on the buffer directly which makes them 2 to 3 times quicker, but a single tile read through a memoryview column is about 25% slower than through a list,
+	so code that reads tile by tile through grid[x][y] (placeRandomRooms() without self.occupancy, the game) gets slower
+	seed: the seed for all random numbers used by the generator, so the same seed and the same calls always build the same dungeon, random if left out
+	rng: a random.Random to use instead of seed, a numpy.random.Generator can also be given and a Random is seeded from it
 	
 	Attributes:
 	width: size of the dungeon in the x dimension
 	height: size of the dungeon in the y dimension
 	grid: a 2D list (grid[x][y]) for storing tile constants (read tile map)
+	tiles: bytearray holding every tile column after column (tiles[x * height + y]), None unless compact is true
+	occupancy: list with an integer bitmask for every x, where bit y is set if grid[x][y] is not EMPTY, used by quadFits() to test a whole column of a quad at once,
+	None until buildOccupancy() is called (placeRandomRooms() and findEmptySpace() will call it), functions that change tiles outside of rooms reset it to None
 	rooms: **list of all the dungeonRoom objects in the dungeon, empty until placeRandomRooms() is called
 	doors: **list of all grid coordinates of the corridor to room connections, elements are tuples (x,y), empty until connectAllRooms() is called
 	corridors: **list of all the corridor tiles in the grid, elements are tuples (x,y), empty until generateCorridors() is called
 	deadends: list of all corridor tiles only connected to one other tile, elements are tuples (x,y), empty until findDeadends() is called
-	graph: dictionary where keys are the coordinates of all floor/corridor tiles and values are a list of floor/corridor directly connected, ie (x, y): [(x+1, y), (x-1, y), (x, y+1), (x, y-1)], empty until constructGraph() is called
+	graph: navGraph of all floor/corridor tiles, it works like a dictionary where keys are the coordinates of each tile and values are a list of floor/corridor directly connected,
+	ie (x, y): [(x, y-1), (x, y+1), (x-1, y), (x+1, y)], empty until constructNavGraph() is called, kept up to date by setTile()
+	version: integer, goes up by one every time setTile() changes a tile, so anything worked out from the grid can tell when it is out of date
+	navVersion: integer, goes up by one every time the graph is built or setTile() changes which tiles can be walked on
+	cellsScanned: integer, the amount of tiles read by the whole grid passes of labelComponents(), findDeadends() and placeWalls() so far, for profiling
+	rng: random.Random used for the layout (rooms, corridors, caves and doors)
+	populationRng and lootRng: random.Random streams seeded from rng when the generator is made, for the game to place enemies and fill chests with,
+	they don't depend on how many numbers the layout uses so changing one doesn't change the others
 	
 	** once created these will not be re-instanced, therefore any user made changes to grid will also need to update these lists for them to remain valid
 	"""
 	
-	def __init__(self, height, width):
+	def __init__(self, height, width, compact = False, seed = None, rng = None):
 	
 		self.height = abs(height)
 		self.width = abs(width)
-		self.grid = [[EMPTY for i in range(self.width)] for i in range(self.height)]
+		self.compact = compact
+		if compact:
+			self.tiles = bytearray(self.width * self.height)
+			buffer = memoryview(self.tiles)
+			self.grid = [buffer[x*self.height:(x+1)*self.height] for x in range(self.width)]
+			# the tiles canCarve() checks for each direction, as offsets in self.tiles
+			self.carveOffsets = {}
+			for xd, yd in ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)):
+				xi = (-1, 0, 1) if not xd else (1*xd, 2*xd)
+				yi = (-1, 0, 1) if not yd else (1*yd, 2*yd)
+				self.carveOffsets[xd, yd] = tuple(a * self.height + b for a in xi for b in yi)
+		else:
+			self.tiles = None
+			self.grid = [[EMPTY for i in range(self.height)] for i in range(self.width)]
 		self.rooms = []
 		self.doors = []
 		self.corridors = []
 		self.deadends = []
+		self.occupancy = None
+		if rng is None:
+			rng = Random(seed)
+		elif not isinstance(rng, Random):
+			rng = Random(int(rng.integers(0, 2**63)))
+		self.rng = rng
+		self.populationRng = Random(rng.getrandbits(64))
+		self.lootRng = Random(rng.getrandbits(64))
 		
-		self.graph = {}
+		self.graph = navGraph(self.width, self.height)
+		self.version = 0
+		self.navVersion = 0
+		self.cellsScanned = 0
 		
 	def __iter__(self):
 		for xi in range(self.width):
@@ -112,6 +817,190 @@ class dungeonGenerator:
 				
 	##### HELPER FUNCTIONS #####
 	
+	def fillQuad(self, startX, startY, quadWidth, quadHeight, tile):
+		"""
+		sets every cell of a quad to the same tile, a column at a time using slice assignment, and keeps self.occupancy up to date if it has been built
+		works on both the list of lists and the compact bytearray storage
+		
+		Args:
+		startX and startY: integer, bottom left corner of the quad, grid indicies
+		quadWidth and quadHeight: integer, size of the quad in cells
+		tile: integer, the tile constant to fill with
+		
+		Returns:
+		none
+		
+		Raises:
+		IndexError if any part of the quad is outside the grid, nothing is changed
+		"""
+		
+		# a slice past the end of a list column would make the column longer instead of failing like grid[x][y] does
+		if startX < 0 or startY < 0 or startX + quadWidth > self.width or startY + quadHeight > self.height:
+			raise IndexError('quad (%d, %d, %d, %d) is outside the grid' % (startX, startY, quadWidth, quadHeight))
+		column = bytes((tile,)) * quadHeight
+		for x in range(startX, startX + quadWidth):
+			self.grid[x][startY:startY+quadHeight] = column
+		if self.occupancy is not None and quadHeight > 0:
+			bits = ((1 << quadHeight) - 1) << startY
+			for x in range(startX, startX + quadWidth):
+				if tile == EMPTY:
+					self.occupancy[x] &= ~bits
+				else:
+					self.occupancy[x] |= bits
+					
+	def buildOccupancy(self):
+		"""
+		builds self.occupancy from the grid, a bitmask per x with bit y set for every tile that is not EMPTY
+		
+		Args:
+		none
+		
+		Returns:
+		none
+		"""
+		
+		self.occupancy = [int(bytes(column).translate(OCCUPIED_BITS)[::-1] or b'0', 2) for column in self.grid]
+		
+	def setTile(self, x, y, tile):
+		"""
+		changes a single tile once the dungeon has been generated, keeping self.occupancy and self.graph up to date without rebuilding them
+		
+		Args:
+		x and y: integer, grid indicies of the tile
+		tile: the tile constant to set
+		
+		Returns:
+		none
+		
+		Raises:
+		IndexError if x,y is outside the grid
+		"""
+		
+		if not (0 <= x < self.width and 0 <= y < self.height):
+			raise IndexError('tile (%d, %d) is outside the grid' % (x, y))
+		old = self.grid[x][y]
+		if old == tile: return
+		self.grid[x][y] = tile
+		self.version += 1
+		if self.occupancy is not None:
+			if tile == EMPTY:
+				self.occupancy[x] &= ~(1 << y)
+			else:
+				self.occupancy[x] |= 1 << y
+		graph = self.graph
+		if graph.nodeIds and graph.setWalkable(x, y, tile not in graph.blocked):
+			self.navVersion += 1
+			
+	def subtractFreeSpace(self, free, startX, startY, quadWidth, quadHeight, smallest):
+		"""
+		cuts a quad out of a list of maximal free rectangles, used by placeRoomsInFreeSpace()
+		each rectangle the quad overlaps is replaced by up to 4 rectangles for the space left on each side of it
+		
+		Args:
+		free: list of free rectangles, each a tuple (x0, y0, x1, y1) where x1 and y1 are exclusive
+		startX, startY, quadWidth and quadHeight: integer, the quad to remove
+		smallest: integer, rectangles narrower or shorter than this are dropped
+		
+		Returns:
+		the new list of free rectangles, none of which is inside another
+		"""
+		
+		endX = startX + quadWidth
+		endY = startY + quadHeight
+		kept = []
+		pieces = []
+		for x0, y0, x1, y1 in free:
+			if x0 >= endX or x1 <= startX or y0 >= endY or y1 <= startY:
+				kept.append((x0, y0, x1, y1))
+				continue
+			if x0 < startX: pieces.append((x0, y0, startX, y1))
+			if x1 > endX: pieces.append((endX, y0, x1, y1))
+			if y0 < startY: pieces.append((x0, y0, x1, startY))
+			if y1 > endY: pieces.append((x0, endY, x1, y1))
+		pieces = [r for r in pieces if r[2] - r[0] >= smallest and r[3] - r[1] >= smallest]
+		pieces.sort(key=lambda r: (r[2] - r[0]) * (r[3] - r[1]), reverse=True)
+		# the untouched rectangles were not inside each other before, and can't be inside a piece cut from one of them,
+		# so only the new pieces need checking
+		result = kept
+		for r in pieces:
+			if not any(o[0] <= r[0] and o[1] <= r[1] and r[2] <= o[2] and r[3] <= o[3] for o in result):
+				result.append(r)
+		return result
+		
+	def packBoard(self, table = COPY_TILES):
+		"""
+		packs the grid into a board, one big integer holding a byte per tile, so that whole grid passes can be done with a few integer operations
+		the grid is surrounded by a ring of zero bytes so shifted boards never wrap around from one column into the next,
+		each column takes up height + 2 bytes and the tile x,y is byte (x+1) * (height+2) + y+1
+		
+		Args:
+		table: bytes of length 256, maps each tile constant to the byte stored on the board (see bytes.translate)
+		
+		Returns:
+		the board as an integer
+		"""
+		
+		blank = bytes(self.height + 2)
+		pad = bytes(1)
+		if self.compact:
+			# the tiles are already one buffer column after column, so only the padding between columns needs adding
+			tiles = self.tiles.translate(table)
+			height = self.height
+			data = pad + bytes(2).join(tiles[x*height:(x+1)*height] for x in range(self.width)) + pad
+		else:
+			data = b''.join(pad + bytes(column).translate(table) + pad for column in self.grid)
+		return int.from_bytes(blank + data + blank, 'little')
+		
+	def boardBytes(self, board):
+		"""
+		Returns:
+		the bytes of a board made by packBoard(), ring of padding included
+		"""
+		
+		return board.to_bytes((self.width + 2) * (self.height + 2), 'little')
+		
+	def unpackBoard(self, board):
+		"""
+		writes a board made by packBoard() back into the grid, the padding ring is dropped
+		
+		Args:
+		board: integer, each byte being the tile constant for that cell
+		
+		Returns:
+		none
+		"""
+		
+		data = self.boardBytes(board)
+		stride = self.height + 2
+		if self.compact:
+			view = memoryview(data)
+			self.tiles[:] = b''.join(view[start:start+self.height] for start in range(stride + 1, (self.width + 1) * stride, stride))
+			return
+		for x in range(self.width):
+			start = (x + 1) * stride + 1
+			self.grid[x][:] = data[start:start+self.height]
+			
+	def neighbourSum(self, board, direct = False):
+		"""
+		counts the neighbours of every cell at once by adding shifted copies of a board together, a 3x3 convolution
+		board bytes must be 0 or 1 so that no count can carry into the next byte
+		the padding bytes of the result hold junk and should be masked or ignored
+		
+		Args:
+		board: integer, a board of 0s and 1s made by packBoard()
+		direct: boolean, if true only up, down, left and right are counted, as findNeighboursDirect()
+		
+		Returns:
+		a board where each byte is the amount of neighbours set on the given board
+		"""
+		
+		stride = self.height + 2
+		shifts = (8, 8*stride) if direct else (8, 8*stride, 8*(stride-1), 8*(stride+1))
+		total = 0
+		for shift in shifts:
+			total += (board << shift) + (board >> shift)
+		return total & ((1 << 8*(self.width + 2)*stride) - 1)
+		
 	def findNeighbours(self, x, y):
 		"""
 		finds all cells that touch a cell in a 2D grid
@@ -161,6 +1050,13 @@ class dungeonGenerator:
 		True if it is safe to move that way
 		"""
 		
+		if self.compact:
+			tiles = self.tiles
+			i = x * self.height + y
+			for offset in self.carveOffsets[xd, yd]:
+				if tiles[i+offset]:
+					return False
+			return True
 		xi = (-1, 0, 1) if not xd else (1*xd, 2*xd)
 		yi = (-1, 0, 1) if not yd else (1*yd, 2*yd)
 		for a in xi:
@@ -199,6 +1095,7 @@ class dungeonGenerator:
 		sx and sy: integer, the bottom left coords of the quad to check
 		rx and ry: integer, the width and height of the quad, where rx > sx and ry > sy
 		margin: integer, the space in grid cells (ie, 0 = no cells, 1 = 1 cell, 2 = 2 cells) to be away from other tiles on the grid
+		if self.occupancy has been built each column of the quad is checked with a single mask instead of tile by tile
 		
 		returns:
 		True if the quad fits
@@ -209,6 +1106,12 @@ class dungeonGenerator:
 		rx += margin*2
 		ry += margin*2
 		if sx + rx < self.width and sy + ry < self.height and sx >= 0 and sy >= 0:
+			if self.occupancy is not None:
+				bits = ((1 << ry) - 1) << sy
+				for column in self.occupancy[sx:sx+rx]:
+					if column & bits:
+						return False
+				return True
 			for x in range(rx):
 				for y in range(ry):
 					if self.grid[sx+x][sy+y]:
@@ -226,12 +1129,19 @@ class dungeonGenerator:
 		fillWith: integer, the constant of the tile to fill with
 		tilesToFill: list of integers, allows you to control what tile get filled, all if left out
 		grid: list[[]], a 2D array to flood fill, by default this is dungeonGenerator.grid, however if you do not want to overwrite this you can provide your own 2D array (such as a deep copy of dungeonGenerator.grid)
+		with compact storage and no grid given the fill runs on self.tiles by index, see fillTiles()
 		
 		Returns:
 		none
 		"""
 		
-		if not grid: grid = self.grid
+		if not grid and self.compact:
+			self.occupancy = None
+			self.fillTiles(x * self.height + y, fillWith, tilesToFill)
+			return
+		if not grid:
+			grid = self.grid
+			self.occupancy = None
 		toFill = set()
 		toFill.add((x,y))
 		count = 0
@@ -248,6 +1158,35 @@ class dungeonGenerator:
 				print('overrun')
 				break
 				
+	def fillTiles(self, start, fillWith, tilesToFill = []):
+		"""
+		floodFill() for compact storage, tiles are found by their index in self.tiles (x * height + y) so there is no grid[x][y] lookup or neighbour tuple per tile
+		
+		Args:
+		start: integer, index in self.tiles of the tile to start from
+		fillWith and tilesToFill: as floodFill()
+		
+		Returns:
+		none
+		"""
+		
+		tiles = self.tiles
+		height = self.height
+		end = len(tiles) - height
+		toFill = [start]
+		while toFill:
+			i = toFill.pop()
+			tile = tiles[i]
+			if not tile: continue
+			if tilesToFill and tile not in tilesToFill: continue
+			tiles[i] = fillWith
+			y = i % height
+			# same neighbours as findNeighboursDirect(), the ones already holding fillWith are left out
+			if i >= height and tiles[i-height] != fillWith: toFill.append(i-height)
+			if i < end and tiles[i+height] != fillWith: toFill.append(i+height)
+			if y and tiles[i-1] != fillWith: toFill.append(i-1)
+			if y < height - 1 and tiles[i+1] != fillWith: toFill.append(i+1)
+			
 				
 	##### LEVEL SEARCH FUNCTIONS #####
 	
@@ -262,21 +1201,18 @@ class dungeonGenerator:
 		the x,y indicies of the free space or None, None if no space was found
 		"""
 		
+		if self.occupancy is None: self.buildOccupancy()
 		for x in range(distance, self.width - distance):
-			for y in range(distance, self.width - distance):
-				touching = 0
-				for xi in range(-distance, distance):
-					for yi in range(-distance, distance):
-						if self.grid[x+xi][y+yi]: touching += 1
-				if not touching:
+			for y in range(distance, self.height - distance):
+				if self.quadFits(x - distance, y - distance, distance * 2, distance * 2, 0):
 					return x, y
 		return None, None
 		
 	def findUnconnectedAreas(self):
 		"""
 		Checks through the grid to find islands/unconnected rooms
-		Note, this can be slow for large grids and memory intensive since it needs to create a deep copy of the grid
-		in order to use joinUnconnectedAreas() this needs to be called first and the returned list passed to joinUnconnectedAreas()
+		This is a wrapper around labelComponents() that lists every tile, for large grids it is quicker to use labelComponents() directly
+		in order to use joinUnconnectedAreas() this (or labelComponents()) needs to be called first and the result passed to joinUnconnectedAreas()
 		
 		Args:
 		none
@@ -285,30 +1221,82 @@ class dungeonGenerator:
 		A list of unconnected cells, where each group of cells is in its own list and each cell indice is stored as a tuple, ie [[(x1,y1), (x2,y2), (x3,y3)], [(xi1,yi1), (xi2,yi2), (xi3,yi3)]]
 		"""
 		
-		unconnectedAreas = []
-		areaCount = 0
-		gridCopy = [[EMPTY for i in range(self.width)] for i in range(self.height)]
-		for x in range(self.width):
-			for y in range(self.height):
-				if self.grid[x][y]:
-					gridCopy[x][y] = 'x'
-		for x in range(self.width):
-			for y in range(self.height):
-				if gridCopy[x][y] == 'x':
-					unconnectedAreas.append([])
-					areaCount += 1
-					self.floodFill(x, y, areaCount, None, gridCopy)
-		for x in range(self.width):
-			for y in range(self.height):
-				if gridCopy[x][y]:
-					i = gridCopy[x][y]
-					unconnectedAreas[i-1].append((x,y))
-		return unconnectedAreas
+		components = self.labelComponents()
+		return [components.cells(label) for label in range(1, components.count + 1)]
+		
+	def labelComponents(self, tiles = None, diagonal = False):
+		"""
+		Finds every connected area of the grid in a single pass, without copying the grid
+		Each column is split into vertical runs of matching tiles, runs that touch a run in the previous column are joined with a union-find,
+		then every run is given the final label of its area
+		
+		Args:
+		tiles: list of tile constants that make up areas, any tile that is not EMPTY if left out
+		diagonal: boolean, if true tiles touching diagonally are connected as well (as findNeighbours()), otherwise only up, down, left and right
+		
+		Returns:
+		a dungeonComponents holding the label array, size, bounding box and runs of every area
+		"""
+		
+		table = NOT_EMPTY if tiles is None else bytes(1 if t in tiles else 0 for t in range(256))
+		touch = 1 if diagonal else 0
+		parent = []
+		runs = []
+		previous = []
+		for x, column in enumerate(self.grid):
+			current = []
+			for run in RUN.finditer(bytes(column).translate(table)):
+				startY, endY = run.span()
+				current.append((startY, endY, len(runs)))
+				parent.append(len(runs))
+				runs.append((x, startY, endY))
+			i = j = 0
+			while i < len(previous) and j < len(current):
+				a0, a1, a = previous[i]
+				b0, b1, b = current[j]
+				if a0 < b1 + touch and b0 < a1 + touch:
+					while parent[a] != a:
+						parent[a] = parent[parent[a]]
+						a = parent[a]
+					while parent[b] != b:
+						parent[b] = parent[parent[b]]
+						b = parent[b]
+					# the root is always the first run of the area so labels come out in grid order
+					if a < b: parent[b] = a
+					elif b < a: parent[a] = b
+				if a1 < b1: i += 1
+				else: j += 1
+			previous = current
+		self.cellsScanned += self.width * self.height
+			
+		components = dungeonComponents(self.width, self.height)
+		labels = components.labels
+		for r, (x, startY, endY) in enumerate(runs):
+			root = r
+			while parent[root] != root:
+				root = parent[root]
+			if root == r:
+				components.count += 1
+				components.sizes.append(0)
+				components.boxes.append((x, startY, x, endY - 1))
+				components.runs.append([])
+				label = components.count
+			else:
+				label = labels[runs[root][0] * self.height + runs[root][1]]
+			parent[r] = root
+			start = x * self.height
+			labels[start+startY:start+endY] = array('I', [label]) * (endY - startY)
+			components.sizes[label] += endY - startY
+			components.runs[label].append((x, startY, endY))
+			minX, minY, maxX, maxY = components.boxes[label]
+			components.boxes[label] = (minX, min(minY, startY), x, max(maxY, endY - 1))
+		return components
 		
 	def findDeadends(self):
 		"""
 		looks through all the corridors generated by generatePath() and joinUnconnectedAreas() to identify dead ends
 		populates self.deadends and is used by pruneDeadends()
+		the filled tiles touching every tile are counted at once with neighbourSum(), then each corridor just looks up its count
 		
 		Args:
 		none
@@ -316,14 +1304,102 @@ class dungeonGenerator:
 		none
 		"""
 		
-		self.deadends = []
-		for x, y in self.corridors:
-			touching = 0
-			for nx, ny in self.findNeighboursDirect(x,y):
-				if self.grid[nx][ny]: touching += 1
-			if touching == 1: self.deadends.append((x,y))
+		touching = self.boardBytes(self.neighbourSum(self.packBoard(NOT_EMPTY), direct=True))
+		self.cellsScanned += self.width * self.height
+		stride = self.height + 2
+		self.deadends = [(x, y) for x, y in self.corridors if touching[(x+1)*stride + y+1] == 1]
 			
 			
+	def findNearestConnections(self, areas):
+		"""
+		works out the corridors joinUnconnectedAreas(method = 'nearest') will carve
+		the last area is taken off the list and paired with the closest tile in the same row or column from any of the areas left, until one area is left
+		all tiles are kept in sorted lists per row and per column, so the closest tile either side is found with a binary search
+		
+		Args:
+		areas: list of lists of (x,y) tuples, as returned by findUnconnectedAreas()
+		
+		Returns:
+		a list of pairs of (x,y) tuples to join
+		"""
+		
+		rows = {}
+		columns = {}
+		for area in areas:
+			for x, y in area:
+				rows.setdefault(y, []).append(x)
+				columns.setdefault(x, []).append(y)
+		for line in rows.values(): line.sort()
+		for line in columns.values(): line.sort()
+		
+		areas = list(areas)
+		connections = []
+		while len(areas) >= 2:
+			toConnect = areas.pop()
+			for x, y in toConnect:
+				row = rows[y]
+				del row[bisect_left(row, x)]
+				column = columns[x]
+				del column[bisect_left(column, y)]
+			bestDistance = self.width + self.height
+			best = None
+			for x, y in toConnect:
+				for line, a, b, swap in ((rows.get(y), x, y, False), (columns.get(x), y, x, True)):
+					if not line: continue
+					i = bisect_left(line, a)
+					for n in (i - 1, i):
+						if 0 <= n < len(line) and abs(line[n] - a) < bestDistance:
+							bestDistance = abs(line[n] - a)
+							best = ((b, line[n]) if swap else (line[n], b), (x, y))
+			if best:
+				connections.append(best)
+		return connections
+		
+	def findSpanningConnections(self, areas):
+		"""
+		works out the corridors joinUnconnectedAreas(method = 'mst') will carve, a minimum spanning tree (Kruskal) between the areas
+		only tiles next to each other in a sorted row or column can be the closest pair between 2 areas,
+		any longer straight line has a tile from some area in the way which gives 2 shorter ones, so those are the only edges looked at
+		
+		Args:
+		areas: list of lists of (x,y) tuples, as returned by findUnconnectedAreas()
+		
+		Returns:
+		a list of pairs of (x,y) tuples to join
+		"""
+		
+		rows = {}
+		columns = {}
+		for i, area in enumerate(areas):
+			for x, y in area:
+				rows.setdefault(y, []).append((x, i))
+				columns.setdefault(x, []).append((y, i))
+		edges = []
+		for lines, isRow in ((rows, True), (columns, False)):
+			for fixed, line in lines.items():
+				line.sort()
+				for (a, i), (b, j) in zip(line, line[1:]):
+					if i != j:
+						ends = ((a, fixed), (b, fixed)) if isRow else ((fixed, a), (fixed, b))
+						edges.append((b - a, i, j, ends))
+		edges.sort(key=lambda e: e[0])
+		
+		parent = list(range(len(areas)))
+		connections = []
+		for distance, i, j, ends in edges:
+			while parent[i] != i:
+				parent[i] = parent[parent[i]]
+				i = parent[i]
+			while parent[j] != j:
+				parent[j] = parent[parent[j]]
+				j = parent[j]
+			if i != j:
+				parent[j] = i
+				connections.append(ends)
+				if len(connections) == len(areas) - 1: break
+		return connections
+		
+		
 	##### GENERATION FUNCTIONS #####
 	
 	def placeRoom(self, startX, startY, roomWidth, roomHeight, ignoreOverlap = False):
@@ -334,23 +1410,24 @@ class dungeonGenerator:
 		x and y: integer, starting corner of the room, grid indicies
 		roomWdith and roomHeight: integer, height and width of the room where roomWidth > x and roomHeight > y
 		ignoreOverlap: boolean, if true the room will be placed irregardless of if it overlaps with any other tile in the grid
-		note, if true then it is up to you to ensure the room is within the bounds of the grid
+		note, if true then it is up to you to ensure the room is within the bounds of the grid, see fillQuad()
 		
 		Returns:
 		True if the room was placed
+		
+		Raises:
+		IndexError if ignoreOverlap is true and the room is not inside the grid, nothing is placed
 		"""
 		
 		if self.quadFits(startX, startY, roomWidth, roomHeight, 0) or ignoreOverlap:
-			for x in range(roomWidth):
-				for y in range(roomHeight):
-					self.grid[startX+x][startY+y] = FLOOR
+			self.fillQuad(startX, startY, roomWidth, roomHeight, FLOOR)
 			self.rooms.append(dungeonRoom(startX, startY, roomWidth, roomHeight))
 			return True
 			
-	def placeRandomRooms(self, minRoomSize, maxRoomSize, roomStep = 1, margin = 1, attempts = 500):
+	def placeRandomRooms(self, minRoomSize, maxRoomSize, roomStep = 1, margin = 1, attempts = 500, indexed = True, strategy = 'random'):
 		"""
 		randomly places quads in the grid
-		takes a brute force approach: randomly a generate quad in a random place -> check if fits -> reject if not
+		by default takes a brute force approach: randomly a generate quad in a random place -> check if fits -> reject if not
 		Populates self.rooms
 		
 		Args:
@@ -359,31 +1436,141 @@ class dungeonGenerator:
 		roomStep: integer, the amount the room size can grow by, so to get rooms of odd or even numbered sizes set roomSize to 2 and the minSize to odd/even number accordingly
 		margin: integer, space in grid cells the room needs to be away from other tiles
 		attempts: the amount of tries to place rooms, larger values will give denser room placements, but slower generation times
+		indexed: boolean, if true self.occupancy is built (if needed) and kept up to date so each attempt only tests a bitmask per column,
+		if false every attempt scans the grid tile by tile
+		strategy: string, 'random' or 'maxrects'
+		'random' - the brute force approach above, most attempts are wasted once the grid starts to fill up
+		'maxrects' - keeps a list of the free rectangles left in the grid and only picks positions where the room will fit,
+		stops early once no free rectangle can hold the smallest room, see placeRoomsInFreeSpace()
 		
 		Returns:
-		none
+		integer, the amount of attempts made, less than attempts if 'maxrects' stopped early
 		"""
 		
+		if not indexed:
+			self.occupancy = None
+		elif self.occupancy is None:
+			self.buildOccupancy()
+		if strategy == 'maxrects':
+			return self.placeRoomsInFreeSpace(minRoomSize, maxRoomSize, roomStep, margin, attempts)
 		for attempt in range(attempts):
-			roomWidth = randrange(minRoomSize, maxRoomSize, roomStep)
-			roomHeight = randrange(minRoomSize, maxRoomSize, roomStep)
+			roomWidth = self.rng.randrange(minRoomSize, maxRoomSize, roomStep)
+			roomHeight = self.rng.randrange(minRoomSize, maxRoomSize, roomStep)
 			# These lines are modified. \/
-			startX = randint(margin, self.width - roomWidth - margin)
-			startY = randint(margin, self.height - roomHeight - margin)
+			startX = self.rng.randint(margin, self.width - roomWidth - margin)
+			startY = self.rng.randint(margin, self.height - roomHeight - margin)
 			# These lines are modified. /\
 			if self.quadFits(startX, startY, roomWidth, roomHeight, margin):
-				for x in range(roomWidth):
-					for y in range(roomHeight):
-						self.grid[startX+x][startY+y] = FLOOR
+				self.fillQuad(startX, startY, roomWidth, roomHeight, FLOOR)
 				self.rooms.append(dungeonRoom(startX, startY, roomWidth, roomHeight))
-				
-	def generateCaves(self, p = 45, smoothing = 4):
+		return attempts
+		
+	def placeRoomsInFreeSpace(self, minRoomSize, maxRoomSize, roomStep = 1, margin = 1, attempts = 500):
+		"""
+		places random rooms using the maximal rectangles method, used by placeRandomRooms(strategy = 'maxrects')
+		the free space of the grid is kept as a list of the largest empty rectangles (they can overlap),
+		each attempt picks a random room size, then a random position from all the places a free rectangle can hold it (margin included)
+		every placed room is cut out of the free rectangles, those too small for any room are dropped
+		the free space starts as the whole grid minus self.rooms, other tiles are not tracked so positions are still checked with quadFits()
+		
+		Args:
+		minRoomSize, maxRoomSize, roomStep, margin and attempts: as placeRandomRooms()
+		
+		Returns:
+		integer, the amount of attempts made
+		"""
+		
+		smallest = minRoomSize + margin * 2
+		# quadFits() needs the room and its margin to end before the last row and column
+		free = [(0, 0, self.width - 1, self.height - 1)]
+		for room in self.rooms:
+			free = self.subtractFreeSpace(free, room.x, room.y, room.width, room.height, smallest)
+		made = 0
+		for attempt in range(attempts):
+			if not free: break
+			made += 1
+			roomWidth = self.rng.randrange(minRoomSize, maxRoomSize, roomStep)
+			roomHeight = self.rng.randrange(minRoomSize, maxRoomSize, roomStep)
+			quadWidth = roomWidth + margin * 2
+			quadHeight = roomHeight + margin * 2
+			fits = []
+			places = []
+			for x0, y0, x1, y1 in free:
+				if x1 - x0 >= quadWidth and y1 - y0 >= quadHeight:
+					fits.append((x0, y0, x1, y1))
+					places.append((x1 - x0 - quadWidth + 1) * (y1 - y0 - quadHeight + 1))
+			if not fits: continue
+			x0, y0, x1, y1 = self.rng.choices(fits, places)[0]
+			startX = self.rng.randint(x0, x1 - quadWidth) + margin
+			startY = self.rng.randint(y0, y1 - quadHeight) + margin
+			if self.quadFits(startX, startY, roomWidth, roomHeight, margin):
+				self.fillQuad(startX, startY, roomWidth, roomHeight, FLOOR)
+				self.rooms.append(dungeonRoom(startX, startY, roomWidth, roomHeight))
+				free = self.subtractFreeSpace(free, startX, startY, roomWidth, roomHeight, smallest)
+		return made
+		
+	def generateCaves(self, p = 45, smoothing = 4, birth = (4, 5, 6, 7, 8), survival = (4, 5, 6, 7, 8), seed = None, mode = 'fast'):
 		"""
 		Generates more organic shapes using cellular automata
 		
+		The default 'fast' mode packs the grid into a board (see packBoard()) and runs every smoothing pass on the whole grid at once,
+		the neighbours of all cells are counted with one batched 3x3 convolution and the next generation is written to a new board,
+		so unlike 'reference' the result does not depend on the order cells are visited in
+		Only EMPTY and CAVE tiles are changed, any other tiles are left alone and count as not being cave, the outer edge of the grid is always left EMPTY
+		
 		Args:
 		p: the probability that a cell will become a cave section, values between 30 and 45 work well
 		smoothing: amount of noise reduction, lower values produce more jagged caves, little effect past 4
+		birth: list of integers, the amounts of CAVE neighbours that turn an empty cell into cave
+		survival: list of integers, the amounts of CAVE neighbours that let a cave cell stay as cave
+		the original rules (>= 5 becomes cave, <= 2 becomes empty) saw cells already changed earlier in the same pass,
+		so updating every cell at once with them leaves less cave, the defaults instead give about the same amount as 'reference' (at most 0.05 of the grid more for p 35 to 50)
+		no rules for a whole grid update give both the same amount of cave and the same number of separate caves,
+		with the defaults the caves join up into fewer, bigger areas, about 80% as many as 'reference' makes at p = 35 and half as many at p = 45
+		seed: the seed for the random noise, if none is given self.rng is used
+		mode: string, 'fast' or 'reference', reference is the original cell by cell version that updates the grid in place,
+		it only uses the original rules and is kept so the two can be compared
+		
+		Returns:
+		None
+		"""
+		
+		self.occupancy = None
+		rng = Random(seed) if seed is not None else self.rng
+		if mode == 'reference':
+			self.generateCavesReference(p, smoothing, rng)
+			return
+			
+		size = (self.width + 2) * (self.height + 2)
+		board = self.packBoard()
+		tiles = self.boardBytes(board)
+		
+		# cells that may become cave, the outer edge of the grid and its padding ring never do
+		edge = bytes(2 * (self.height + 2))
+		inner = edge + (bytes(2) + b'\x01' * (self.height - 2) + bytes(2)) * (self.width - 2) + edge
+		living = int.from_bytes(tiles.translate(OPEN_TILES), 'little') & int.from_bytes(inner, 'little')
+		
+		# randint(0, 100) < p, from random bytes instead of a call per cell
+		threshold = round(p * 256 / 101)
+		noise = rng.randbytes(size).translate(bytes(1 if b < threshold else 0 for b in range(256)))
+		cave = int.from_bytes(tiles.translate(CAVE_TILES), 'little') | int.from_bytes(noise, 'little')
+		cave &= living
+		
+		# the key for each cell is 16 if it is cave plus its cave neighbour count
+		rules = bytes(1 if (k >= 16 and k - 16 in survival) or (k < 16 and k in birth) else 0 for k in range(256))
+		for i in range(smoothing):
+			key = self.neighbourSum(cave) + (cave << 4)
+			cave = int.from_bytes(self.boardBytes(key).translate(rules), 'little') & living
+			
+		self.unpackBoard((board & int.from_bytes(tiles.translate(SOLID_TILES), 'little')) | cave * CAVE)
+		
+	def generateCavesReference(self, p, smoothing, rng):
+		"""
+		the original cellular automata used by generateCaves(mode = 'reference'), cells are updated in place one after another
+		
+		Args:
+		p and smoothing: as generateCaves()
+		rng: random.Random to draw the noise from
 		
 		Returns:
 		None
@@ -391,7 +1578,7 @@ class dungeonGenerator:
 		
 		for x in range(self.width):
 			for y in range(self.height):
-				if randint(0, 100) < p:
+				if rng.randint(0, 100) < p:
 					self.grid[x][y] = CAVE
 		for i in range(smoothing):
 			for x in range(self.width):
@@ -407,11 +1594,12 @@ class dungeonGenerator:
 					elif touchingEmptySpace <= 2:
 						self.grid[x][y] = EMPTY
 						
-	def generateCorridors(self, mode = 'r', x = None, y = None):
+	def generateCorridors(self, mode = 'r', x = None, y = None, loops = 0.5):
 		"""
 		generates a maze of corridors on the growing tree algorithm,
 		where corridors do not overlap with over tiles, are 1 tile away from anything else and there are no diagonals
 		Populates self.corridors
+		the tests from getPossibleMoves() are done on a bytearray copy of the grid, see growingTreeCells, and the corridors are written to the grid once they are all carved
 		
 		Args:
 		mode: char, either 'r', 'f', 'm' or 'l'
@@ -420,64 +1608,172 @@ class dungeonGenerator:
 		'f' - first cell in the list to check, long straight secions and few diagnol snaking sections
 		'm' - similar to first but more likely to snake
 		'l' - snaking and winding corridor sections
+		or a dictionary of modes and weights to mix them, ie {'l': 3, 'r': 1} picks the last cell 3 times out of 4 and a random one the rest of the time
+		or 'kruskal', 'wilson' or 'braid' to use another maze algorithm instead of the growing tree, see generateMaze()
 		x and y: integer, grid indicies, starting point for the corridor generation,
 		if none is provided a random one will be chosen
+		loops: float between 0 and 1, passed to generateMaze() for 'braid'
 		
 		Returns:
 		none
 		"""
 		
-		cells = []
+		if mode in ('kruskal', 'wilson', 'braid'):
+			self.generateMaze(mode, x, y, loops)
+			return
+		cells = growingTreeCells(self, mode, self.rng)
 		if not x and not y:
-			x = randint(1, self.width-2)
-			y = randint(1, self.height-2)
+			x = self.rng.randint(1, self.width-2)
+			y = self.rng.randint(1, self.height-2)
 			while not self.canCarve(x, y, 0, 0):
-				x = randint(1, self.width-2)
-				y = randint(1, self.height-2)
-		self.grid[x][y] = CORRIDOR
-		self.corridors.append((x,y))
-		cells.append((x,y))
-		while cells:
-			if mode == 'l':
-				x, y = cells[-1]
-			elif mode == 'r':
-				x, y = choice(cells)
-			elif mode == 'f':
-				x, y = cells[0]
-			elif mode == 'm':
-				x, y = cells[len(cells)//2]
-			possMoves = self.getPossibleMoves(x, y)
-			if possMoves:
-				xi, yi = choice(possMoves)
-				self.grid[xi][yi] = CORRIDOR
-				self.corridors.append((xi,yi))
-				cells.append((xi, yi))
-			else:
-				cells.remove((x, y))
+				x = self.rng.randint(1, self.width-2)
+				y = self.rng.randint(1, self.height-2)
+		carved = cells.grow(cells.cellId(x, y))
+		stride = cells.stride
+		offset = stride + 1
+		corridors = [divmod(i - offset, stride) for i in carved]
+		grid = self.grid
+		for cx, cy in corridors:
+			grid[cx][cy] = CORRIDOR
+		self.corridors.extend(corridors)
+		self.occupancy = None
+		
+	def generateMaze(self, algorithm = 'kruskal', x = None, y = None, loops = 0.5):
+		"""
+		generates a maze of corridors keeping to the same rules as generateCorridors(), but carving on a lattice of every other tile
+		so every space big enough is filled with corridors, not just the one the maze started in
+		Populates self.corridors
+		
+		Args:
+		algorithm: string, either 'kruskal', 'wilson' or 'braid'
+		'kruskal' - joins neighbouring cells in a random order, skipping any a union-find says are already connected, lots of short dead ends
+		'wilson' - loop erased random walks, gives a uniform spanning tree so every possible maze is equally likely, slower than kruskal
+		'braid' - a kruskal maze with some of its dead ends joined to a neighbouring cell, making loops
+		x and y: integer, grid indicies, a tile the lattice should go through, if none is provided the lattice starts at 1,1
+		loops: float between 0 and 1, the fraction of dead ends 'braid' removes
+		
+		Returns:
+		none
+		"""
+		
+		if algorithm not in ('kruskal', 'wilson', 'braid'):
+			raise ValueError('unknown maze algorithm: %s' % algorithm)
+		lattice = mazeLattice(self, 2 - x % 2 if x else 1, 2 - y % 2 if y else 1)
+		degrees = lattice.degrees
+		
+		# union-find over the lattice, kruskal joins cells with it and wilson uses it to find the separate spaces
+		parent = list(range(len(lattice.usable)))
+		edges = lattice.edges()
+		self.rng.shuffle(edges)
+		for a, b in edges:
+			rootA = a
+			while parent[rootA] != rootA:
+				parent[rootA] = parent[parent[rootA]]
+				rootA = parent[rootA]
+			rootB = b
+			while parent[rootB] != rootB:
+				parent[rootB] = parent[parent[rootB]]
+				rootB = parent[rootB]
+			if rootA != rootB:
+				parent[rootB] = rootA
+				if algorithm != 'wilson': lattice.carve(a, b)
+				
+		if algorithm == 'wilson':
+			cells = [n for n, usable in enumerate(lattice.usable) if usable]
+			self.rng.shuffle(cells)
+			inMaze = bytearray(len(lattice.usable))
+			nextCell = array('i', [-1]) * len(lattice.usable)
+			rooted = set()
+			for start in cells:
+				root = start
+				while parent[root] != root:
+					root = parent[root]
+				# the first cell reached in each space starts its maze
+				if root not in rooted:
+					rooted.add(root)
+					inMaze[start] = 1
+					continue
+				# walk randomly until the maze is hit, only remembering the last way out of each cell erases any loops
+				n = start
+				while not inMaze[n]:
+					nextCell[n] = self.rng.choice(lattice.neighbours(n))
+					n = nextCell[n]
+				n = start
+				while not inMaze[n]:
+					inMaze[n] = 1
+					lattice.carve(n, nextCell[n])
+					n = nextCell[n]
+					
+		if algorithm == 'braid':
+			deadends = [n for n, degree in enumerate(degrees) if degree == 1]
+			self.rng.shuffle(deadends)
+			toRemove = round(len(deadends) * loops)
+			for n in deadends:
+				if toRemove <= 0: break
+				if degrees[n] != 1: continue
+				x, y = lattice.cell(n)
+				options = []
+				for m in lattice.neighbours(n):
+					mx, my = lattice.cell(m)
+					if degrees[m] and self.grid[(x + mx) // 2][(y + my) // 2] == EMPTY: options.append(m)
+				if not options: continue
+				# joining two dead ends removes both
+				m = self.rng.choice([m for m in options if degrees[m] == 1] or options)
+				toRemove -= 2 if degrees[m] == 1 else 1
+				lattice.carve(n, m)
 				
-	def pruneDeadends(self, amount):
+	def pruneDeadends(self, amount = 1, maxDeadends = None):
 		"""
 		Removes deadends from the corridors/maze
 		each iteration will remove all identified dead ends
 		it will update self.deadEnds after
+		The corridors are only looked through once, to count the filled tiles touching each one,
+		after that removing a dead end just lowers the count of the tiles next to it and any that drop to 1 are the next iteration's dead ends
+		self.corridors and self.deadends keep the order of self.corridors, the same as removing them one at a time and calling findDeadends()
 		
 		Args:
 		amount: number of iterations to remove dead ends
+		maxDeadends: integer, if given iterations are removed until no more than this many dead ends are left, and amount is ignored
 		
 		Returns:
 		none
 		"""
-		for i in range(amount):
-			self.findDeadends()
-			for x, y in self.deadends:
-				self.grid[x][y] = EMPTY
-				self.corridors.remove((x,y))
-		self.findDeadends()
+		self.occupancy = None
+		grid = self.grid
+		corridors = self.corridors
+		remaining = set(corridors)
+		touching = {}
+		deadends = []
+		for x, y in corridors:
+			if (x, y) in touching: continue
+			count = 0
+			for nx, ny in self.findNeighboursDirect(x, y):
+				if grid[nx][ny]: count += 1
+			touching[(x, y)] = count
+			if count == 1: deadends.append((x, y))
+			
+		iterations = 0
+		while deadends and (len(deadends) > maxDeadends if maxDeadends is not None else iterations < amount):
+			iterations += 1
+			for x, y in deadends:
+				grid[x][y] = EMPTY
+				remaining.discard((x, y))
+			nextDeadends = []
+			for x, y in deadends:
+				for n in self.findNeighboursDirect(x, y):
+					if n in remaining:
+						touching[n] -= 1
+						if touching[n] == 1: nextDeadends.append(n)
+			# a tile can pass through 1 on the way to 0 if 2 of its neighbours went at once
+			deadends = [n for n in nextDeadends if touching[n] == 1]
+		corridors[:] = [n for n in corridors if n in remaining]
+		self.deadends = [n for n in corridors if touching[n] == 1]
 		
 	def placeWalls(self):
 		"""
 		Places wall tiles around all floor, door and corridor tiles
 		As some functions (like floodFill() and anything that uses it) dont distinguish between tile types it is best called later/last
+		Done as a dilation on boards, every EMPTY tile with any neighbour that is neither EMPTY nor WALL becomes a WALL
 		
 		Args:
 		none
@@ -486,13 +1782,14 @@ class dungeonGenerator:
 		none
 		"""
 		
-		for x in range(self.width):
-			for y in range(self.height):
-				if not self.grid[x][y]:
-					for nx, ny in self.findNeighbours(x,y):
-						if self.grid[nx][ny] and self.grid[nx][ny] is not WALL:
-							self.grid[x][y] = WALL
-							break
+		self.occupancy = None
+		board = self.packBoard()
+		around = self.boardBytes(self.neighbourSum(self.packBoard(WALL_SOURCE_TILES))).translate(NOT_EMPTY)
+		walls = int.from_bytes(around, 'little') & self.packBoard(EMPTY_TILES)
+		# every packBoard() call reads the whole grid
+		self.cellsScanned += 3 * self.width * self.height
+		# the wall tiles are all EMPTY (0) before, so adding sets them without touching anything else
+		self.unpackBoard(board + walls * WALL)
 							
 	def connectAllRooms(self, extraDoorChance = 0):
 		"""
@@ -510,6 +1807,7 @@ class dungeonGenerator:
 		list of dungeonRoom's that are not connected, this will not include islands, so 2 rooms connected to each other, but not the rest will not be included
 		"""
 		
+		self.occupancy = None
 		unconnectedRooms = []
 		for room in self.rooms:
 			connections = []
@@ -528,117 +1826,305 @@ class dungeonGenerator:
 				while chance <= extraDoorChance:
 					pickAgain = True
 					while pickAgain:
-						x, y = choice(connections)
+						x, y = self.rng.choice(connections)
 						pickAgain = False
 						for xi, yi in self.findNeighbours(x, y):
 							if self.grid[xi][yi] == DOOR:
 								pickAgain = True
 								break
-					chance = randint(0, 100)
+					chance = self.rng.randint(0, 100)
 					self.grid[x][y] = DOOR
 					self.doors.append((x, y))
 			else:
 				unconnectedRooms.append(room)
 		return unconnectedRooms
 		
-	def joinUnconnectedAreas(self, unconnectedAreas):
+	def joinUnconnectedAreas(self, unconnectedAreas, method = 'nearest'):
 		"""
-		Forcibly connect areas not joined together
-		This will work nearly every time (I've seen one test case where an area was still unjoined)
+		Forcibly connect areas not joined together with straight corridors
+		This will work nearly every time (areas that share no row or column with any other area can't be joined)
 		But it will not always produce pretty results - connecting paths may cause diagonal touching
 		
 		Args:
 		unconnectedAreas: the list returned by findUnconnectedAreas() - ie [[(x1,y1), (x2,y2), (x3,y3)], [(xi1,yi1), (xi2,yi2), (xi3,yi3)]]
+		or the dungeonComponents returned by labelComponents()
+		method: string, 'nearest' or 'mst'
+		'nearest' - the last area is joined to the closest of the areas before it, then the next to last and so on, see findNearestConnections()
+		'mst' - areas are joined along a minimum spanning tree of the distances between them, so the total corridor length is as short as possible,
+		see findSpanningConnections()
 		
 		Returns:
 		none
 		"""
-		connections = []
-		while len(unconnectedAreas) >= 2:
-			bestDistance = self.width + self.height
-			c = [None, None]
-			toConnect = unconnectedAreas.pop()
-			for area in unconnectedAreas:
-				for x, y in area:
-					for xi, yi in toConnect:
-						distance = abs(x-xi) + abs(y-yi)
-						if distance < bestDistance and (x == xi or y == yi):
-							bestDistance = distance
-							c[0] = (x,y)
-							c[1] = (xi,yi)
-			c.sort()
-			x, y = c[0]
-			for x in range(c[0][0]+1, c[1][0]):
-				if self.grid[x][y] == EMPTY:
-					self.grid[x][y] = CORRIDOR
-			for y in range(c[0][1]+1, c[1][1]):
-				if self.grid[x][y] == EMPTY:
-					self.grid[x][y] = CORRIDOR
-			self.corridors.append((x,y))
+		if isinstance(unconnectedAreas, dungeonComponents):
+			unconnectedAreas = [unconnectedAreas.cells(label) for label in range(1, unconnectedAreas.count + 1)]
+		self.occupancy = None
+		if method == 'mst':
+			connections = self.findSpanningConnections(unconnectedAreas)
+		else:
+			connections = self.findNearestConnections(unconnectedAreas)
+		for start, end in connections:
+			self.carveConnection(start, end)
 			
+	def carveConnection(self, start, end):
+		"""
+		carves a straight corridor between 2 tiles in the same row or column, used by joinUnconnectedAreas()
+		only EMPTY tiles are changed, the 2 end tiles are left alone
+		
+		Args:
+		start and end: tuples (x,y), grid indicies of the tiles to join
+		
+		Returns:
+		none
+		"""
+		
+		(x0, y0), (x1, y1) = sorted((start, end))
+		x, y = x0, y0
+		for x in range(x0+1, x1):
+			if self.grid[x][y0] == EMPTY:
+				self.grid[x][y0] = CORRIDOR
+		for y in range(y0+1, y1):
+			if self.grid[x0][y] == EMPTY:
+				self.grid[x0][y] = CORRIDOR
+		# like the original version only the last tile is added to self.corridors, so pruneDeadends() and findDeadends() see the same corridors
+		self.corridors.append((x,y))
+				
 			
 			
 	##### PATH FINDING FUNCTIONS #####
 	
-	def constructNavGraph(self):
+	def constructNavGraph(self, blocked = (EMPTY, WALL, OBSTACLE)):
 		"""
 		builds the navigation grapth for path finding
 		must be called before findPath()
-		Populates self.graph
+		Populates self.graph with a navGraph, walkable tiles are numbered in grid order and their neighbours stored in flat arrays
 		
 		Args:
-		none
+		blocked: list of tile constants that can't be walked on, by default EMPTY, WALL and OBSTACLE
 		
 		Returns:
 		none
 		"""
-		for x, y in self.corridors:
-			if self.grid[x][y] < WALL: break
-		for x in range(self.width):
-			for y in range(self.height):
-				if self.grid[x][y] not in [WALL, EMPTY, OBSTACLE]:
-					self.graph[(x, y)] = []
-					for nx, ny in self.findNeighboursDirect(x, y):
-						if self.grid[nx][ny] not in [WALL, EMPTY, OBSTACLE]:
-							self.graph[(x, y)].append((nx, ny))
-							
-	def findPath(self, startX, startY, endX, endY):
+		
+		height = self.height
+		table = bytes(0 if t in blocked else 1 for t in range(256))
+		tiles = self.tiles if self.compact else b''.join(bytes(column) for column in self.grid)
+		walkable = bytes(tiles).translate(table)
+		nodeIds = array('i', [-1]) * (self.width * height)
+		nodeCells = array('I')
+		for run in RUN.finditer(walkable):
+			nodeCells.extend(range(run.start(), run.end()))
+		for node, cell in enumerate(nodeCells):
+			nodeIds[cell] = node
+			
+		# same order as findNeighboursDirect(), up, down, left then right
+		offsets = array('I', [0])
+		neighbours = array('I')
+		lastColumn = len(nodeIds) - height
+		for cell in nodeCells:
+			y = cell % height
+			if y > 0 and nodeIds[cell-1] >= 0: neighbours.append(nodeIds[cell-1])
+			if y < height - 1 and nodeIds[cell+1] >= 0: neighbours.append(nodeIds[cell+1])
+			if cell >= height and nodeIds[cell-height] >= 0: neighbours.append(nodeIds[cell-height])
+			if cell < lastColumn and nodeIds[cell+height] >= 0: neighbours.append(nodeIds[cell+height])
+			offsets.append(len(neighbours))
+		self.graph = navGraph(self.width, height, nodeIds, nodeCells, offsets, neighbours, blocked)
+		self.navVersion += 1
+		
+	def findPath(self, startX, startY, endX, endY, mode = 'astar'):
 		"""
 		finds a path between 2 points on the grid
 		While not part of generating a dungeon/level it was included as I initially thought that
 		since the generator had lots of knowledge about the maze it could use that for fast path finding
-		however, the overhead of any heuristic was always greater than time saved. But I kept this as its useful
+		the original search popped cells off the front of a list, which made it quadratic, so once that was fixed a heuristic does pay off
 		
 		Args:
 		startX, startY: integers, grid indicies to find a path from
 		endY, endY: integers, grid indicies to find a path to
+		mode: string, the search to use
+			'bfs': breadth first search using a deque, visits every cell closer than the end point but has the least overhead per cell
+			'astar': A* with a binary heap and manhattan distance, the default as it was quickest for paths under 80 cells in dungeonBenchmark.py
+			'jps': jump point search, skips across open rooms in straight lines, best for long paths between rooms but slow in caves
 		
 		Returns:
 		a list of grid cells (x,y) leading from the end point to the start point
 		such that [(endX, endY) .... (startY, endY)] to support popping of the end as the agent moves
+		None if there is no path between the points
+		"""
+		
+		graph = self.graph
+		start = graph.nodeId(startX, startY)
+		end = graph.nodeId(endX, endY)
+		if start < 0 or end < 0:
+			return None
+		if mode == 'bfs':
+			cameFrom = self.searchBreadthFirst(start, end)
+		elif mode == 'astar':
+			cameFrom = self.searchAStar(start, end)
+		elif mode == 'jps':
+			cameFrom = self.searchJumpPoints(start, end)
+		else:
+			raise ValueError('unknown path finding mode: %s' % mode)
+		if end not in cameFrom:
+			return None
+		x, y = endX, endY
+		path = [(x, y)]
+		current = end
+		while current != start:
+			current = cameFrom[current]
+			previousX, previousY = graph.nodeCell(current)
+			# jump point search only records the points it jumped between, so fill in the straight line back to the last one
+			dx = (previousX > x) - (previousX < x)
+			dy = (previousY > y) - (previousY < y)
+			while x != previousX or y != previousY:
+				x += dx
+				y += dy
+				path.append((x, y))
+		return path
+		
+	def searchBreadthFirst(self, start, end):
 		"""
+		breadth first search over self.graph, used by findPath()
 		
-		cells = []
-		cameFrom = {}
-		cells.append((startX, startY))
-		cameFrom[(startX, startY)] = None
+		Args:
+		start, end: integers, the node ids to search from and to
+		
+		Returns:
+		a dictionary of the nodes visited, each mapped to the node it was reached from
+		"""
+		
+		offsets = self.graph.offsets
+		neighbours = self.graph.neighbours
+		patches = self.graph.patches
+		cameFrom = {start: -1}
+		cells = deque((start,))
 		while cells:
-			# manhattan distance sort, commented out at slow, but there should you want it
-			#cells.sort(key=lambda x: abs(endX-x[0]) + abs(endY - x[1]))
-			current = cells[0]
-			del cells[0]
-			if current == (endX, endY):
+			current = cells.popleft()
+			if current == end:
 				break
-			for nx, ny in self.graph[current]:
-				if (nx, ny) not in cameFrom:
-					cells.append((nx, ny))
-					cameFrom[(nx, ny)] = current
-		if (endX, endY) in cameFrom:
-			path = []
-			current = (endX, endY)
-			path.append(current)
-			while current != (startX, startY):
-				current = cameFrom[current]
-				path.append(current)
-			return path
+			for n in patches[current] if current in patches else neighbours[offsets[current]:offsets[current+1]]:
+				if n not in cameFrom:
+					cells.append(n)
+					cameFrom[n] = current
+		return cameFrom
+		
+	def searchAStar(self, start, end):
+		"""
+		A* search over self.graph using manhattan distance, used by findPath()
+		ties are broken towards the node furthest from the start so the search runs straight down open areas
+		
+		Args:
+		start, end: integers, the node ids to search from and to
+		
+		Returns:
+		a dictionary of the nodes visited, each mapped to the node it was reached from
+		"""
+		
+		graph = self.graph
+		offsets = graph.offsets
+		neighbours = graph.neighbours
+		patches = graph.patches
+		nodeCells = graph.nodeCells
+		height = self.height
+		endX, endY = graph.nodeCell(end)
+		startX, startY = graph.nodeCell(start)
+		cameFrom = {start: -1}
+		costs = {start: 0}
+		cells = [(abs(endX - startX) + abs(endY - startY), 0, start)]
+		while cells:
+			f, g, current = heappop(cells)
+			if current == end:
+				break
+			g = -g
+			if g > costs[current]:
+				continue
+			g += 1
+			for n in patches[current] if current in patches else neighbours[offsets[current]:offsets[current+1]]:
+				if g < costs.get(n, g + 1):
+					costs[n] = g
+					cameFrom[n] = current
+					x, y = divmod(nodeCells[n], height)
+					heappush(cells, (g + abs(endX - x) + abs(endY - y), -g, n))
+		return cameFrom
+		
+	def searchJumpPoints(self, start, end):
+		"""
+		jump point search for a grid without diagonal moves, used by findPath()
+		only nodes in self.graph can be walked on, from each jump point the search runs in a straight line until it finds
+		the end point, or a cell with an opening to the side that wasn't there on the cell before (a forced neighbour)
+		when moving up or down it also looks left and right for jump points at every step
+		
+		Args:
+		start, end: integers, the node ids to search from and to
+		
+		Returns:
+		a dictionary of the jump points visited, each mapped to the jump point it was reached from
+		"""
+		
+		graph = self.graph
+		nodeIds = graph.nodeIds
+		width = self.width
+		height = self.height
+		endX, endY = graph.nodeCell(end)
+		startX, startY = graph.nodeCell(start)
+		cameFrom = {start: -1}
+		costs = {start: 0}
+		cells = [(abs(endX - startX) + abs(endY - startY), 0, start)]
+		
+		def walkable(x, y):
+			return 0 <= x < width and 0 <= y < height and nodeIds[x*height + y] >= 0
+			
+		def jumpHorizontal(x, y, dx):
+			while walkable(x, y):
+				if x == endX and y == endY:
+					return x
+				if (walkable(x, y-1) and not walkable(x-dx, y-1)) or (walkable(x, y+1) and not walkable(x-dx, y+1)):
+					return x
+				x += dx
+			return None
+			
+		def jumpVertical(x, y, dy):
+			while walkable(x, y):
+				if x == endX and y == endY:
+					return y
+				if (walkable(x-1, y) and not walkable(x-1, y-dy)) or (walkable(x+1, y) and not walkable(x+1, y-dy)):
+					return y
+				if jumpHorizontal(x+1, y, 1) is not None or jumpHorizontal(x-1, y, -1) is not None:
+					return y
+				y += dy
+			return None
+			
+		while cells:
+			f, g, current = heappop(cells)
+			if current == end:
+				break
+			g = -g
+			if g > costs[current]:
+				continue
+			x, y = graph.nodeCell(current)
+			parent = cameFrom[current]
+			if parent < 0:
+				directions = ((1, 0), (-1, 0), (0, 1), (0, -1))
+			else:
+				parentX, parentY = graph.nodeCell(parent)
+				dx = (x > parentX) - (x < parentX)
+				dy = (y > parentY) - (y < parentY)
+				if dx:
+					directions = ((dx, 0), (0, 1), (0, -1))
+				else:
+					directions = ((0, dy), (1, 0), (-1, 0))
+			for dx, dy in directions:
+				if dx:
+					jumpX, jumpY = jumpHorizontal(x+dx, y, dx), y
+					if jumpX is None: continue
+				else:
+					jumpX, jumpY = x, jumpVertical(x, y+dy, dy)
+					if jumpY is None: continue
+				jumpPoint = nodeIds[jumpX*height + jumpY]
+				cost = g + abs(jumpX - x) + abs(jumpY - y)
+				if cost < costs.get(jumpPoint, cost + 1):
+					costs[jumpPoint] = cost
+					cameFrom[jumpPoint] = current
+					heappush(cells, (cost + abs(endX - jumpX) + abs(endY - jumpY), -cost, jumpPoint))
+		return cameFrom
 
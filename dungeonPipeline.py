@@ -0,0 +1,150 @@
+import dungeonGenerator
+
+from time import perf_counter
+
+# Runs the steps that build a dungeon one after another, with hooks around each step and optional profiling
+# dungeonBatch.buildStages() gives the steps Dungeon Game uses
+
+
+def countStage(name, d, before, result):
+	"""
+	works out the counters for a stage from how the dungeon changed and what it returned, only called when profiling
+	
+	Args:
+	name: the name of the stage
+	d: the dungeonGenerator after the stage
+	before: the tuple from countDungeon() taken before the stage
+	result: what the stage returned
+	
+	Returns:
+	a dictionary of counter name to integer, changes in rooms, doors, corridors and deadends,
+	attempts and attemptsRejected (from what placeRandomRooms() returns), componentsFound
+	and cellsScanned (for stages that made a whole grid pass, see dungeonGenerator.cellsScanned) where they apply
+	"""
+	
+	now = countDungeon(d)
+	counters = dict(zip(('rooms', 'doors', 'corridors', 'deadends'), (after - old for after, old in zip(now, before))))
+	if now[4] != before[4]:
+		counters['cellsScanned'] = now[4] - before[4]
+	if name == 'placeRandomRooms' and isinstance(result, int):
+		counters['attempts'] = result
+		counters['attemptsRejected'] = result - counters['rooms']
+	if isinstance(result, dungeonGenerator.dungeonComponents):
+		counters['componentsFound'] = result.count
+	return counters
+	
+def countDungeon(d):
+	"""
+	Returns:
+	tuple of the amount of rooms, doors, corridors and deadends in d and the tiles it has scanned so far
+	"""
+	
+	return len(d.rooms), len(d.doors), len(d.corridors), len(d.deadends), d.cellsScanned
+	
+class stageProfiler:
+	"""
+	a profiler for dungeonPipeline that adds up the time and counters of every stage over any number of runs
+	
+	Attributes:
+	calls: dictionary of stage name to the amount of times it ran
+	seconds: dictionary of stage name to the total time it took
+	counters: dictionary of stage name to a dictionary of counter name to total
+	"""
+	
+	def __init__(self):
+		self.calls = {}
+		self.seconds = {}
+		self.counters = {}
+		
+	def __call__(self, name, seconds, counters):
+		self.calls[name] = self.calls.get(name, 0) + 1
+		self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+		totals = self.counters.setdefault(name, {})
+		for counter, value in counters.items():
+			totals[counter] = totals.get(counter, 0) + value
+			
+	def report(self):
+		"""
+		Returns:
+		a list of dictionaries, one per stage in the order they first ran, with the calls, total seconds and counters
+		"""
+		
+		return [dict({'stage': name, 'calls': self.calls[name], 'seconds': self.seconds[name]}, **self.counters[name]) for name in self.calls]
+		
+class dungeonPipeline:
+	"""
+	runs named stages on a dungeonGenerator in order
+	
+	Args:
+	stages: list of (name, function) tuples, each function takes the dungeonGenerator and a dictionary of what the earlier stages returned, by name
+	profiler: None, or a callable taking the stage name, the seconds it took and a dictionary of counters, called after every stage
+	with no profiler nothing is timed or counted
+	
+	Attributes:
+	before and after: dictionaries of stage name to a list of hooks, None holds the hooks for every stage,
+	each hook takes the stage name, the dungeonGenerator and the dictionary of results so far
+	"""
+	
+	def __init__(self, stages, profiler = None):
+		self.stages = list(stages)
+		self.profiler = profiler
+		self.before = {}
+		self.after = {}
+		
+	def addHook(self, name = None, before = None, after = None):
+		"""
+		adds hooks to run around a stage
+		
+		Args:
+		name: the name of the stage, None for every stage
+		before: hook run before the stage, or None
+		after: hook run after the stage, or None
+		
+		Returns:
+		none
+		"""
+		
+		if name is not None and name not in self.names():
+			raise ValueError('unknown stage %r' % name)
+		if before is not None:
+			self.before.setdefault(name, []).append(before)
+		if after is not None:
+			self.after.setdefault(name, []).append(after)
+			
+	def names(self):
+		"""
+		Returns:
+		list of the stage names in order
+		"""
+		
+		return [name for name, stage in self.stages]
+		
+	def run(self, d):
+		"""
+		runs every stage on d
+		
+		Args:
+		d: the dungeonGenerator
+		
+		Returns:
+		dictionary of stage name to what it returned
+		"""
+		
+		done = {}
+		profiler = self.profiler
+		everyBefore = self.before.get(None, ())
+		everyAfter = self.after.get(None, ())
+		for name, stage in self.stages:
+			for hook in everyBefore: hook(name, d, done)
+			for hook in self.before.get(name, ()): hook(name, d, done)
+			if profiler is None:
+				done[name] = stage(d, done)
+			else:
+				before = countDungeon(d)
+				start = perf_counter()
+				done[name] = stage(d, done)
+				seconds = perf_counter() - start
+				profiler(name, seconds, countStage(name, d, before, done[name]))
+			for hook in everyAfter: hook(name, d, done)
+			for hook in self.after.get(name, ()): hook(name, d, done)
+		return done
@@ -0,0 +1,247 @@
+import dungeonGenerator
+import dungeonBatch
+import dungeonFormat
+
+from collections import OrderedDict
+from hashlib import sha1
+from os import makedirs, path, remove, replace, scandir, utime
+
+# Keeps dungeons that have already been built, so replaying a seed loads the level instead of generating it again
+# Levels are saved to a folder with dungeonFormat, and the most recently used ones are also kept in memory
+# Both are limited in size, the least recently used levels are dropped first
+
+
+def levelKey(seed, params = None):
+	"""
+	Args:
+	seed: the seed the dungeon is built from
+	params: dictionary of settings, see dungeonBatch.DEFAULT_PARAMS
+	
+	Returns:
+	string naming the dungeon built from seed and params by this version of dungeonGenerator
+	"""
+	
+	p = dict(dungeonBatch.DEFAULT_PARAMS, **(params or {}))
+	return sha1(repr((seed, sorted(p.items()), dungeonGenerator.GENERATOR_VERSION, dungeonFormat.VERSION)).encode('utf-8')).hexdigest()
+	
+class levelCache:
+	"""
+	a cache of built dungeons, keyed by seed, settings and generator version
+	the folder is optional, if it can't be made or written to (ie a read only or full disk) levels are only kept in memory
+	
+	Args:
+	directory: the folder the levels are saved in, made if it doesn't exist, None to only keep levels in memory
+	maxBytes: integer, the most bytes of levels kept in memory, the least recently used are dropped past this
+	maxDiskBytes: integer, the most bytes of levels kept in the folder, past this the least recently used files are deleted
+	until it is back under three quarters of it
+	
+	Attributes:
+	directory: as above, None if it couldn't be made
+	memory: OrderedDict of key to dungeonFile, least recently used first
+	memoryBytes: integer, the total size of the levels in memory
+	diskBytes: integer, the total size of the files in the folder, None until the first put()
+	hits and misses: integers, how many calls to get() found or didn't find a level
+	"""
+	
+	def __init__(self, directory, maxBytes = 16 * 1024 * 1024, maxDiskBytes = 64 * 1024 * 1024):
+		self.directory = directory
+		self.maxBytes = maxBytes
+		self.maxDiskBytes = maxDiskBytes
+		self.memory = OrderedDict()
+		self.memoryBytes = 0
+		self.diskBytes = None
+		self.hits = 0
+		self.misses = 0
+		if directory is not None:
+			try:
+				makedirs(directory, exist_ok=True)
+			except OSError:
+				self.directory = None
+		
+	def filePath(self, key):
+		"""
+		Returns:
+		the path the level for key is saved to
+		"""
+		
+		return path.join(self.directory, key + '.dungeon')
+		
+	def remember(self, key, data):
+		"""
+		keeps a level in memory as the most recently used, dropping the least recently used ones until it fits under maxBytes
+		
+		Args:
+		key: the key from levelKey()
+		data: the bytes made by dungeonFormat.dumpDungeon()
+		
+		Returns:
+		the dungeonFile
+		"""
+		
+		level = dungeonFormat.dungeonFile(data=data)
+		if key in self.memory:
+			self.forget(key)
+		self.memory[key] = level
+		self.memoryBytes += len(data)
+		while self.memoryBytes > self.maxBytes and len(self.memory) > 1:
+			self.forget(next(iter(self.memory)))
+		return level
+		
+	def removeFile(self, filePath):
+		"""
+		deletes a saved level, it is fine if it is already gone or can't be deleted
+		"""
+		
+		try:
+			remove(filePath)
+		except OSError:
+			pass
+			
+	def savedFiles(self):
+		"""
+		Returns:
+		a list of (time last used, size in bytes, path) tuples for the levels and leftover temporary files in the folder, oldest first
+		"""
+		
+		files = []
+		try:
+			for entry in scandir(self.directory):
+				if entry.name.endswith(('.dungeon', '.tmp')):
+					info = entry.stat()
+					files.append((info.st_mtime, info.st_size, entry.path))
+		except OSError:
+			pass
+		return sorted(files)
+		
+	def trimDisk(self):
+		"""
+		deletes the least recently used files until the folder is under three quarters of maxDiskBytes, the newest is always kept
+		the folder is only looked through when it goes over maxDiskBytes, in between put() adds up diskBytes itself
+		"""
+		
+		files = self.savedFiles()
+		self.diskBytes = sum(size for modified, size, filePath in files)
+		for modified, size, filePath in files[:-1]:
+			if self.diskBytes <= self.maxDiskBytes * 3 // 4: break
+			self.removeFile(filePath)
+			self.diskBytes -= size
+			
+	def touch(self, key):
+		"""
+		marks the saved level for key as just used, so trimDisk() deletes it last
+		"""
+		
+		if self.directory is not None:
+			try:
+				utime(self.filePath(key))
+			except OSError:
+				pass
+				
+	def forget(self, key):
+		"""
+		drops a level from memory, it stays on disk
+		"""
+		
+		level = self.memory.pop(key)
+		self.memoryBytes -= len(level.view)
+		level.close()
+		
+	def get(self, seed, params = None):
+		"""
+		finds a level in memory or on disk
+		
+		Args:
+		seed: the seed the dungeon was built from
+		params: dictionary of settings, see dungeonBatch.DEFAULT_PARAMS
+		
+		Returns:
+		a new dungeonGenerator with the level, or None if it hasn't been saved
+		it is the same as the dungeonGenerator that was built from seed, compact or not as params says, with the same populationRng and lootRng
+		"""
+		
+		key = levelKey(seed, params)
+		level = self.memory.get(key)
+		if level is not None:
+			self.memory.move_to_end(key)
+		elif self.directory is None:
+			self.misses += 1
+			return None
+		else:
+			try:
+				with open(self.filePath(key), 'rb') as f:
+					level = self.remember(key, f.read())
+			except OSError:
+				self.misses += 1
+				return None
+			except ValueError:
+				# a truncated or corrupt level is deleted so it is built and saved again
+				self.misses += 1
+				self.removeFile(self.filePath(key))
+				return None
+				
+		self.hits += 1
+		self.touch(key)
+		return level.toGenerator(seed=seed, compact=dict(dungeonBatch.DEFAULT_PARAMS, **(params or {}))['compact'])
+		
+	def put(self, seed, params, d):
+		"""
+		saves a level to disk and memory, call this before the dungeon is changed by the game
+		if it can't be written to disk it is still kept in memory
+		
+		Args:
+		seed: the seed the dungeon was built from
+		params: dictionary of settings it was built with, see dungeonBatch.DEFAULT_PARAMS
+		d: the dungeonGenerator
+		
+		Returns:
+		none
+		"""
+		
+		key = levelKey(seed, params)
+		data = dungeonFormat.dumpDungeon(d)
+		if self.directory is not None:
+			# write to a temporary file first so a crash never leaves half a level behind
+			temporary = self.filePath(key) + '.tmp'
+			try:
+				with open(temporary, 'wb') as f:
+					f.write(data)
+				replace(temporary, self.filePath(key))
+			except OSError:
+				self.removeFile(temporary)
+			else:
+				if self.diskBytes is None:
+					self.trimDisk()
+				else:
+					self.diskBytes += len(data)
+				if self.diskBytes > self.maxDiskBytes:
+					self.trimDisk()
+		self.remember(key, data)
+		
+	def build(self, seed, params = None, profiler = None):
+		"""
+		get() the level, or build it with dungeonBatch.buildDungeon() and put() it if it isn't cached
+		
+		Args:
+		seed: the seed for the dungeon, None for a random one which is never cached
+		params: dictionary of settings, see dungeonBatch.DEFAULT_PARAMS
+		profiler: passed to dungeonBatch.buildDungeon(), only used if the level has to be built
+		
+		Returns:
+		the dungeonGenerator
+		"""
+		
+		if seed is None:
+			return dungeonBatch.buildDungeon(seed, params, profiler)
+		d = self.get(seed, params)
+		if d is None:
+			d = dungeonBatch.buildDungeon(seed, params, profiler)
+			self.put(seed, params, d)
+		return d
+		
+	def clear(self):
+		"""
+		drops every level from memory, the saved files are kept
+		"""
+		
+		for key in list(self.memory):
+			self.forget(key)
@@ -0,0 +1,106 @@
+import dungeonGenerator
+import dungeonBatch
+import dungeonPipeline
+
+from random import Random
+import unittest
+
+# placeWalls() and findDeadends() work on whole boards at once, these check them against the original tile by tile loops
+
+
+def referenceWalls(d):
+	"""
+	the original placeWalls(), every EMPTY tile touching (diagonals included) a tile that is neither EMPTY nor WALL becomes a WALL
+	"""
+	
+	for x in range(d.width):
+		for y in range(d.height):
+			if not d.grid[x][y]:
+				for nx, ny in d.findNeighbours(x, y):
+					if d.grid[nx][ny] and d.grid[nx][ny] != dungeonGenerator.WALL:
+						d.grid[x][y] = dungeonGenerator.WALL
+						break
+						
+def referenceDeadends(d):
+	"""
+	the original findDeadends(), the corridors with exactly one filled tile directly touching them, in the order of d.corridors
+	"""
+	
+	deadends = []
+	for x, y in d.corridors:
+		touching = 0
+		for nx, ny in d.findNeighboursDirect(x, y):
+			if d.grid[nx][ny]: touching += 1
+		if touching == 1: deadends.append((x, y))
+	return deadends
+	
+def unprunedDungeon(seed, size, compact = False):
+	"""
+	Returns:
+	a dungeon built like buildDungeon() up to, but not including, pruneDeadends()
+	"""
+	
+	params = {'size': size, 'compact': compact}
+	stages = [(name, stage) for name, stage in dungeonBatch.buildStages(params) if name not in ('pruneDeadends', 'placeWalls')]
+	d = dungeonBatch.newDungeon(seed, params)
+	dungeonPipeline.dungeonPipeline(stages).run(d)
+	return d
+	
+def copyDungeon(d):
+	e = dungeonGenerator.dungeonGenerator(d.height, d.width)
+	e.grid = [list(column) for column in d.grid]
+	e.corridors = list(d.corridors)
+	return e
+	
+class boardPassesTest(unittest.TestCase):
+	def testWallsMatchReference(self):
+		for seed, size, compact in ((1, 35, False), (2, 55, True), (3, 70, False)):
+			d = unprunedDungeon(seed, size, compact)
+			d.grid[2][3] = dungeonGenerator.WALL
+			e = copyDungeon(d)
+			d.placeWalls()
+			referenceWalls(e)
+			self.assertEqual([list(column) for column in d.grid], e.grid, seed)
+			
+	def testWallsAroundCaves(self):
+		d = dungeonGenerator.dungeonGenerator(48, 40, seed=6)
+		d.generateCaves(seed=6)
+		e = copyDungeon(d)
+		d.placeWalls()
+		referenceWalls(e)
+		self.assertEqual([list(column) for column in d.grid], e.grid)
+		
+	def testDeadendsMatchReference(self):
+		for seed, size, compact in ((1, 35, False), (4, 55, True), (5, 70, False)):
+			d = unprunedDungeon(seed, size, compact)
+			d.findDeadends()
+			self.assertEqual(d.deadends, referenceDeadends(d), seed)
+			d.placeWalls()
+			d.findDeadends()
+			self.assertEqual(d.deadends, referenceDeadends(d), seed)
+			
+	def testDeadendsOnRandomCorridors(self):
+		d = dungeonGenerator.dungeonGenerator(40, 40, seed=7)
+		d.generateCaves(seed=7)
+		rng = Random(7)
+		d.corridors = [(x, y) for x, y, tile in d if tile == dungeonGenerator.CAVE and rng.random() < 0.3]
+		d.findDeadends()
+		self.assertEqual(d.deadends, referenceDeadends(d))
+		
+	def testPruningMatchesRepeatedFindDeadends(self):
+		for seed, size in ((1, 35), (2, 70)):
+			d = unprunedDungeon(seed, size)
+			e = copyDungeon(d)
+			d.pruneDeadends(maxDeadends=3)
+			e.deadends = referenceDeadends(e)
+			while len(e.deadends) > 3:
+				for x, y in e.deadends:
+					e.grid[x][y] = dungeonGenerator.EMPTY
+					e.corridors.remove((x, y))
+				e.deadends = referenceDeadends(e)
+			self.assertEqual(d.grid, e.grid, seed)
+			self.assertEqual(d.corridors, e.corridors, seed)
+			self.assertEqual(d.deadends, e.deadends, seed)
+			
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,45 @@
+import dungeonGenerator
+
+import unittest
+
+# generateCaves() updates every cell at once instead of one after another, so it can't make the same caves as the reference,
+# these check the caves are alike in the ways its docstring says they are
+
+
+def caveStats(size, p, seed, mode):
+	"""
+	Returns:
+	the fraction of the grid that is cave and the number of separate caves
+	"""
+	
+	d = dungeonGenerator.dungeonGenerator(size, size)
+	d.generateCaves(p=p, seed=seed, mode=mode)
+	caves = sum(1 for x, y, tile in d if tile == dungeonGenerator.CAVE)
+	return caves / (size * size), d.labelComponents().count
+	
+class caveTest(unittest.TestCase):
+	def testAgainstReference(self):
+		for p in (38, 45):
+			results = {}
+			for mode in ('fast', 'reference'):
+				stats = [caveStats(200, p, seed, mode) for seed in (1, 2, 3)]
+				results[mode] = [sum(values) / len(stats) for values in zip(*stats)]
+			density, areas = results['fast']
+			referenceDensity, referenceAreas = results['reference']
+			self.assertAlmostEqual(density, referenceDensity, delta=0.07, msg=p)
+			self.assertGreaterEqual(areas, referenceAreas * 0.3, p)
+			self.assertLessEqual(areas, referenceAreas, p)
+			
+	def testOnlyEmptyAndCaveChange(self):
+		d = dungeonGenerator.dungeonGenerator(40, 50, seed=1)
+		d.placeRandomRooms(4, 8, margin=1, attempts=200)
+		rooms = [(x, y) for x, y, tile in d if tile]
+		d.generateCaves(seed=1)
+		self.assertTrue(all(d.grid[x][y] == dungeonGenerator.FLOOR for x, y in rooms))
+		self.assertTrue(all(tile in (dungeonGenerator.EMPTY, dungeonGenerator.CAVE, dungeonGenerator.FLOOR) for x, y, tile in d))
+		for x, y, tile in d:
+			if x in (0, d.width - 1) or y in (0, d.height - 1):
+				self.assertEqual(tile, dungeonGenerator.EMPTY)
+				
+if __name__ == '__main__':
+	unittest.main()
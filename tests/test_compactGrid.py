@@ -0,0 +1,55 @@
+import dungeonGenerator
+import dungeonBatch
+
+from random import Random
+import unittest
+
+# with compact storage the whole grid passes work on self.tiles instead of grid[x][y], they have to give the same tiles as the lists
+
+
+def pairedDungeons(seed, size):
+	"""
+	Returns:
+	the same dungeon built once with lists and once with compact storage
+	"""
+	
+	return [dungeonBatch.buildDungeon(seed, {'size': size, 'compact': compact}) for compact in (False, True)]
+	
+class compactGridTest(unittest.TestCase):
+	def assertSameTiles(self, lists, compact):
+		self.assertEqual([list(column) for column in compact.grid], lists.grid)
+		
+	def testFloodFill(self):
+		for seed, size in ((1, 35), (2, 70)):
+			lists, compact = pairedDungeons(seed, size)
+			rng = Random(seed)
+			for i in range(20):
+				x, y = rng.randrange(size), rng.randrange(size)
+				fillWith = rng.choice((dungeonGenerator.FLOOR, dungeonGenerator.CORRIDOR, dungeonGenerator.CAVE))
+				tilesToFill = rng.choice(([], [dungeonGenerator.FLOOR], [dungeonGenerator.CORRIDOR, dungeonGenerator.DOOR]))
+				lists.floodFill(x, y, fillWith, tilesToFill)
+				compact.floodFill(x, y, fillWith, tilesToFill)
+				self.assertSameTiles(lists, compact)
+				
+	def testCanCarve(self):
+		lists, compact = pairedDungeons(3, 55)
+		for x in range(2, 53):
+			for y in range(2, 53):
+				for xd, yd in ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)):
+					self.assertEqual(compact.canCarve(x, y, xd, yd), lists.canCarve(x, y, xd, yd), (x, y, xd, yd))
+					
+	def testBoards(self):
+		for size in (35, 48):
+			lists = dungeonGenerator.dungeonGenerator(size, size + 7, seed=4)
+			compact = dungeonGenerator.dungeonGenerator(size, size + 7, compact=True, seed=4)
+			for d in (lists, compact):
+				d.placeRandomRooms(3, 7, margin=1, attempts=300)
+			self.assertEqual(compact.packBoard(), lists.packBoard())
+			self.assertEqual(compact.packBoard(dungeonGenerator.NOT_EMPTY), lists.packBoard(dungeonGenerator.NOT_EMPTY))
+			board = lists.packBoard() * 2
+			lists.unpackBoard(board)
+			compact.unpackBoard(board)
+			self.assertSameTiles(lists, compact)
+			
+if __name__ == '__main__':
+	unittest.main()
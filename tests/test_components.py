@@ -0,0 +1,83 @@
+import dungeonGenerator
+import dungeonBatch
+
+from random import Random
+import unittest
+
+# labelComponents() joins runs of tiles with a union-find instead of flood filling a copy of the grid, it has to find the same areas
+
+
+def floodFillAreas(d, tiles = None, diagonal = False):
+	"""
+	the areas found the old way, a flood fill from every tile not yet in an area
+	
+	Returns:
+	a list of sets of (x,y) tuples, in the order their first tile is reached going through the grid by x then y
+	"""
+	
+	inArea = lambda x, y: d.grid[x][y] != dungeonGenerator.EMPTY if tiles is None else d.grid[x][y] in tiles
+	neighbours = d.findNeighbours if diagonal else d.findNeighboursDirect
+	seen = set()
+	areas = []
+	for x in range(d.width):
+		for y in range(d.height):
+			if (x, y) in seen or not inArea(x, y): continue
+			area = {(x, y)}
+			toFill = [(x, y)]
+			while toFill:
+				for n in neighbours(*toFill.pop()):
+					if n not in area and inArea(*n):
+						area.add(n)
+						toFill.append(n)
+			seen |= area
+			areas.append(area)
+	return areas
+	
+def noiseGrid(seed, width, height, chance):
+	d = dungeonGenerator.dungeonGenerator(height, width, seed=seed)
+	rng = Random(seed)
+	for x in range(width):
+		for y in range(height):
+			if rng.random() < chance:
+				d.grid[x][y] = rng.choice((dungeonGenerator.FLOOR, dungeonGenerator.CORRIDOR, dungeonGenerator.WALL))
+	return d
+	
+class componentsTest(unittest.TestCase):
+	def grids(self):
+		yield dungeonBatch.buildDungeon(1, {'size': 55})
+		d = dungeonGenerator.dungeonGenerator(60, 45, seed=2)
+		d.generateCaves(p=40, seed=2)
+		yield d
+		for seed, chance in ((3, 0.3), (4, 0.5), (5, 0.6)):
+			yield noiseGrid(seed, 37, 41, chance)
+			
+	def checkAreas(self, d, tiles, diagonal):
+		components = d.labelComponents(tiles, diagonal)
+		areas = floodFillAreas(d, tiles, diagonal)
+		self.assertEqual(components.count, len(areas))
+		for label, area in enumerate(areas, 1):
+			self.assertEqual(set(components.cells(label)), area)
+			self.assertEqual(components.sizes[label], len(area))
+			xs = [x for x, y in area]
+			ys = [y for x, y in area]
+			self.assertEqual(components.boxes[label], (min(xs), min(ys), max(xs), max(ys)))
+			self.assertTrue(all(components.labelAt(x, y) == label for x, y in area))
+		self.assertEqual(sum(1 for label in components.labels if label), sum(map(len, areas)))
+		
+	def testSameAreasAsFloodFill(self):
+		for d in self.grids():
+			for diagonal in (False, True):
+				self.checkAreas(d, None, diagonal)
+				
+	def testChosenTiles(self):
+		for d in self.grids():
+			for tiles in ([dungeonGenerator.FLOOR], [dungeonGenerator.CORRIDOR, dungeonGenerator.DOOR]):
+				for diagonal in (False, True):
+					self.checkAreas(d, tiles, diagonal)
+					
+	def testUnconnectedAreasList(self):
+		d = noiseGrid(6, 30, 30, 0.45)
+		self.assertEqual([set(area) for area in d.findUnconnectedAreas()], floodFillAreas(d))
+		
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,114 @@
+import dungeonGenerator
+
+import unittest
+
+# generateCorridors() grows its corridors on a bytearray copy of the grid, every mode has to keep to the spacing rules of getPossibleMoves()
+# and give one tree of corridors, whatever rooms are already there
+
+
+MODES = ('r', 'f', 'm', 'l', {'l': 3, 'r': 1}, {'f': 1, 'm': 1, 'r': 2})
+
+def corridorGraph(d):
+	"""
+	Returns:
+	the set of corridor tiles, the amount of pairs of them directly touching and the amount of separate corridor areas
+	"""
+	
+	tiles = {(x, y) for x, y, tile in d if tile == dungeonGenerator.CORRIDOR}
+	links = sum(1 for x, y in tiles for n in ((x + 1, y), (x, y + 1)) if n in tiles)
+	return tiles, links, d.labelComponents([dungeonGenerator.CORRIDOR]).count
+	
+def referenceLast(d, x, y):
+	"""
+	the growing tree always picking the last cell, a step at a time on the grid with getPossibleMoves(), drawing the same random numbers as growingTreeCells
+	
+	Returns:
+	the corridors in the order they were carved
+	"""
+	
+	d.grid[x][y] = dungeonGenerator.CORRIDOR
+	corridors = [(x, y)]
+	cells = [(x, y)]
+	while cells:
+		moves = d.getPossibleMoves(*cells[-1])
+		if moves:
+			nx, ny = moves[0] if len(moves) == 1 else moves[int(d.rng.random() * len(moves))]
+			d.grid[nx][ny] = dungeonGenerator.CORRIDOR
+			corridors.append((nx, ny))
+			cells.append((nx, ny))
+		else:
+			cells.pop()
+	return corridors
+	
+class corridorTest(unittest.TestCase):
+	def checkCorridors(self, d, rooms, mode):
+		tiles, links, areas = corridorGraph(d)
+		self.assertGreater(len(tiles), 50, mode)
+		self.assertEqual(len(d.corridors), len(tiles), mode)
+		self.assertEqual(set(d.corridors), tiles, mode)
+		for x, y in tiles:
+			self.assertTrue(0 < x < d.width - 1 and 0 < y < d.height - 1, (mode, x, y))
+			for nx, ny in d.findNeighbours(x, y):
+				self.assertIn(d.grid[nx][ny], (dungeonGenerator.EMPTY, dungeonGenerator.CORRIDOR), (mode, x, y))
+			# corridors are one tile wide and never touch diagonally
+			self.assertFalse({(x + 1, y), (x, y + 1), (x + 1, y + 1)} <= tiles, (mode, x, y))
+			self.assertFalse((x + 1, y + 1) in tiles and (x + 1, y) not in tiles and (x, y + 1) not in tiles, (mode, x, y))
+			self.assertFalse((x + 1, y - 1) in tiles and (x + 1, y) not in tiles and (x, y - 1) not in tiles, (mode, x, y))
+		# one tree grown from the start
+		self.assertEqual(areas, 1, mode)
+		self.assertEqual(links, len(tiles) - 1, mode)
+		self.assertTrue(all(d.grid[x][y] == tile for (x, y), tile in rooms.items()), mode)
+		
+	def testEmptyGrid(self):
+		for mode in MODES:
+			for seed in (1, 2):
+				d = dungeonGenerator.dungeonGenerator(45, 60, seed=seed)
+				d.generateCorridors(mode)
+				self.checkCorridors(d, {}, mode)
+				
+	def testAroundRooms(self):
+		for mode in MODES:
+			for seed in (3, 4):
+				d = dungeonGenerator.dungeonGenerator(51, 41, seed=seed)
+				d.placeRandomRooms(3, 9, margin=2, attempts=60)
+				rooms = {(x, y): tile for x, y, tile in d if tile}
+				d.generateCorridors(mode)
+				self.checkCorridors(d, rooms, mode)
+				
+	def testCompactGrid(self):
+		for mode in MODES:
+			lists = dungeonGenerator.dungeonGenerator(40, 40, seed=5)
+			compact = dungeonGenerator.dungeonGenerator(40, 40, seed=5, compact=True)
+			for d in (lists, compact):
+				d.placeRandomRooms(3, 7, margin=2, attempts=30)
+				d.generateCorridors(mode)
+			self.assertEqual(compact.corridors, lists.corridors, mode)
+			self.assertEqual([list(column) for column in compact.grid], [list(column) for column in lists.grid], mode)
+			
+	def testLastMatchesReference(self):
+		for seed, x, y in ((6, 20, 20), (7, 5, 31)):
+			d = dungeonGenerator.dungeonGenerator(45, 38, seed=seed)
+			d.placeRandomRooms(3, 7, margin=2, attempts=30)
+			reference = dungeonGenerator.dungeonGenerator(45, 38, seed=seed)
+			reference.placeRandomRooms(3, 7, margin=2, attempts=30)
+			d.generateCorridors('l', x, y)
+			self.assertEqual(d.corridors, referenceLast(reference, x, y), seed)
+			self.assertEqual(d.grid, reference.grid, seed)
+			
+	def testMovesMatchGetPossibleMoves(self):
+		d = dungeonGenerator.dungeonGenerator(40, 45, seed=8)
+		d.placeRandomRooms(3, 7, margin=1, attempts=40)
+		for i in range(60):
+			d.grid[d.rng.randrange(d.width)][d.rng.randrange(d.height)] = dungeonGenerator.CORRIDOR
+		cells = dungeonGenerator.growingTreeCells(d, 'r', d.rng)
+		for x, y, tile in d:
+			moves = [cells.cellId(nx, ny) for nx, ny in d.getPossibleMoves(x, y)]
+			self.assertEqual(cells.moves(cells.cellId(x, y)), moves, (x, y))
+			
+	def testUnknownMode(self):
+		d = dungeonGenerator.dungeonGenerator(30, 30, seed=1)
+		with self.assertRaises(ValueError):
+			d.generateCorridors('x')
+			
+if __name__ == '__main__':
+	unittest.main()
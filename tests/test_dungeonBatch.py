@@ -0,0 +1,42 @@
+import dungeonBatch
+
+import unittest
+
+# generateBatch() hands dungeons back in the order they finish, whatever the amount of workers each seed has to give the dungeon buildDungeon() does
+
+
+def bySeed(levels):
+	"""
+	Returns:
+	the dictionaries made by packDungeon() keyed by their seed, checking no seed came back twice
+	"""
+	
+	levels = list(levels)
+	packed = {level['seed']: level for level in levels}
+	assert len(packed) == len(levels)
+	return packed
+	
+class dungeonBatchTest(unittest.TestCase):
+	def testBatchMatchesBuild(self):
+		seeds = [6, 7]
+		packed = bySeed(dungeonBatch.generateBatch(seeds, workers=1))
+		for seed in seeds:
+			self.assertEqual(packed[seed], dungeonBatch.packDungeon(seed, dungeonBatch.buildDungeon(seed)))
+			
+	def testWorkersMatchSerial(self):
+		seeds = list(range(1, 9))
+		for params in (None, {'size': 55, 'compact': True}):
+			serial = bySeed(dungeonBatch.generateBatch(seeds, params, workers=1))
+			parallel = bySeed(dungeonBatch.generateBatch(seeds, params, workers=2, inFlight=3))
+			self.assertEqual(sorted(parallel), seeds)
+			self.assertEqual(parallel, serial, params)
+			
+	def testStoppingEarly(self):
+		batch = dungeonBatch.generateBatch(range(1, 1000), workers=2, inFlight=2)
+		first = next(batch)
+		# closing the generator has to cancel the queued seeds rather than build all of them
+		batch.close()
+		self.assertEqual(first, dungeonBatch.packDungeon(first['seed'], dungeonBatch.buildDungeon(first['seed'])))
+		
+if __name__ == '__main__':
+	unittest.main()
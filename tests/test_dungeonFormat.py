@@ -0,0 +1,57 @@
+import dungeonBatch
+import dungeonFormat
+
+from os import path
+from tempfile import TemporaryDirectory
+import unittest
+
+# levels saved with dungeonFormat and loaded back have to be the same as building them again
+
+
+def snapshot(d):
+	"""
+	Returns:
+	the tiles, rooms, doors, corridors, deadends and random streams of a dungeon as plain data that can be compared
+	"""
+	
+	return (
+		d.compact,
+		[list(column) for column in d.grid],
+		[(r.x, r.y, r.width, r.height) for r in d.rooms],
+		list(d.doors),
+		list(d.corridors),
+		list(d.deadends),
+		d.populationRng.getstate(),
+		d.lootRng.getstate(),
+	)
+	
+class dungeonFormatTest(unittest.TestCase):
+	def testRoundTrip(self):
+		chests = {(3, 4): [('Wood', 2), ('Key', 1)], (10, 11): [('Stône', 3)]}
+		for params in (None, {'size': 55, 'compact': True}):
+			d = dungeonBatch.buildDungeon(1, params)
+			level = dungeonFormat.dungeonFile(data=dungeonFormat.dumpDungeon(d, chests))
+			self.assertEqual(level.chests, chests)
+			self.assertTrue(all(level.tileAt(x, y) == d.grid[x][y] for x in range(d.width) for y in range(d.height)))
+			self.assertEqual(snapshot(level.toGenerator(seed=1, compact=d.compact)), snapshot(dungeonBatch.buildDungeon(1, params)))
+			level.close()
+			
+	def testSavedFile(self):
+		d = dungeonBatch.buildDungeon(2)
+		with TemporaryDirectory() as directory:
+			filePath = path.join(directory, 'level.dungeon')
+			dungeonFormat.saveDungeon(filePath, d)
+			with dungeonFormat.loadDungeon(filePath) as level:
+				e = level.toGenerator(seed=2, compact=False)
+			self.assertEqual(snapshot(e), snapshot(dungeonBatch.buildDungeon(2)))
+			
+	def testCorruptData(self):
+		data = dungeonFormat.dumpDungeon(dungeonBatch.buildDungeon(3))
+		for cut in range(0, len(data), 97):
+			with self.assertRaises(ValueError):
+				dungeonFormat.dungeonFile(data=data[:cut])
+		with self.assertRaises(ValueError):
+			dungeonFormat.dungeonFile(data=data + b'\0')
+			
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,27 @@
+import dungeonBatch
+import dungeonPipeline
+
+import unittest
+
+# the profiler counts what each stage changed, cellsScanned only shows up for the stages that read the whole grid
+
+
+class dungeonPipelineTest(unittest.TestCase):
+	def testCellsScanned(self):
+		profiler = dungeonPipeline.stageProfiler()
+		d = dungeonBatch.buildDungeon(3, {'size': 40}, profiler)
+		scanned = {name: counters['cellsScanned'] for name, counters in profiler.counters.items() if 'cellsScanned' in counters}
+		self.assertEqual(scanned, {'labelComponents': 40 * 40, 'placeWalls': 3 * 40 * 40})
+		self.assertEqual(d.cellsScanned, sum(scanned.values()))
+		d.findDeadends()
+		self.assertEqual(d.cellsScanned, 5 * 40 * 40)
+		
+	def testCountersMatchDungeon(self):
+		profiler = dungeonPipeline.stageProfiler()
+		d = dungeonBatch.buildDungeon(4, None, profiler)
+		self.assertEqual(sum(counters['rooms'] for counters in profiler.counters.values()), len(d.rooms))
+		self.assertEqual(sum(counters['corridors'] for counters in profiler.counters.values()), len(d.corridors))
+		self.assertEqual(profiler.counters['placeRandomRooms']['attempts'] - profiler.counters['placeRandomRooms']['attemptsRejected'], len(d.rooms))
+		
+if __name__ == '__main__':
+	unittest.main()
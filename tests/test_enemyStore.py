@@ -0,0 +1,43 @@
+import dungeonBenchmark
+import dungeonCore
+
+from random import Random
+import unittest
+
+# EnemyStore.update() moves lots of enemies at once with numpy, that has to give exactly the same game as moving them one at a time
+
+
+def playGame(seed, size, enemies, crowd, vectorEnemies, ticks = 300):
+	"""
+	plays a game with a random walk bot, moving the enemies with numpy once at least vectorEnemies are active
+	
+	Returns:
+	a list with the player and every enemy every 10 ticks, as plain data that can be compared
+	"""
+	
+	saved = dungeonCore.VECTOR_ENEMIES
+	dungeonCore.VECTOR_ENEMIES = vectorEnemies
+	try:
+		game = dungeonBenchmark.newSimulation(seed, size)
+		start = [r for r in game.rooms if r.type == dungeonCore.START][0]
+		dungeonBenchmark.addEnemies(game, enemies, Random(seed), start if crowd else None)
+		bot = dungeonBenchmark.randomWalkBot(seed)
+		states = []
+		for tick in range(ticks):
+			bot(game, tick)
+			game.simulate(1 / 60)
+			if tick % 10 == 0:
+				states.append((game.player.x, game.player.y, game.player.health, game.state, [(e.x, e.y, e.timer) for e in game.entities]))
+		return states
+	finally:
+		dungeonCore.VECTOR_ENEMIES = saved
+		
+class enemyStoreTest(unittest.TestCase):
+	@unittest.skipIf(dungeonCore.numpy is None, 'needs numpy')
+	def testArraysMatchLoop(self):
+		for seed, size, enemies, crowd in ((1, 35, 300, True), (2, 55, 600, False), (3, 35, 1500, True)):
+			loop = playGame(seed, size, enemies, crowd, 10**9)
+			self.assertEqual(playGame(seed, size, enemies, crowd, 1), loop, seed)
+			
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,84 @@
+import dungeonGenerator
+import dungeonBatch
+
+from collections import deque
+from random import Random
+import unittest
+
+# a flowField is one breadth first search shared by every enemy, each tile's distance and next step have to match a search of its own
+
+
+def distancesFrom(d, target):
+	"""
+	Returns:
+	a dictionary of every tile that can reach target to the amount of steps it takes, found with a plain breadth first search over d.graph
+	"""
+	
+	distances = {target: 0}
+	toVisit = deque([target])
+	while toVisit:
+		cell = toVisit.popleft()
+		for n in d.graph[cell]:
+			if n not in distances:
+				distances[n] = distances[cell] + 1
+				toVisit.append(n)
+	return distances
+	
+class flowFieldTest(unittest.TestCase):
+	def checkField(self, d, field, target, radius = None):
+		distances = distancesFrom(d, target)
+		for cell in d.graph:
+			distance = distances.get(cell)
+			if distance is not None and radius is not None and distance > radius:
+				distance = None
+			self.assertEqual(field.distanceAt(*cell), distance, cell)
+			step = field.nextStep(*cell)
+			if distance is None or distance == 0:
+				self.assertIsNone(step, cell)
+			else:
+				self.assertIn(step, d.graph[cell])
+				self.assertEqual(distances[step], distance - 1)
+				
+	def testMatchesBreadthFirst(self):
+		for seed, size, radius in ((1, 35, None), (2, 55, 12), (3, 70, None)):
+			d = dungeonBatch.buildDungeon(seed, {'size': size})
+			d.constructNavGraph()
+			field = dungeonGenerator.flowField(d, radius)
+			tiles = sorted(d.graph)
+			rng = Random(seed)
+			for i in range(4):
+				target = rng.choice(tiles)
+				self.assertTrue(field.update(*target))
+				self.assertFalse(field.update(*target))
+				self.checkField(d, field, target, radius)
+				
+	def testGraphChanges(self):
+		d = dungeonBatch.buildDungeon(4, {'size': 55})
+		d.constructNavGraph()
+		field = dungeonGenerator.flowField(d)
+		tiles = sorted(d.graph)
+		rng = Random(4)
+		target = rng.choice(tiles)
+		field.update(*target)
+		for i in range(dungeonGenerator.PATCH_LIMIT + 20):
+			x, y = rng.randrange(d.width), rng.randrange(d.height)
+			if (x, y) != target:
+				d.setTile(x, y, rng.choice((dungeonGenerator.FLOOR, dungeonGenerator.WALL)))
+			if i % 20 == 0:
+				field.update(*target)
+				self.checkField(d, field, target)
+		field.update(*target)
+		self.assertEqual(field.version, d.navVersion)
+		self.checkField(d, field, target)
+		
+	def testBlockedTarget(self):
+		d = dungeonBatch.buildDungeon(5)
+		d.constructNavGraph()
+		field = dungeonGenerator.flowField(d)
+		field.update(0, 0)
+		x, y = next(iter(d.graph))
+		self.assertIsNone(field.distanceAt(x, y))
+		self.assertIsNone(field.nextStep(x, y))
+		
+if __name__ == '__main__':
+	unittest.main()
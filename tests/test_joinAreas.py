@@ -0,0 +1,64 @@
+import dungeonGenerator
+
+import unittest
+
+# findSpanningConnections() only looks at tiles next to each other in a sorted row or column,
+# the tree it gives has to be as short as one built from every straight line between two areas
+
+
+def caveAreas(seed, size, p):
+	d = dungeonGenerator.dungeonGenerator(size, size, seed=seed)
+	d.generateCaves(p=p, seed=seed)
+	return d, d.findUnconnectedAreas()
+	
+def findRoot(parent, i):
+	while parent[i] != i:
+		i = parent[i]
+	return i
+	
+def spanningLength(areas):
+	"""
+	Returns:
+	the length of a minimum spanning tree between the areas, using every row and column pair of tiles from different areas
+	"""
+	
+	lines = {}
+	for i, area in enumerate(areas):
+		for x, y in area:
+			lines.setdefault(('row', y), []).append((x, i))
+			lines.setdefault(('column', x), []).append((y, i))
+	edges = sorted((abs(a - b), i, j) for line in lines.values() for a, i in line for b, j in line if i < j)
+	parent = list(range(len(areas)))
+	total = 0
+	for distance, i, j in edges:
+		i, j = findRoot(parent, i), findRoot(parent, j)
+		if i != j:
+			parent[j] = i
+			total += distance
+	return total
+	
+class joinAreasTest(unittest.TestCase):
+	def testSpanningTreeIsShortest(self):
+		for seed, size, p in ((1, 30, 40), (3, 40, 35), (2, 36, 45), (4, 40, 38)):
+			d, areas = caveAreas(seed, size, p)
+			self.assertGreater(len(areas), 2)
+			area = {tile: i for i, tiles in enumerate(areas) for tile in tiles}
+			connections = d.findSpanningConnections(areas)
+			self.assertEqual(len(connections), len(areas) - 1)
+			parent = list(range(len(areas)))
+			for (ax, ay), (bx, by) in connections:
+				self.assertTrue(ax == bx or ay == by)
+				i, j = findRoot(parent, area[ax, ay]), findRoot(parent, area[bx, by])
+				self.assertNotEqual(i, j)
+				parent[j] = i
+			self.assertEqual(sum(abs(ax - bx) + abs(ay - by) for (ax, ay), (bx, by) in connections), spanningLength(areas))
+			
+	def testJoinedIntoOneArea(self):
+		for method in ('mst', 'nearest'):
+			d, areas = caveAreas(4, 50, 40)
+			self.assertGreater(len(areas), 1)
+			d.joinUnconnectedAreas(d.labelComponents(), method)
+			self.assertEqual(d.labelComponents().count, 1, method)
+			
+if __name__ == '__main__':
+	unittest.main()
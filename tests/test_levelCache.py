@@ -0,0 +1,79 @@
+import dungeonBatch
+import levelCache
+
+from os import listdir, path
+from tempfile import TemporaryDirectory
+import unittest
+
+# levels loaded back through levelCache have to be the same as building them again, whatever happens to the folder
+
+
+def snapshot(d):
+	"""
+	Returns:
+	the tiles, rooms, doors, corridors, deadends and random streams of a dungeon as plain data that can be compared
+	"""
+	
+	return (
+		d.compact,
+		[list(column) for column in d.grid],
+		[(r.x, r.y, r.width, r.height) for r in d.rooms],
+		list(d.doors),
+		list(d.corridors),
+		list(d.deadends),
+		d.populationRng.getstate(),
+		d.lootRng.getstate(),
+	)
+	
+class levelCacheTest(unittest.TestCase):
+	def testHitMatchesBuild(self):
+		with TemporaryDirectory() as directory:
+			for params in (None, {'compact': True}):
+				cache = levelCache.levelCache(directory)
+				built = cache.build(4, params)
+				self.assertEqual(cache.misses, 1)
+				self.assertEqual(snapshot(cache.build(4, params)), snapshot(built))
+				# a new cache only has the file to go on
+				cache = levelCache.levelCache(directory)
+				self.assertEqual(snapshot(cache.get(4, params)), snapshot(dungeonBatch.buildDungeon(4, params)))
+				self.assertEqual((cache.hits, cache.misses), (1, 0))
+				
+	def testRandomLevelsAreNotSaved(self):
+		with TemporaryDirectory() as directory:
+			levelCache.levelCache(directory).build(None)
+			self.assertEqual(listdir(directory), [])
+			
+	def testCorruptFileIsAMiss(self):
+		with TemporaryDirectory() as directory:
+			levelCache.levelCache(directory).build(5)
+			filePath = levelCache.levelCache(directory).filePath(levelCache.levelKey(5))
+			with open(filePath, 'rb') as f:
+				data = f.read()
+			with open(filePath, 'wb') as f:
+				f.write(data[:len(data) // 2])
+			cache = levelCache.levelCache(directory)
+			self.assertIsNone(cache.get(5))
+			self.assertFalse(path.exists(filePath))
+			self.assertEqual(snapshot(cache.build(5)), snapshot(dungeonBatch.buildDungeon(5)))
+			
+	def testWithoutAFolder(self):
+		with TemporaryDirectory() as directory:
+			blocked = path.join(directory, 'file')
+			open(blocked, 'w').close()
+			cache = levelCache.levelCache(path.join(blocked, 'Levels'))
+			self.assertIsNone(cache.directory)
+			built = cache.build(6)
+			self.assertEqual(snapshot(cache.build(6)), snapshot(built))
+			self.assertEqual((cache.hits, cache.misses), (1, 1))
+			
+	def testFolderIsTrimmed(self):
+		with TemporaryDirectory() as directory:
+			cache = levelCache.levelCache(directory, maxDiskBytes=6000)
+			for seed in range(1, 11):
+				cache.build(seed)
+			self.assertLessEqual(cache.diskBytes, 6000)
+			self.assertEqual(cache.diskBytes, sum(path.getsize(path.join(directory, name)) for name in listdir(directory)))
+			self.assertTrue(path.exists(cache.filePath(levelCache.levelKey(10))))
+			
+if __name__ == '__main__':
+	unittest.main()
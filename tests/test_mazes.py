@@ -0,0 +1,93 @@
+import dungeonGenerator
+
+import unittest
+
+# generateMaze() carves on a lattice of every other tile, kruskal and wilson have to give a tree in every space they fill,
+# braid adds loops, and none of them may carve next to a room
+
+
+def corridorGraph(d):
+	"""
+	Returns:
+	the set of corridor tiles, the amount of pairs of them directly touching and the amount of separate corridor areas
+	"""
+	
+	tiles = {(x, y) for x, y, tile in d if tile == dungeonGenerator.CORRIDOR}
+	links = sum(1 for x, y in tiles for n in ((x + 1, y), (x, y + 1)) if n in tiles)
+	return tiles, links, d.labelComponents([dungeonGenerator.CORRIDOR]).count
+	
+def findRoot(parent, i):
+	while parent[i] != i:
+		i = parent[i]
+	return i
+	
+def mazeWithRooms(seed, algorithm, loops = 0.5):
+	d = dungeonGenerator.dungeonGenerator(41, 51, seed=seed)
+	d.placeRandomRooms(3, 9, margin=2, attempts=60)
+	d.generateCorridors(algorithm, loops=loops)
+	return d
+	
+class mazeTest(unittest.TestCase):
+	def checkSpacing(self, d):
+		tiles, links, areas = corridorGraph(d)
+		self.assertEqual(sorted(d.corridors), sorted(tiles))
+		self.assertEqual(len(d.corridors), len(tiles))
+		for x, y in tiles:
+			self.assertTrue(0 < x < d.width - 1 and 0 < y < d.height - 1)
+			for nx, ny in d.findNeighbours(x, y):
+				self.assertIn(d.grid[nx][ny], (dungeonGenerator.EMPTY, dungeonGenerator.CORRIDOR), (x, y))
+			# corridors are one tile wide
+			self.assertFalse({(x + 1, y), (x, y + 1), (x + 1, y + 1)} <= tiles, (x, y))
+			
+	def testTrees(self):
+		for algorithm in ('kruskal', 'wilson'):
+			for seed in (1, 2, 3):
+				d = mazeWithRooms(seed, algorithm)
+				self.checkSpacing(d)
+				tiles, links, areas = corridorGraph(d)
+				self.assertGreater(len(tiles), 100)
+				self.assertEqual(links, len(tiles) - areas, (algorithm, seed))
+				
+	def testFillsEverySpace(self):
+		for algorithm in ('kruskal', 'wilson', 'braid'):
+			d = dungeonGenerator.dungeonGenerator(41, 51, seed=4)
+			d.placeRandomRooms(3, 9, margin=2, attempts=60)
+			rooms = dungeonGenerator.dungeonGenerator(41, 51)
+			rooms.grid = [list(column) for column in d.grid]
+			lattice = dungeonGenerator.mazeLattice(rooms, 1, 1)
+			d.generateCorridors(algorithm)
+			parent = list(range(len(lattice.usable)))
+			for a, b in lattice.edges():
+				parent[findRoot(parent, b)] = findRoot(parent, a)
+			spaces = set()
+			for node, usable in enumerate(lattice.usable):
+				if usable and lattice.neighbours(node):
+					x, y = lattice.cell(node)
+					self.assertEqual(d.grid[x][y], dungeonGenerator.CORRIDOR, (algorithm, x, y))
+					spaces.add(findRoot(parent, node))
+			# one corridor area for every separate space of the lattice
+			self.assertEqual(corridorGraph(d)[2], len(spaces), algorithm)
+			
+	def testBraidMakesLoops(self):
+		for seed in (1, 2, 3):
+			tree = mazeWithRooms(seed, 'kruskal')
+			d = mazeWithRooms(seed, 'braid', loops=0.5)
+			self.checkSpacing(d)
+			tiles, links, areas = corridorGraph(d)
+			self.assertGreater(links, len(tiles) - areas, seed)
+			d.findDeadends()
+			tree.findDeadends()
+			self.assertLess(len(d.deadends), len(tree.deadends), seed)
+			
+	def testNoLoopsLeftAlone(self):
+		d = mazeWithRooms(5, 'braid', loops=0)
+		tiles, links, areas = corridorGraph(d)
+		self.assertEqual(links, len(tiles) - areas)
+		
+	def testUnknownAlgorithm(self):
+		d = dungeonGenerator.dungeonGenerator(20, 20)
+		with self.assertRaises(ValueError):
+			d.generateMaze('prim')
+			
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,80 @@
+import dungeonGenerator
+import dungeonBatch
+
+from random import Random
+import unittest
+
+# setTile() patches the rows of the nav graph around a tile instead of building it again, and folds the patches back in once there are too many,
+# after any amount of edits the graph has to be the same as one built from scratch
+
+
+def builtGraph(d):
+	"""
+	Returns:
+	the graph constructNavGraph() builds for a copy of the grid, as a dictionary of each tile to its neighbours
+	"""
+	
+	e = dungeonGenerator.dungeonGenerator(d.height, d.width)
+	e.grid = [list(column) for column in d.grid]
+	e.constructNavGraph(d.graph.blocked)
+	return dict(e.graph)
+	
+class navGraphTest(unittest.TestCase):
+	def editedDungeons(self, edits):
+		"""
+		yields each seeded dungeon after every one of a random run of setTile() edits, turning tiles into floor or wall
+		"""
+		
+		for seed, size, compact in ((1, 35, False), (2, 55, True)):
+			d = dungeonBatch.buildDungeon(seed, {'size': size, 'compact': compact})
+			d.constructNavGraph()
+			rng = Random(seed)
+			for i in range(edits):
+				x, y = rng.randrange(d.width), rng.randrange(d.height)
+				d.setTile(x, y, rng.choice((dungeonGenerator.FLOOR, dungeonGenerator.WALL)))
+				yield i, d
+				
+	def testPatchedMatchesBuilt(self):
+		rebuilds = 0
+		patches = 0
+		for i, d in self.editedDungeons(dungeonGenerator.PATCH_LIMIT * 3):
+			if len(d.graph.patches) < patches:
+				rebuilds += 1
+			patches = len(d.graph.patches)
+			if i % 10 == 0 or i > dungeonGenerator.PATCH_LIMIT:
+				graph = builtGraph(d)
+				self.assertEqual(dict(d.graph), graph, i)
+				self.assertEqual(len(d.graph), len(graph))
+		self.assertGreaterEqual(rebuilds, 2)
+		
+	def testVersionCounts(self):
+		d = dungeonBatch.buildDungeon(3)
+		d.constructNavGraph()
+		x, y = next(iter(d.graph))
+		navVersion, version = d.navVersion, d.version
+		d.setTile(x, y, dungeonGenerator.FLOOR)
+		self.assertEqual((d.navVersion, d.version), (navVersion, version))
+		d.setTile(x, y, dungeonGenerator.OBSTACLE)
+		self.assertEqual((d.navVersion, d.version), (navVersion + 1, version + 1))
+		self.assertNotIn((x, y), d.graph)
+		d.setTile(x, y, dungeonGenerator.WALL)
+		self.assertEqual((d.navVersion, d.version), (navVersion + 1, version + 2))
+		
+	def testPathsAfterEdits(self):
+		rng = Random(4)
+		for i, d in self.editedDungeons(dungeonGenerator.PATCH_LIMIT * 2):
+			if i % 16: continue
+			tiles = sorted(d.graph)
+			for j in range(10):
+				start, end = rng.choice(tiles), rng.choice(tiles)
+				shortest = d.findPath(*start, *end, mode='bfs')
+				for mode in ('astar', 'jps'):
+					path = d.findPath(*start, *end, mode=mode)
+					if shortest is None:
+						self.assertIsNone(path)
+						continue
+					self.assertEqual(len(path), len(shortest), (i, start, end, mode))
+					self.assertTrue(all(tile in d.graph for tile in path))
+					
+if __name__ == '__main__':
+	unittest.main()
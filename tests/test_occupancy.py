@@ -0,0 +1,58 @@
+import dungeonGenerator
+
+from random import Random
+import unittest
+
+# self.occupancy is a bitmask per column that quadFits() trusts instead of the grid, it has to match the grid after every kind of edit
+
+
+def occupancyFromGrid(d):
+	"""
+	Returns:
+	the bitmasks buildOccupancy() would make from the grid as it is now
+	"""
+	
+	return [sum(1 << y for y in range(d.height) if d.grid[x][y]) for x in range(d.width)]
+	
+class occupancyTest(unittest.TestCase):
+	def checkInSync(self, d):
+		self.assertEqual([len(column) for column in d.grid], [d.height] * d.width)
+		self.assertEqual(d.occupancy, occupancyFromGrid(d))
+		
+	def testEditsKeepOccupancy(self):
+		for compact in (False, True):
+			d = dungeonGenerator.dungeonGenerator(30, 40, compact=compact, seed=1)
+			d.placeRandomRooms(3, 7, margin=1, attempts=100)
+			self.checkInSync(d)
+			rng = Random(1)
+			for i in range(300):
+				x, y = rng.randrange(d.width), rng.randrange(d.height)
+				w, h = rng.randint(0, 6), rng.randint(0, 6)
+				tile = rng.choice((dungeonGenerator.EMPTY, dungeonGenerator.FLOOR, dungeonGenerator.WALL))
+				edit = rng.randrange(3)
+				if edit == 0:
+					d.setTile(x, y, tile)
+				elif edit == 1 and x + w <= d.width and y + h <= d.height:
+					d.fillQuad(x, y, w, h, tile)
+				elif edit == 2 and x + w <= d.width and y + h <= d.height:
+					d.placeRoom(x, y, w, h, ignoreOverlap=rng.random() < 0.5)
+				self.checkInSync(d)
+				
+	def testOutsideTheGrid(self):
+		for compact in (False, True):
+			d = dungeonGenerator.dungeonGenerator(20, 20, compact=compact)
+			d.buildOccupancy()
+			for quad in ((2, 15, 3, 10), (2, -1, 3, 4), (-1, 2, 3, 4), (18, 2, 3, 4)):
+				with self.assertRaises(IndexError):
+					d.placeRoom(*quad, ignoreOverlap=True)
+				with self.assertRaises(IndexError):
+					d.fillQuad(*quad, dungeonGenerator.FLOOR)
+			for x, y in ((20, 0), (0, 20), (-1, 3), (3, -1)):
+				with self.assertRaises(IndexError):
+					d.setTile(x, y, dungeonGenerator.FLOOR)
+			self.assertEqual(d.rooms, [])
+			self.assertFalse(any(tile for x, y, tile in d))
+			self.checkInSync(d)
+			
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,65 @@
+import dungeonGenerator
+import dungeonBatch
+
+from random import Random
+import unittest
+
+# findPath() has to give a shortest path whichever search it uses, breadth first search is the reference
+
+
+class pathFindingTest(unittest.TestCase):
+	def pathsFor(self, seed, size, pairs = 40):
+		"""
+		Returns:
+		the dungeon and a list of (start, end) tuples of walkable tiles picked with seed
+		"""
+		
+		d = dungeonBatch.buildDungeon(seed, {'size': size})
+		d.constructNavGraph()
+		tiles = sorted(d.graph)
+		rng = Random(seed)
+		return d, [(rng.choice(tiles), rng.choice(tiles)) for i in range(pairs)]
+		
+	def checkPath(self, d, path, start, end):
+		self.assertEqual(path[0], end)
+		self.assertEqual(path[-1], start)
+		for (x, y), (nx, ny) in zip(path, path[1:]):
+			self.assertEqual(abs(x - nx) + abs(y - ny), 1)
+			self.assertIn((nx, ny), d.graph)
+			
+	def testSearchesMatchBreadthFirst(self):
+		for seed, size in ((1, 35), (2, 55), (3, 70)):
+			d, pairs = self.pathsFor(seed, size)
+			for start, end in pairs:
+				shortest = d.findPath(*start, *end, mode='bfs')
+				self.assertIsNotNone(shortest)
+				for mode in ('astar', 'jps'):
+					path = d.findPath(*start, *end, mode=mode)
+					self.checkPath(d, path, start, end)
+					self.assertEqual(len(path), len(shortest), (seed, start, end, mode))
+					
+	def testCavesMatchBreadthFirst(self):
+		d = dungeonGenerator.dungeonGenerator(60, 60, seed=4)
+		d.generateCaves(p=45, seed=4)
+		d.constructNavGraph(blocked=[t for t in range(256) if t != dungeonGenerator.CAVE])
+		tiles = sorted(d.graph)
+		rng = Random(4)
+		for i in range(40):
+			start, end = rng.choice(tiles), rng.choice(tiles)
+			shortest = d.findPath(*start, *end, mode='bfs')
+			for mode in ('astar', 'jps'):
+				path = d.findPath(*start, *end, mode=mode)
+				if shortest is None:
+					self.assertIsNone(path)
+				else:
+					self.checkPath(d, path, start, end)
+					self.assertEqual(len(path), len(shortest))
+					
+	def testBlockedEnds(self):
+		d, pairs = self.pathsFor(5, 35, 1)
+		start = pairs[0][0]
+		for mode in ('bfs', 'astar', 'jps'):
+			self.assertIsNone(d.findPath(*start, 0, 0, mode=mode))
+			
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,75 @@
+import dungeonBenchmark
+import dungeonCore
+
+import unittest
+
+# only the enemies in the rooms and corridors near the player move, RoomActivation works out which those are as the player walks between them
+
+
+def withinHops(neighbours, ids, hops):
+	"""
+	Returns:
+	the set of areas at most hops steps from any of ids, going between areas that share a block
+	"""
+	
+	active = set(ids)
+	for hop in range(hops):
+		active |= {n for area in active for n in neighbours[area]}
+	return active
+	
+def newGame(seed, hops):
+	"""
+	Returns:
+	a DungeonSimulation with a new game, made with ACTIVATION_HOPS set to hops
+	"""
+	
+	saved = dungeonCore.ACTIVATION_HOPS
+	dungeonCore.ACTIVATION_HOPS = hops
+	try:
+		return dungeonBenchmark.newSimulation(seed, 55)
+	finally:
+		dungeonCore.ACTIVATION_HOPS = saved
+		
+class roomActivationTest(unittest.TestCase):
+	def testHops(self):
+		# a chain of areas 0-1-2-3 sharing blocks, and 4 on its own
+		overflow = [frozenset({0, 1}), frozenset({1, 2}), frozenset({2, 3})]
+		for hops, expected in ((0, {1}), (1, {0, 1, 2}), (2, {0, 1, 2, 3}), (5, {0, 1, 2, 3})):
+			activation = dungeonCore.RoomActivation(overflow, 5, hops)
+			self.assertTrue(activation.update(frozenset({1})))
+			self.assertEqual(activation.active, expected, hops)
+			self.assertFalse(activation.update(frozenset({1})))
+			self.assertTrue(activation.update(frozenset({4})))
+			self.assertEqual(activation.active, {4}, hops)
+		activation = dungeonCore.RoomActivation(overflow, 5, 1)
+		activation.update(frozenset({0, 1}))
+		self.assertEqual(activation.active, {0, 1, 2})
+		activation.update(dungeonCore.NO_AREAS)
+		self.assertEqual(activation.active, set())
+		
+	def testWalkingBetweenRooms(self):
+		for seed in (1, 2):
+			for hops in (0, 1, 2):
+				game = newGame(seed, hops)
+				self.assertEqual(game.activation.hops, hops)
+				seen = set()
+				for room in game.rooms:
+					game.player.x = room.x + room.width / 2
+					game.player.y = room.y + room.height / 2
+					before = {e: (e.x, e.y) for e in game.entities}
+					game.simulate(1 / 60)
+					ids = game.roomAt(game.player.x, game.player.y)
+					active = game.activation.active
+					self.assertIn(room.id, active)
+					self.assertEqual(active, withinHops(game.activation.neighbours, ids, hops), (seed, hops, room.id))
+					seen.add(active)
+					self.assertEqual(set(game.activeEntities()), {e for e in game.entities if e.room.id in active})
+					# the enemies anywhere else haven't moved
+					for e, position in before.items():
+						if e.room.id not in active:
+							self.assertEqual((e.x, e.y), position)
+				# the rooms all open onto the one corridor area, so each has its own active set until two hops reach every area
+				self.assertEqual(len(seen), len(game.rooms) if hops < 2 else 1, (seed, hops))
+				
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,62 @@
+import dungeonCore
+
+from math import floor
+import unittest
+
+# roomMap keeps a number per block instead of a set, these check roomAt(), roomIdAt() and inRoom() against the sets it replaced
+
+
+class recordingSimulation(dungeonCore.DungeonSimulation):
+	"""
+	a DungeonSimulation that also keeps the old map, a set of room and corridor ids for every block, as the rooms are added
+	"""
+	
+	cacheLevels = False
+	
+	def addToArea(self, x, y, id):
+		self.reference.setdefault((x, y), set()).add(id)
+		dungeonCore.DungeonSimulation.addToArea(self, x, y, id)
+		
+	def generateMap(self, s=-1):
+		self.reference = {}
+		dungeonCore.DungeonSimulation.generateMap(self, s)
+		
+class roomMapTest(unittest.TestCase):
+	def games(self):
+		for seed in (1, 2, 3):
+			for size in (35, 70):
+				game = recordingSimulation()
+				game.newGame(seed, size)
+				yield game
+				
+	def testRoomAtMatchesSets(self):
+		for game in self.games():
+			size = game.mapSize
+			points = [(x, y) for x in range(-1, size + 2) for y in range(-1, size + 2)]
+			points += [(x + 0.5, y + 0.25) for x in range(size) for y in range(0, size, 3)]
+			for x, y in points:
+				expected = game.reference.get((floor(x), floor(y)), set()) if x >= 0 and y >= 0 else set()
+				self.assertEqual(game.roomAt(x, y), expected, (x, y))
+				ids = game.roomIdAt(x, y)
+				if len(expected) == 1:
+					self.assertEqual({ids}, expected)
+				elif not expected:
+					self.assertEqual(ids, dungeonCore.NO_AREA)
+				for id in range(game.areaCount):
+					self.assertEqual(game.inRoom(x, y, id), id in expected, (x, y, id))
+					
+	def testSharedSetsAreInterned(self):
+		for game in self.games():
+			self.assertEqual(len(set(game.roomOverflow)), len(game.roomOverflow))
+			self.assertTrue(all(len(ids) > 1 for ids in game.roomOverflow))
+			
+	def testNeighboursComeFromSharedWalls(self):
+		for game in self.games():
+			neighbours = [set() for id in range(game.areaCount)]
+			for ids in game.reference.values():
+				for id in ids:
+					neighbours[id] |= ids - {id}
+			self.assertEqual([set(n) for n in game.activation.neighbours], neighbours)
+			
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,64 @@
+import dungeonGenerator
+
+import unittest
+
+# placeRoomsInFreeSpace() picks positions from its list of free rectangles, the rooms it places have to follow the same rules as quadFits()
+
+
+class roomPlacementTest(unittest.TestCase):
+	def checkRooms(self, d, margin):
+		"""
+		every room is FLOOR, at least margin tiles from the edge of the grid and from every other room
+		"""
+		
+		floor = set()
+		for room in d.rooms:
+			self.assertGreaterEqual(room.x, margin)
+			self.assertGreaterEqual(room.y, margin)
+			self.assertLess(room.x + room.width + margin, d.width)
+			self.assertLess(room.y + room.height + margin, d.height)
+			tiles = {(room.x + x, room.y + y) for x in range(room.width) for y in range(room.height)}
+			self.assertTrue(all(d.grid[x][y] == dungeonGenerator.FLOOR for x, y in tiles))
+			floor |= tiles
+		self.assertEqual(floor, {(x, y) for x, y, tile in d if tile == dungeonGenerator.FLOOR})
+		for i, a in enumerate(d.rooms):
+			for b in d.rooms[i+1:]:
+				apart = (a.x + a.width + margin <= b.x or b.x + b.width + margin <= a.x or
+					a.y + a.height + margin <= b.y or b.y + b.height + margin <= a.y)
+				self.assertTrue(apart, ((a.x, a.y, a.width, a.height), (b.x, b.y, b.width, b.height)))
+				
+	def testNoOverlapAndMarginKept(self):
+		for seed, size, margin in ((1, 35, 1), (2, 55, 2), (3, 70, 0), (4, 120, 3)):
+			d = dungeonGenerator.dungeonGenerator(size, size + 9, seed=seed)
+			d.placeRandomRooms(3, 11, margin=margin, attempts=2000, strategy='maxrects')
+			self.assertGreater(len(d.rooms), 1)
+			self.checkRooms(d, margin)
+			
+	def testAroundExistingRooms(self):
+		d = dungeonGenerator.dungeonGenerator(60, 60, seed=5)
+		d.placeRandomRooms(5, 9, margin=2, attempts=20)
+		before = len(d.rooms)
+		d.placeRandomRooms(3, 7, margin=2, attempts=2000, strategy='maxrects')
+		self.assertGreater(len(d.rooms), before)
+		self.checkRooms(d, 2)
+		
+	def testStopsWhenFull(self):
+		d = dungeonGenerator.dungeonGenerator(30, 30, seed=6)
+		made = d.placeRandomRooms(5, 8, margin=1, attempts=5000, strategy='maxrects')
+		self.assertLess(made, 5000)
+		# it only stops early once there is nowhere left for the smallest room
+		self.assertFalse(any(d.quadFits(x, y, 5, 5, 1) for x in range(d.width) for y in range(d.height)))
+		
+	def testFreeRectangles(self):
+		d = dungeonGenerator.dungeonGenerator(40, 40)
+		free = [(0, 0, 39, 39)]
+		for quad in ((5, 5, 6, 4), (20, 3, 5, 5), (8, 20, 10, 10), (30, 30, 4, 4)):
+			free = d.subtractFreeSpace(free, *quad, 3)
+			startX, startY, width, height = quad
+			for r in free:
+				self.assertTrue(r[0] >= startX + width or r[2] <= startX or r[1] >= startY + height or r[3] <= startY, r)
+				self.assertGreaterEqual(min(r[2] - r[0], r[3] - r[1]), 3)
+				self.assertFalse(any(o != r and o[0] <= r[0] and o[1] <= r[1] and r[2] <= o[2] and r[3] <= o[3] for o in free))
+				
+if __name__ == '__main__':
+	unittest.main()
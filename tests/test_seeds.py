@@ -0,0 +1,65 @@
+import dungeonGenerator
+import dungeonBatch
+import dungeonCore
+
+import random
+import unittest
+
+# the same seed and settings have to build the same dungeon, whatever else has used random numbers in between
+
+
+def snapshot(d):
+	"""
+	Returns:
+	everything the game reads from a built dungeon, as plain data that can be compared
+	"""
+	
+	return (
+		[list(column) for column in d.grid],
+		[(r.x, r.y, r.width, r.height) for r in d.rooms],
+		list(d.doors),
+		list(d.corridors),
+		list(d.deadends),
+		d.populationRng.getstate(),
+		d.lootRng.getstate(),
+	)
+	
+class seedTest(unittest.TestCase):
+	def testSameSeedSameDungeon(self):
+		for seed, params in ((1, None), (2, {'size': 55}), (3, {'size': 70, 'compact': True}), (4, {'corridorMode': 'kruskal'})):
+			random.seed(10)
+			first = snapshot(dungeonBatch.buildDungeon(seed, params))
+			random.seed(20)
+			random.random()
+			self.assertEqual(snapshot(dungeonBatch.buildDungeon(seed, params)), first, seed)
+			
+	def testDifferentSeedsDiffer(self):
+		self.assertNotEqual(snapshot(dungeonBatch.buildDungeon(1)), snapshot(dungeonBatch.buildDungeon(2)))
+		
+	def testCompactMatchesLists(self):
+		lists = snapshot(dungeonBatch.buildDungeon(5, {'compact': False}))
+		self.assertEqual(snapshot(dungeonBatch.buildDungeon(5, {'compact': True})), lists)
+		
+	def testCavesAndMazes(self):
+		for method in ('generateCaves', 'generateCorridors'):
+			levels = []
+			for i in range(2):
+				d = dungeonGenerator.dungeonGenerator(40, 40, seed=8)
+				getattr(d, method)()
+				levels.append(snapshot(d))
+			self.assertEqual(levels[0], levels[1], method)
+			
+	def testGameIsRepeatable(self):
+		games = []
+		for i in range(2):
+			game = dungeonCore.DungeonSimulation()
+			game.cacheLevels = False
+			game.newGame(9)
+			for tick in range(120):
+				game.moveAngle = tick / 20
+				game.simulate(1 / 60)
+			games.append((game.mapText(), game.player.x, game.player.y, [(e.x, e.y) for e in game.entities]))
+		self.assertEqual(games[0], games[1])
+		
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,19 @@
+import dungeonBenchmark
+
+import unittest
+
+# a short soak test, bots playing a few games headless with nothing breaking, the benchmark's soak mode plays far more
+
+
+class simulationTest(unittest.TestCase):
+	def testSoak(self):
+		soak = dungeonBenchmark.soakTest(sessions=3, ticks=400, size=35)
+		self.assertEqual(soak['problems'], [])
+		self.assertEqual(soak['ticks'], 1200)
+		
+	def testSoakBiggerLevel(self):
+		soak = dungeonBenchmark.soakTest(sessions=1, ticks=400, size=70)
+		self.assertEqual(soak['problems'], [])
+		
+if __name__ == '__main__':
+	unittest.main()